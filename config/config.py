@@ -23,8 +23,12 @@ SAVES_DIRECTORY = os.path.join(SAVES_DIRECTORY, settings.get_save_name())
 
 SAVES_PATH = os.path.join(BASE_PATH, SAVES_DIRECTORY)
 FILE_PATHS_SAVES_PATH = os.path.join(SAVES_PATH, "view_file_paths.txt")
+COMPACT_SAVE_PATH = os.path.join(SAVES_PATH, "model.npz")
+SAVED_VALUES_HASH_PATH = os.path.join(SAVES_PATH, "values_hash.txt")
+AUTOSAVES_PATH = os.path.join(SAVES_PATH, "autosaves")
 CONFIGURATION_SAVES_DIRECTORY = "configurations"
 SETUP_SAVES_DIRECTORY = "setups"
+METAMODEL_LIBRARY_DIRECTORY = "metamodels" # Directory of the paths that saves list to refer to metamodels in the library
 
 # Ensure directory exists
 os.makedirs(SCRIPTS_PATH, exist_ok=True)
@@ -152,6 +156,20 @@ RUN_SCRIPT_WIDTH = 5
 RUN_SCRIPT_HEIGHT = 1
 RUN_SCRIPT_COLOR = "tomato"
 RUN_SCRIPT_CLEAR_COLOR = "khaki"
+SCRIPT_PROGRESS_INTERVAL = 100 # Milliseconds between checking the progress of scripts running in the background
+SCRIPT_RESULT_CACHE_SIZE = 32 # Number of results of previous runs of scripts kept to be shown again
+ASYNC_SCRIPT_STEP_SIZE = 50 # Number of values calculated by async scripts before letting the program respond
+ASYNC_SCRIPT_STEP_INTERVAL = 1 # Milliseconds between the steps of async scripts running in the event loop of the GUI
+
+# Autosaves
+AUTOSAVE_CHECK_INTERVAL = 10000 # Milliseconds between checking whether it is time to autosave
+AUTOSAVE_NAME_FORMAT = "%Y-%m-%d %H-%M-%S-%f" # Format of the time each autosave is named after, where the names sort in the order the autosaves were made
+
+# Layout of system models imported from files
+IMPORT_LAYOUT_ORIGIN = (ADD_TO_SETUP_WIDTH + 4, 2) # Grid coordinate of the first imported setup class in an empty setup view
+IMPORT_LAYOUT_SPACING_X = 7 # Columns between imported setup classes next to each other
+IMPORT_LAYOUT_SPACING_Y = 3 # Rows between imported setup classes above each other, leaving room for the connections between them
+IMPORT_LAYOUT_MAX_COLUMNS = 20 # Number of setup classes next to each other before continuing on a new row
 
 
 
@@ -29,3 +29,6 @@ IMPORT_PATHS = (SOURCE_PATH, \
 
 SAVES_DIRECTORY = "saves"
 SCRIPTS_PATH = os.path.join(BASE_PATH, "scripts")
+SCRIPT_PROFILES_PATH = os.path.join(SCRIPTS_PATH, "profiles")
+SCRIPT_RESULTS_PATH = os.path.join(SCRIPTS_PATH, "results")
+METAMODELS_PATH = os.path.join(BASE_PATH, "metamodels") # Metamodels shared by all saves, see MetamodelLibrary
@@ -13,6 +13,14 @@ class Settings:
         self.__canvas_height = 600
         self.__num_samples = 10000
         self.__warn_duplicate_names = True
+        self.__calculate_current_view_only = False
+        self.__num_calculation_processes = 1
+        self.__run_scripts_in_background = False
+        self.__run_scripts_in_subprocess = False
+        self.__profile_scripts = False
+        self.__cache_script_results = False
+        self.__autosave_interval = 5
+        self.__num_autosaves = 5
         self.__save_name = save_name
         
         if os.path.exists(SETTINGS_FILE):
@@ -32,6 +40,30 @@ class Settings:
                     elif variable == "WARN_DUPLICATE_NAMES":
                         self.__warn_duplicate_names = value == "True"
                         
+                    elif variable == "CALCULATE_CURRENT_VIEW_ONLY":
+                        self.__calculate_current_view_only = value == "True" # Only calculate the values needed for the current system view, where other views are calculated when changed to
+                        
+                    elif variable == "NUM_CALCULATION_PROCESSES":
+                        self.__num_calculation_processes = int(value) # Number of processes calculating independent parts of the system views in parallel
+                        
+                    elif variable == "RUN_SCRIPTS_IN_BACKGROUND":
+                        self.__run_scripts_in_background = value == "True" # Run scripts in a separate thread so that the program can be used while they are running
+                        
+                    elif variable == "RUN_SCRIPTS_IN_SUBPROCESS":
+                        self.__run_scripts_in_subprocess = value == "True" # Run scripts in a separate process that can not access or crash the rest of the program
+                        
+                    elif variable == "PROFILE_SCRIPTS":
+                        self.__profile_scripts = value == "True" # Record the time spent in each part of scripts, printed and saved when a script finishes
+                        
+                    elif variable == "CACHE_SCRIPT_RESULTS":
+                        self.__cache_script_results = value == "True" # Show the result of a previous run instead of running a script again if neither the script nor the model has changed. Off by default, as only the script file itself is hashed, not modules it imports or files it reads, and the state of random number generators is not included, so a cached result may differ from what running the script again would give
+                        
+                    elif variable == "AUTOSAVE_INTERVAL":
+                        self.__autosave_interval = float(value) # Minutes between autosaves, where 0 turns autosaving off
+                        
+                    elif variable == "NUM_AUTOSAVES":
+                        self.__num_autosaves = int(value) # Number of the most recent autosaves that are kept
+                        
                     elif variable == "SAVE_NAME":
                         if save_name == None:
                             self.__save_name = value
@@ -58,6 +90,54 @@ class Settings:
     def set_warn_duplicate_names(self, warn_duplicate_names):
         self.__warn_duplicate_names = warn_duplicate_names
         
+    def calculates_current_view_only(self):
+        return self.__calculate_current_view_only
+        
+    def set_calculate_current_view_only(self, calculate_current_view_only):
+        self.__calculate_current_view_only = calculate_current_view_only
+        
+    def get_num_calculation_processes(self):
+        return self.__num_calculation_processes
+        
+    def set_num_calculation_processes(self, num_calculation_processes):
+        self.__num_calculation_processes = num_calculation_processes
+        
+    def runs_scripts_in_background(self):
+        return self.__run_scripts_in_background
+        
+    def set_run_scripts_in_background(self, run_scripts_in_background):
+        self.__run_scripts_in_background = run_scripts_in_background
+        
+    def runs_scripts_in_subprocess(self):
+        return self.__run_scripts_in_subprocess
+        
+    def set_run_scripts_in_subprocess(self, run_scripts_in_subprocess):
+        self.__run_scripts_in_subprocess = run_scripts_in_subprocess
+        
+    def profiles_scripts(self):
+        return self.__profile_scripts
+        
+    def set_profile_scripts(self, profile_scripts):
+        self.__profile_scripts = profile_scripts
+        
+    def caches_script_results(self):
+        return self.__cache_script_results
+        
+    def set_cache_script_results(self, cache_script_results):
+        self.__cache_script_results = cache_script_results
+        
+    def get_autosave_interval(self):
+        return self.__autosave_interval
+        
+    def set_autosave_interval(self, autosave_interval):
+        self.__autosave_interval = autosave_interval
+        
+    def get_num_autosaves(self):
+        return self.__num_autosaves
+        
+    def set_num_autosaves(self, num_autosaves):
+        self.__num_autosaves = num_autosaves
+        
     def get_save_name(self):
         return self.__save_name
         
@@ -67,5 +147,13 @@ class Settings:
                                     ("CANVAS_HEIGHT", self.__canvas_height), \
                                     ("NUM_SAMPLES", self.__num_samples), \
                                     ("WARN_DUPLICATE_NAMES", self.__warn_duplicate_names), \
+                                    ("CALCULATE_CURRENT_VIEW_ONLY", self.__calculate_current_view_only), \
+                                    ("NUM_CALCULATION_PROCESSES", self.__num_calculation_processes), \
+                                    ("RUN_SCRIPTS_IN_BACKGROUND", self.__run_scripts_in_background), \
+                                    ("RUN_SCRIPTS_IN_SUBPROCESS", self.__run_scripts_in_subprocess), \
+                                    ("PROFILE_SCRIPTS", self.__profile_scripts), \
+                                    ("CACHE_SCRIPT_RESULTS", self.__cache_script_results), \
+                                    ("AUTOSAVE_INTERVAL", self.__autosave_interval), \
+                                    ("NUM_AUTOSAVES", self.__num_autosaves), \
                                     ("SAVE_NAME", self.__save_name)]:
                 file_settings.write(f"{variable} = {value}\n")
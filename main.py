@@ -1,6 +1,7 @@
 import tkinter as tk
 import sys
 import os
+import argparse
 
 sys.path.append("config")
 from program_paths import *
@@ -12,22 +13,70 @@ for path in IMPORT_PATHS:
 from settings import Settings
 
 def main():
-    if len(sys.argv) != 2:
-        print(f"Usage: {sys.argv[0]} <save_name>")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("save_name", nargs="?")
+    parser.add_argument("--import", dest="import_file_path", metavar="FILE", help="import a system model from a .json or .csv file into a new system view")
+    parser.add_argument("--export", dest="export_file_path", metavar="FILE", help="export the values of the save to a .csv, .jsonl or .npz file without opening the program")
+    parser.add_argument("--class-type", dest="class_types", action="append", metavar="NAME", help="class type to export, where all are exported if not specified")
+    parser.add_argument("--attribute", dest="attributes", action="append", metavar="NAME", help="attribute to export, where all are exported if not specified")
+    parser.add_argument("--migrate-metamodels", action="store_true", help="move the metamodels of the save to the metamodel library without opening the program, so that the save refers to them")
+    parser.add_argument("--update-metamodels", action="store_true", help="also change the metamodels that the save refers to to their most recent versions when migrating")
+    arguments = parser.parse_args()
+    
+    if arguments.save_name == None:
+        parser.print_usage()
         
         saves_path = os.path.join(BASE_PATH, SAVES_DIRECTORY)
         print(f"Existing saves: {[name for name in os.listdir(saves_path) if os.path.isdir(os.path.join(saves_path, name))]}")
         return
         
-    save_name = sys.argv[1]
-    
-    settings = Settings(save_name)
+    settings = Settings(arguments.save_name)
     settings.save()
     
+    # Refer to metamodels in the library instead of the copies in the save, without creating any GUI
+    if arguments.migrate_metamodels or arguments.update_metamodels:
+        from metamodel_library import MetamodelLibrary, migrate_save
+        from config import SAVES_PATH
+        
+        try:
+            metamodel_ids = migrate_save(SAVES_PATH, MetamodelLibrary(METAMODELS_PATH), update_to_latest=arguments.update_metamodels)
+            print(f"{arguments.save_name} refers to the metamodels {metamodel_ids} in {METAMODELS_PATH}")
+        except (OSError, ValueError, KeyError) as error:
+            print(f"Error: Could not migrate the metamodels of {arguments.save_name}: {error}")
+            
+        return
+        
+    # Export the values calculated from the compact save, without creating any GUI
+    if arguments.export_file_path != None:
+        from attribute_export import export_compact_save
+        from config import COMPACT_SAVE_PATH
+        
+        if not os.path.exists(COMPACT_SAVE_PATH):
+            print(f"Error: Could not find {COMPACT_SAVE_PATH}, the save needs to be saved from the program once before its values can be exported")
+            return
+            
+        try:
+            num_rows = export_compact_save(COMPACT_SAVE_PATH, arguments.export_file_path, class_types=arguments.class_types, attributes=arguments.attributes)
+            print(f"Exported {num_rows} class instances to {arguments.export_file_path}")
+        except (OSError, ValueError) as error:
+            print(f"Error: Could not export the values to {arguments.export_file_path}: {error}")
+            
+        return
+    
     from model import Model
     
     root = tk.Tk()
     model = Model(root)
+    
+    # Import a system model into a new system view
+    if arguments.import_file_path != None:
+        from system_model_import import import_system_model
+        
+        file_path = arguments.import_file_path
+        setup_view = model.create_view(False, os.path.splitext(os.path.basename(file_path))[0])
+        import_system_model(setup_view, file_path)
+        model.change_view(setup_view)
+        
     root.mainloop()
     
 if __name__ == "__main__":
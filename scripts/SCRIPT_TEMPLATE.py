@@ -5,9 +5,14 @@
 # class_instance: Name of class instance (for example, DoS attack)
 # attribute: Name of attribute (for example, Local difficulty)
 # view: System/setup view name to consider, where None considers all
+# snapshot: Snapshot to read from or change instead of the shown values (see script_if.create_snapshot), where None uses the shown values
 
 # Values passed to the methods should either be a string or a float/integer
 
+# script_if.batch_update()
+#     Returns a context where changed values and markers are only shown once when it exits, which is already used for the whole script when it runs
+#     Example: with script_if.batch_update(): ...
+
 # script_if.get_current_view_name()
 #     Returns the name of the current view
 
@@ -24,24 +29,104 @@
 #     Returns a list of tuples including the class type and class instance names of all classes which the specified system/setup class instance takes input from, considering the optional filtering of classes
 #     Example: [("Attack event AND", "DDoS attack"), ...]
 
-# script_if.get_attribute_values(class_type, class_instance, attribute, view=None)
+# script_if.get_attribute_values(class_type, class_instance, attribute, view=None, *, snapshot=None)
 #     Returns a list of the values displayed by the specified attributes, each displayed value being represented by a tuple
 #     Example: [(1, 2, 3), (0.45,), ("Text",), ...]
 
+# script_if.get_attribute_table(class_type, view=None, *, snapshot=None)
+#     Returns a tuple (table, instance_names, column_names, error_mask) with the numeric attribute values of all instances of a class type as a NumPy array
+#     Each row is a class instance and each column is a number in an attribute, where triangle distributions take three columns (a), (b) and (c)
+#     Text attributes are left out, and values that could not be calculated are NaN in the table and True in error_mask
+#     Example: table, instance_names, column_names, error_mask = script_if.get_attribute_table("Loss event")
+#              ranked_instance_names = [instance_names[i] for i in np.argsort(-table[:, column_names.index("Risk")])]
+
+# script_if.select(selector, *, snapshot=None)
+#     Returns a list of tuples (view, class_type, class_instance, attribute, value) of all attributes matching a selector, once for each view they are in
+#     A selector is written as conditions separated by spaces, each being a field (view, class, instance, attribute or value), an operator and a value
+#     Operators for names: = (equal), != (not equal), ^= (starts with), $= (ends with), *= (contains)
+#     Operators for values: =, !=, <, <=, >, >=, where numbers are compared against all numbers in the value and quoted text against the shown text
+#     Example: script_if.select('view^="Attack tree" class="Attack event" attribute="Global difficulty" value<3')
+
 # script_if.convert_value_to_string(attribute_value)
 #     Returns the specified attribute tuple value as a formatted string
 
-# script_if.override_attribute_values(override_value, class_type, *, class_instance=None, attribute=None, view=None)
+# script_if.override_attribute_values(override_value, class_type, *, class_instance=None, attribute=None, view=None, snapshot=None)
 #     Overrides the displayed value of matching attributes with a temporary one given in string format (as if it was entered through an entry field)
 
-# script_if.reset_override_attribute_values(*, class_type=None, class_instance=None, attribute=None, view=None)
+# script_if.override_attribute_values_bulk(override_values, keys=None, *, view=None, snapshot=None)
+#     Overrides the displayed value of many attributes in one pass, where the override values are numbers, sequences of numbers or strings
+#     The overridden values are shown when the script ends or when calculating values
+#     Example: script_if.override_attribute_values_bulk({("Defense mechanism", "Firewall", "Impact"): 0, ...})
+#     Example: script_if.override_attribute_values_bulk(np.zeros((2, 3)), [("Defense mechanism", "Firewall", "Impact"), ("Defense mechanism", "Antivirus", "Impact")])
+
+# script_if.reset_override_attribute_values(*, class_type=None, class_instance=None, attribute=None, view=None, snapshot=None)
 #     Resets any override value of matching attributes
 
 # script_if.set_class_marker(value, color, *, class_type=None, class_instance=None, view=None)
 #     Adds a visual marker on all matching class instances
 
-# script_if.calculate_values()
-#     Calculates all attribute values
+# script_if.calculate_values(*, snapshot=None)
+#     Calculates all attribute values, or only those of the snapshot affected by changes made to it since its last calculation
+
+# script_if.stream_attribute_values(view=None)
+#     Calculates all attribute values without showing them, where each value is given as soon as it has been calculated instead of keeping all values in memory
+#     Example: for view, class_type, class_instance, attribute, value in script_if.stream_attribute_values(): ...
+
+# script_if.open_result_store(name)
+#     Returns a result store saved in scripts/results/<name>, where results too large to keep in memory, such as the values of each scenario of a batch run, are appended as rows
+#     Each column is a NumPy .npy file that is memory-mapped when read, and index.json lists the key (class_type, class_instance, attribute) of each column
+#     Example: result_store.append({key: values, ...}) appends rows, result_store.get_column(key) returns the values of a column without reading them into memory
+
+# script_if.append_attribute_values(result_store, keys, *, view=None, snapshot=None)
+#     Appends the current values of the specified attributes as one row to a result store, where the columns are added when the first row is appended
+#     Example: script_if.append_attribute_values(result_store, [("Loss event", "Data breach", "Risk"), ...], snapshot=snapshot)
+
+# script_if.export_attribute_values(file_path, class_types=None, attributes=None, *, view=None, snapshot=None)
+#     Writes the values of the specified class types and attributes, None including all, to a .csv, .jsonl or .npz file in scripts/results one class instance at a time, returning the path to the file
+#     Example: script_if.export_attribute_values("Risks.csv", ["Loss event", "Attacker"])
+
+# script_if.create_snapshot()
+#     Returns a snapshot of all current attribute values and override values, which can be changed and calculated without changing the shown values
+
+# script_if.fork_snapshot(snapshot)
+#     Returns a new snapshot starting from the values of the specified one, where values that are not changed are shared between them
+#     Example: Explore alternatives by forking a snapshot for each alternative, overriding values in the fork and calculating it
+
+# script_if.apply_snapshot(snapshot)
+#     Shows the values and override values of the specified snapshot
+
+# script_if.progress(progress, text="")
+#     Shows how much of the script has been completed, given as a value between 0 and 1, on the button of the script
+#     Example: script_if.progress(i / num_alternatives, "Alternatives")
+
+# Scripts run in the background by default (see the general settings), where the program can be used while the script is running
+# All changes made by the script are then shown at once when it has finished, and pressing the button of the script again cancels it
+# Values entered but not calculated are calculated before the script starts, and the script reads values from a snapshot of them, where class instances added while it runs are not found
+# A cancelled script stops the next time it uses script_if, without showing any of its changes
+
+# Scripts can also be written with async def script_control(script_if), where the program responds each time the script awaits script_if
+# When not running in the background, the script then runs in the event loop of the program and changes are shown as they are made
+# Awaited methods: calculate_values, calculate_snapshots(snapshots), reset_script_changes, get_attribute_table, select and pause(), where stream_attribute_values is used with async for
+# Awaited calculations let the program respond in between steps, where values calculated without a snapshot are shown once all have been calculated
+# All other methods are used as in other scripts, and await script_if.pause() lets the program respond within long loops
+# Example:
+#     async def script_control(script_if):
+#         await script_if.reset_script_changes()
+#         await script_if.calculate_snapshots(snapshots)
+# Only script_if can be awaited when running in the event loop of the program, while scripts running in the background or in a separate process run in an asyncio event loop
+
+# Scripts can instead run in a separate process (see the general settings), so that a failing script can not affect the rest of the program
+# The script then reads the current values from shared memory, and its override values and markers are sent back and shown when it finishes
+# script_if.calculate_values() calculates the values within the process, where the program calculates them again when the script finishes
+# Snapshots can not be used by scripts running in a separate process
+
+# The result of a script is cached (see the general settings), where running it again on the same model shows the same override values, markers and printed text without running it
+# The same model means the same configurations, class instances, connections, entered values and settings, where changes by previous scripts are ignored if the script first calls script_if.reset_script_changes()
+# Results of scripts writing files through script_if (export_attribute_values, open_result_store and append_attribute_values) are not cached, as the files would not be written again
+# Turn off the cache for scripts with other effects outside of the program, as these are not repeated
+
+# Scripts can be profiled (see the general settings), where the number of calls and time spent in each method of script_if, in calculations and in showing values is printed when the script finishes
+# The report is also saved as JSON in scripts/profiles/<script name>.json
 
 def script_logic(script_if):
     # Insert logic here
@@ -0,0 +1,230 @@
+import os
+import csv
+import json
+import zipfile
+import numpy as np
+from helper_functions_general import convert_value_to_string, open_atomically
+from compact_save import CompactSave
+
+EXPORT_FORMATS = (".csv", ".jsonl", ".npz") # Extensions of the file formats that attribute values can be exported to
+
+def convert_value_to_json(value):
+    """
+    Converts an attribute value to a list of numbers and strings that can be written as JSON, None if there is no value
+    """
+    if value == None:
+        return None
+        
+    return [float(element) if isinstance(element, (float, np.floating)) else str(element) for element in value]
+    
+def get_value_array(values):
+    """
+    Returns the values of an attribute for all rows of a class type as an array
+    If the values are numbers, the array is 2-D with one row per value and one column per number, where values that are not numbers, such as ("SETUP ERROR",), are NaN
+    Otherwise, the array holds the values as strings
+    """
+    lengths = set(len(value) for value in values if value != None and all(isinstance(element, (float, np.floating)) for element in value))
+    
+    if len(lengths) == 1:
+        length = lengths.pop()
+        array = np.full((len(values), length), np.nan)
+        
+        for i, value in enumerate(values):
+            if value != None and len(value) == length and all(isinstance(element, (float, np.floating)) for element in value):
+                array[i] = value
+                
+        return array
+        
+    return np.array(["" if value == None else convert_value_to_string(tuple(value)) for value in values], dtype=str)
+    
+def write_csv(file, attribute_names_per_class_type, rows):
+    """
+    Writes one line per class instance, with the columns class_type and class_instance followed by one column per attribute name of all class types
+    """
+    attribute_names = list(dict.fromkeys(attribute_name for attribute_names in attribute_names_per_class_type.values() for attribute_name in attribute_names))
+    
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(["class_type", "class_instance"] + attribute_names)
+    num_rows = 0
+    
+    for class_type, class_instance, values in rows:
+        writer.writerow([class_type, class_instance] + ["" if values.get(attribute_name) == None else convert_value_to_string(tuple(values[attribute_name])) for attribute_name in attribute_names])
+        num_rows += 1
+        
+    return num_rows
+    
+def write_json_lines(file, attribute_names_per_class_type, rows):
+    """
+    Writes one JSON object {"class_type": ..., "class_instance": ..., "values": {...}} per line and class instance, in the same format as instances are imported (see read_system_model)
+    """
+    num_rows = 0
+    
+    for class_type, class_instance, values in rows:
+        values = {attribute_name: convert_value_to_json(values.get(attribute_name)) for attribute_name in attribute_names_per_class_type[class_type]}
+        file.write(json.dumps({"class_type": class_type, "class_instance": class_instance, "values": values}) + "\n")
+        num_rows += 1
+        
+    return num_rows
+    
+def write_npz(file, attribute_names_per_class_type, rows):
+    """
+    Writes one array class_instances/<class_type> with the class instance names and one array values/<class_type>/<attribute> per attribute of each class type, see get_value_array
+    The arrays of each class type are written once all of its rows have been read, so that only the rows of one class type are held at once
+    """
+    num_rows = 0
+    
+    with zipfile.ZipFile(file, "w") as zip_file:
+        def write_array(name, array):
+            with zip_file.open(f"{name}.npy", "w", force_zip64=True) as file_array:
+                np.lib.format.write_array(file_array, array, allow_pickle=False)
+                
+        def write_class_type(class_type, class_instances, values_per_attribute):
+            write_array(f"class_instances/{class_type}", np.array(class_instances, dtype=str))
+            
+            for attribute_name, values in values_per_attribute.items():
+                write_array(f"values/{class_type}/{attribute_name}", get_value_array(values))
+                
+        written_class_types = set()
+        current_class_type = None
+        
+        for class_type, class_instance, values in rows:
+            if class_type != current_class_type:
+                if current_class_type != None:
+                    write_class_type(current_class_type, class_instances, values_per_attribute)
+                    
+                if class_type in written_class_types:
+                    raise ValueError(f"The rows of the class type {class_type} need to follow each other when exporting to .npz files")
+                    
+                written_class_types.add(class_type)
+                current_class_type = class_type
+                class_instances = []
+                values_per_attribute = {attribute_name: [] for attribute_name in attribute_names_per_class_type[class_type]}
+                
+            class_instances.append(class_instance)
+            
+            for attribute_name, attribute_values in values_per_attribute.items():
+                attribute_values.append(values.get(attribute_name))
+                
+            num_rows += 1
+            
+        if current_class_type != None:
+            write_class_type(current_class_type, class_instances, values_per_attribute)
+            
+    return num_rows
+    
+def export_attribute_values(file_path, attribute_names_per_class_type, rows):
+    """
+    Writes attribute values to a CSV, JSON Lines or NumPy .npz file depending on the extension of the file path, one row at a time as the rows are read
+    The file is replaced once it has been written, so that an interrupted export never leaves a partially written file
+    
+    attribute_names_per_class_type: Dictionary with the names of the exported class types as keys and lists of the names of their exported attributes as values
+    rows: Iterable of tuples (class_type, class_instance, values) for each class instance, where values is a dictionary with attribute names as keys,
+          and where the rows of each class type follow each other
+          
+    Returns the number of rows written
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    
+    if not extension in EXPORT_FORMATS:
+        raise ValueError(f"Could not export to {file_path}, as only the formats {', '.join(EXPORT_FORMATS)} are supported")
+        
+    if os.path.dirname(file_path) != "":
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+    if extension == ".npz":
+        with open_atomically(file_path, "wb") as file_export:
+            return write_npz(file_export, attribute_names_per_class_type, rows)
+            
+    with open_atomically(file_path, "w") as file_export:
+        if extension == ".csv":
+            return write_csv(file_export, attribute_names_per_class_type, rows)
+            
+        return write_json_lines(file_export, attribute_names_per_class_type, rows)
+        
+def get_setup_class_rows(setup_classes, attribute_names_per_class_type, get_value=None):
+    """
+    Yields the rows of setup classes without a GUI for export_attribute_values, reading the values of each setup class in one pass over its setup attributes
+    
+    setup_classes: Setup classes ordered so that those of each class type follow each other, where those of class types not in attribute_names_per_class_type are skipped
+    get_value: Function returning the value of a setup attribute, None using its current value
+    """
+    if get_value == None:
+        get_value = lambda setup_attribute: setup_attribute.get_current_value()
+        
+    for setup_class in setup_classes:
+        class_type = setup_class.get_configuration_name()
+        
+        if not class_type in attribute_names_per_class_type:
+            continue
+            
+        attribute_names = attribute_names_per_class_type[class_type]
+        values = {setup_attribute.get_name(): get_value(setup_attribute) for setup_attribute in setup_class.get_setup_attributes() if setup_attribute.get_name() in attribute_names}
+        
+        yield class_type, setup_class.get_instance_name(), values
+        
+def get_attribute_names_per_class_type(setup_classes, class_types=None, attributes=None):
+    """
+    Returns a dictionary with the names of the attributes shown in setup views for each class type of the setup classes, in the order the class types are first found
+    
+    class_types: Names of the class types to include, None including all
+    attributes: Names of the attributes to include, None including all
+    """
+    attribute_names_per_class_type = {}
+    
+    for setup_class in setup_classes:
+        class_type = setup_class.get_configuration_name()
+        
+        if class_type in attribute_names_per_class_type or (class_types != None and not class_type in class_types):
+            continue
+            
+        attribute_names_per_class_type[class_type] = [setup_attribute.get_name() for setup_attribute in setup_class.get_setup_attributes() \
+                                                      if not setup_attribute.is_hidden() and (attributes == None or setup_attribute.get_name() in attributes)]
+                                                      
+    return attribute_names_per_class_type
+    
+def export_setup_classes(file_path, setup_classes, *, class_types=None, attributes=None, get_value=None):
+    """
+    Exports the attribute values of setup classes without a GUI, such as those of a calculation model, see export_attribute_values
+    
+    Returns the number of rows written
+    """
+    attribute_names_per_class_type = get_attribute_names_per_class_type(setup_classes, class_types, attributes)
+    
+    # Order the setup classes so that those of each class type follow each other
+    class_type_order = {class_type: i for i, class_type in enumerate(attribute_names_per_class_type)}
+    setup_classes = sorted(setup_classes, key=lambda setup_class: class_type_order.get(setup_class.get_configuration_name(), -1))
+    
+    return export_attribute_values(file_path, attribute_names_per_class_type, get_setup_class_rows(setup_classes, attribute_names_per_class_type, get_value))
+    
+def export_compact_save(compact_save_path, file_path, *, class_types=None, attributes=None):
+    """
+    Exports the attribute values of the setup views in a compact save (see CompactSave), calculated without creating any GUI, see export_attribute_values
+    
+    Returns the number of rows written
+    """
+    setup_classes = CompactSave(compact_save_path).create_calculation_model().get_setup_classes()
+    
+    for setup_class in setup_classes:
+        setup_class.calculate_values()
+        
+    return export_setup_classes(file_path, setup_classes, class_types=class_types, attributes=attributes)
+    
+def export_setup_view(setup_view, file_path):
+    """
+    Exports the attribute values of all setup classes in a setup view from its options, printing why the export failed instead of raising an exception
+    """
+    if file_path.strip() == "":
+        return
+        
+    model = setup_view.get_model()
+    
+    if setup_view in model.get_stale_setup_views():
+        model.calculate_current_values()
+        
+    setup_classes = list(dict.fromkeys(setup_class_gui.get_setup_class() for setup_class_gui in setup_view.get_setup_classes_gui()))
+    
+    try:
+        num_rows = export_setup_classes(file_path.strip(), setup_classes)
+        print(f"Exported {num_rows} class instances to {file_path.strip()}")
+    except (OSError, ValueError) as error:
+        print(f"Error: Could not export the values to {file_path}: {error}")
@@ -0,0 +1,101 @@
+import os
+import pickle
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+from config import *
+
+class Autosaver:
+    """
+    Writes autosaves of the model in a separate thread so that the program can be used while they are written, keeping only the most recent autosaves
+    Each autosave is a directory with the same files as a save (see Model.save), except model.npz, so that it can be restored by copying its files to the directory of a save
+    Metamodels in the library that the save refers to are also written, as a copy of the metamodel that the autosave was made with
+    """
+    def __init__(self, autosaves_path):
+        self.__autosaves_path = autosaves_path
+        self.__thread = None
+        self.__last_hash = None # Hash of the last autosave written, used to skip autosaves when nothing has changed
+        
+    def is_writing(self):
+        return self.__thread != None and self.__thread.is_alive()
+        
+    def autosave(self, saved_states_views, num_autosaves):
+        """
+        Starts writing an autosave in a separate thread, unless the previous autosave is still being written
+        
+        saved_states_views: List of tuples (path to the file save, saved states) of all views in the order they are restored, see Model.get_saved_states_views
+        num_autosaves: Number of the most recent autosaves to keep
+        
+        Returns whether an autosave was started
+        """
+        if self.is_writing():
+            return False
+            
+        self.__thread = threading.Thread(target=self.write, args=(saved_states_views, num_autosaves), daemon=True)
+        self.__thread.start()
+        
+        return True
+        
+    def wait(self):
+        """
+        Waits until the autosave currently being written is finished
+        """
+        if self.__thread != None:
+            self.__thread.join()
+            
+    def write(self, saved_states_views, num_autosaves):
+        """
+        Writes an autosave to a new directory named after the current time, after which the oldest autosaves are removed
+        The autosave is written to a temporary directory that is renamed once all files are written, so that an interrupted autosave is never restored
+        
+        Returns the path to the autosave, None if nothing has changed since the last autosave
+        """
+        data_views = [(file_path, pickle.dumps(saved_states)) for file_path, saved_states in saved_states_views]
+        data_hash = hashlib.sha256(pickle.dumps(data_views)).hexdigest()
+        
+        if data_hash == self.__last_hash:
+            return None
+            
+        autosave_path = os.path.join(self.__autosaves_path, datetime.now().strftime(AUTOSAVE_NAME_FORMAT))
+        temporary_autosave_path = f"{autosave_path}.tmp"
+        
+        for directory in [CONFIGURATION_SAVES_DIRECTORY, SETUP_SAVES_DIRECTORY, METAMODEL_LIBRARY_DIRECTORY]:
+            os.makedirs(os.path.join(temporary_autosave_path, directory), exist_ok=True)
+            
+        for file_path, data in data_views:
+            with open(os.path.join(temporary_autosave_path, file_path), "wb") as file_pickle:
+                file_pickle.write(data)
+                
+        with open(os.path.join(temporary_autosave_path, os.path.basename(FILE_PATHS_SAVES_PATH)), "w") as file_with_paths:
+            for file_path, data in data_views:
+                file_with_paths.write(f"{file_path}\n")
+                
+        os.replace(temporary_autosave_path, autosave_path)
+        self.__last_hash = data_hash
+        
+        self.remove_old_autosaves(num_autosaves)
+        
+        return autosave_path
+        
+    def get_autosave_paths(self):
+        """
+        Returns the paths to all autosaves, from the oldest to the most recent
+        """
+        if not os.path.exists(self.__autosaves_path):
+            return []
+            
+        return [os.path.join(self.__autosaves_path, name) for name in sorted(os.listdir(self.__autosaves_path)) if not name.endswith(".tmp")]
+        
+    def remove_old_autosaves(self, num_autosaves):
+        """
+        Removes all but the most recent autosaves, as well as any autosaves that were interrupted before being finished
+        """
+        for name in os.listdir(self.__autosaves_path):
+            if name.endswith(".tmp"):
+                shutil.rmtree(os.path.join(self.__autosaves_path, name), ignore_errors=True)
+                
+        autosave_paths = self.get_autosave_paths()
+        
+        for autosave_path in autosave_paths[:max(0, len(autosave_paths) - num_autosaves)]:
+            shutil.rmtree(autosave_path, ignore_errors=True)
@@ -0,0 +1,139 @@
+from config import *
+
+class CalculationGraph:
+    """
+    Dependencies between setup attributes, used to find the order in which attributes should be calculated and which attributes are affected by a change
+    """
+    def __init__(self, setup_classes):
+        self.__setup_attributes = [] # All setup attributes of the specified setup classes
+        self.__input_setup_attributes = {} # Key: Setup attribute, Value: Dictionary with input setup attributes as keys and input scalars as values
+        self.__dependent_setup_attributes = {} # Key: Setup attribute, Value: List of setup attributes taking it as input
+        
+        for setup_class in setup_classes:
+            for setup_attribute in setup_class.get_setup_attributes():
+                if not setup_attribute in self.__input_setup_attributes:
+                    self.__setup_attributes.append(setup_attribute)
+                    self.__input_setup_attributes[setup_attribute] = setup_attribute.get_connected_setup_attributes()
+                    
+        for setup_attribute, input_setup_attributes in self.__input_setup_attributes.items():
+            for input_setup_attribute in input_setup_attributes:
+                self.__dependent_setup_attributes.setdefault(input_setup_attribute, []).append(setup_attribute)
+                
+        self.__topological_order = self.find_topological_order()
+        self.__topological_index = {setup_attribute: i for i, setup_attribute in enumerate(self.__topological_order)}
+        
+    def get_setup_attributes(self):
+        return self.__setup_attributes
+        
+    def has_setup_attribute(self, setup_attribute):
+        return setup_attribute in self.__input_setup_attributes
+        
+    def get_input_setup_attributes(self, setup_attribute):
+        """
+        Returns a dictionary with the input setup attributes of the specified setup attribute as keys and their input scalars as values
+        """
+        return self.__input_setup_attributes.get(setup_attribute, {})
+        
+    def get_dependent_setup_attributes(self, setup_attribute):
+        return self.__dependent_setup_attributes.get(setup_attribute, [])
+        
+    def get_external_setup_attributes(self):
+        """
+        Returns all setup attributes that are used as input but are not part of the graph, such as those only found in excluded views
+        """
+        external_setup_attributes = []
+        
+        for input_setup_attributes in self.__input_setup_attributes.values():
+            for input_setup_attribute in input_setup_attributes:
+                if not input_setup_attribute in self.__input_setup_attributes and not input_setup_attribute in external_setup_attributes:
+                    external_setup_attributes.append(input_setup_attribute)
+                    
+        return external_setup_attributes
+        
+    def get_topological_order(self):
+        return self.__topological_order
+        
+    def find_topological_order(self):
+        """
+        Returns all setup attributes of the graph ordered so that each setup attribute comes after all of its inputs
+        """
+        number_of_remaining_inputs = {}
+        
+        for setup_attribute, input_setup_attributes in self.__input_setup_attributes.items():
+            number_of_remaining_inputs[setup_attribute] = sum(1 for input_setup_attribute in input_setup_attributes if input_setup_attribute in self.__input_setup_attributes)
+            
+        ordered_setup_attributes = [setup_attribute for setup_attribute in self.__setup_attributes if number_of_remaining_inputs[setup_attribute] == 0]
+        
+        i = 0
+        
+        while i < len(ordered_setup_attributes):
+            for dependent_setup_attribute in self.get_dependent_setup_attributes(ordered_setup_attributes[i]):
+                number_of_remaining_inputs[dependent_setup_attribute] -= 1
+                
+                if number_of_remaining_inputs[dependent_setup_attribute] == 0:
+                    ordered_setup_attributes.append(dependent_setup_attribute)
+                    
+            i += 1
+            
+        # Setup attributes that are part of a cycle can not be ordered, so they are placed last
+        if len(ordered_setup_attributes) < len(self.__setup_attributes):
+            print("Warning: Found setup attributes that are connected in a cycle, their values might not be correctly calculated")
+            
+            for setup_attribute in self.__setup_attributes:
+                if number_of_remaining_inputs[setup_attribute] > 0:
+                    ordered_setup_attributes.append(setup_attribute)
+                    
+        return ordered_setup_attributes
+        
+    def get_connected_components(self):
+        """
+        Returns a list of independent parts of the graph, each part being a list of setup attributes in the order they should be calculated, where no setup attribute takes input from another part
+        """
+        parent_per_setup_attribute = {setup_attribute: setup_attribute for setup_attribute in self.__setup_attributes}
+        
+        def find_root(setup_attribute):
+            root = setup_attribute
+            
+            while parent_per_setup_attribute[root] != root:
+                root = parent_per_setup_attribute[root]
+                
+            # Point all visited setup attributes directly to the root to speed up later searches
+            while parent_per_setup_attribute[setup_attribute] != root:
+                parent_per_setup_attribute[setup_attribute], setup_attribute = root, parent_per_setup_attribute[setup_attribute]
+                
+            return root
+            
+        # Join the parts of all setup attributes connected as input
+        for setup_attribute, input_setup_attributes in self.__input_setup_attributes.items():
+            for input_setup_attribute in input_setup_attributes:
+                if input_setup_attribute in parent_per_setup_attribute:
+                    parent_per_setup_attribute[find_root(input_setup_attribute)] = find_root(setup_attribute)
+                    
+        components_per_root = {}
+        
+        for setup_attribute in self.__topological_order:
+            components_per_root.setdefault(find_root(setup_attribute), []).append(setup_attribute)
+            
+        return list(components_per_root.values())
+        
+    def get_affected_setup_attributes(self, changed_setup_attributes):
+        """
+        Returns the specified setup attributes and all setup attributes that directly or indirectly take them as input, in the order they should be calculated
+        """
+        affected_setup_attributes = set()
+        to_visit = list(changed_setup_attributes)
+        
+        while len(to_visit) > 0:
+            setup_attribute = to_visit.pop()
+            
+            if not setup_attribute in affected_setup_attributes:
+                affected_setup_attributes.add(setup_attribute)
+                to_visit.extend(self.get_dependent_setup_attributes(setup_attribute))
+                
+        return self.sort_setup_attributes(affected_setup_attributes)
+        
+    def sort_setup_attributes(self, setup_attributes):
+        """
+        Returns the setup attributes of the graph among those specified in the order they should be calculated
+        """
+        return sorted((setup_attribute for setup_attribute in setup_attributes if setup_attribute in self.__topological_index), key=self.__topological_index.get)
@@ -0,0 +1,138 @@
+from calculation_graph import CalculationGraph
+from config import *
+
+class CalculationModel:
+    """
+    Setup classes of each setup view without any GUI, used for calculating values without showing them
+    """
+    def __init__(self):
+        self.__setup_classes_per_view = {} # Key: Setup view name, Value: List of setup classes in the setup view
+        self.__entered_values = {} # Key: Setup attribute, Value: Value entered but not necessarily calculated, used instead of the value of the setup attribute
+        
+    @staticmethod
+    def from_model(model):
+        """
+        Returns a calculation model with the setup classes of all setup views that are not excluded in the specified GUI model
+        """
+        calculation_model = CalculationModel()
+        model.restore_deferred_setup_views() # The setup classes are only created when the saves of the setup views are restored
+        
+        for setup_view in model.get_setup_views():
+            if not setup_view.is_excluded():
+                calculation_model.add_setup_view(setup_view.get_name())
+                
+                for setup_class_gui in setup_view.get_setup_classes_gui():
+                    calculation_model.add_setup_class(setup_view.get_name(), setup_class_gui.get_setup_class())
+                    
+                    # Use the values currently entered in the entry fields, without changing the setup attributes
+                    for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
+                        if setup_attribute_gui.has_manually_entered_value():
+                            calculation_model.set_entered_value(setup_attribute_gui.get_setup_attribute(), setup_attribute_gui.get_entered_value())
+                            
+        return calculation_model
+        
+    def add_setup_view(self, view_name):
+        if not view_name in self.__setup_classes_per_view:
+            self.__setup_classes_per_view[view_name] = []
+            
+    def add_setup_class(self, view_name, setup_class):
+        self.add_setup_view(view_name)
+        
+        if not setup_class in self.__setup_classes_per_view[view_name]:
+            self.__setup_classes_per_view[view_name].append(setup_class)
+            
+    def set_entered_value(self, setup_attribute, value):
+        self.__entered_values[setup_attribute] = value
+        
+    def get_view_names(self):
+        return list(self.__setup_classes_per_view.keys())
+        
+    def get_setup_classes(self, view_name=None):
+        """
+        Returns a list of the setup classes in the specified setup view, None considering all setup views, where linked copies are only included once
+        """
+        setup_classes = []
+        seen_setup_classes = set()
+        
+        for current_view_name, setup_classes_in_view in self.__setup_classes_per_view.items():
+            if view_name in (None, current_view_name):
+                for setup_class in setup_classes_in_view:
+                    if not setup_class in seen_setup_classes:
+                        setup_classes.append(setup_class)
+                        seen_setup_classes.add(setup_class)
+                        
+        return setup_classes
+        
+    def get_upstream_setup_classes(self, setup_classes):
+        """
+        Returns a list of the specified setup classes and all setup classes they directly or indirectly take input from
+        """
+        upstream_setup_classes = []
+        seen_setup_classes = set()
+        to_visit = list(setup_classes)
+        
+        while len(to_visit) > 0:
+            setup_class = to_visit.pop()
+            
+            if not setup_class in seen_setup_classes:
+                upstream_setup_classes.append(setup_class)
+                seen_setup_classes.add(setup_class)
+                to_visit.extend(setup_class.get_input_setup_classes().keys())
+                
+        return upstream_setup_classes
+        
+    def stream_values(self, view_name=None):
+        """
+        Calculates the values of the specified setup view, None considering all setup views, and yields each value as soon as it has been calculated
+        Calculated values are only kept until all setup attributes taking them as input have been calculated, so that not all values are held at once
+        
+        Yields tuples (view_name, class_type, class_instance, attribute, value) in an order where inputs come before the attributes taking them as input
+        """
+        view_names_per_setup_class = {} # Key: Setup class, Value: List of names of the setup views the setup class is in
+        
+        for current_view_name, setup_classes_in_view in self.__setup_classes_per_view.items():
+            if view_name in (None, current_view_name):
+                for setup_class in setup_classes_in_view:
+                    view_names_per_setup_class.setdefault(setup_class, []).append(current_view_name)
+                    
+        calculation_graph = CalculationGraph(self.get_upstream_setup_classes(view_names_per_setup_class.keys()))
+        
+        current_values = {} # Key: Setup attribute, Value: Current value kept until all setup attributes taking it as input have been calculated
+        number_of_remaining_dependents = {}
+        
+        for setup_attribute in calculation_graph.get_topological_order():
+            input_setup_attributes = calculation_graph.get_input_setup_attributes(setup_attribute)
+            
+            if setup_attribute.has_override_value():
+                current_value = setup_attribute.get_override_value()
+                
+            elif setup_attribute.is_calculated():
+                current_value = setup_attribute.combine_connected_values(input_setup_attributes, lambda input_setup_attribute: current_values[input_setup_attribute])
+                
+            elif setup_attribute in self.__entered_values:
+                current_value = self.__entered_values[setup_attribute]
+                
+            else:
+                current_value = setup_attribute.get_value()
+                
+            # Remove values that are no longer needed as input
+            for input_setup_attribute in input_setup_attributes:
+                number_of_remaining_dependents[input_setup_attribute] -= 1
+                
+                if number_of_remaining_dependents[input_setup_attribute] == 0:
+                    current_values.pop(input_setup_attribute)
+                    
+            number_of_dependents = len(calculation_graph.get_dependent_setup_attributes(setup_attribute))
+            
+            if number_of_dependents > 0:
+                current_values[setup_attribute] = current_value
+                number_of_remaining_dependents[setup_attribute] = number_of_dependents
+                
+            setup_class = setup_attribute.get_setup_class()
+            
+            # Hidden attributes are not shown in the setup views
+            if setup_attribute.is_hidden():
+                continue
+                
+            for current_view_name in view_names_per_setup_class.get(setup_class, []):
+                yield (current_view_name, setup_class.get_configuration_name(), setup_class.get_instance_name(), setup_attribute.get_name(), current_value)
@@ -0,0 +1,150 @@
+from helper_functions_general import measure
+from config import *
+
+class CalculationSnapshot:
+    """
+    Copy of the values and override values of setup attributes that can be changed and recalculated without affecting the setup attributes themselves
+    A forked snapshot only stores the values that differ from the snapshot it was forked from, sharing all other values with it
+    """
+    def __init__(self, calculation_graph, parent_snapshot=None):
+        self.__calculation_graph = calculation_graph
+        self.__parent_snapshot = parent_snapshot
+        self.__values = {} # Key: Setup attribute, Value: Value (tuple) that differs from the parent snapshot
+        self.__override_values = {} # Key: Setup attribute, Value: Override value (tuple), or None if reset, that differs from the parent snapshot
+        self.__changed_setup_attributes = set() # Setup attributes with override values changed since the last calculation
+        
+        # The first snapshot copies the current values of all setup attributes in the graph
+        if parent_snapshot == None:
+            for setup_attribute in calculation_graph.get_setup_attributes() + calculation_graph.get_external_setup_attributes():
+                self.__values[setup_attribute] = setup_attribute.get_value()
+                self.__override_values[setup_attribute] = setup_attribute.get_override_value()
+        else:
+            self.__changed_setup_attributes = parent_snapshot.get_changed_setup_attributes().copy()
+            
+    def fork(self):
+        """
+        Returns a new snapshot starting from the values of this one, where changes made to either does not affect the other
+        """
+        return CalculationSnapshot(self.__calculation_graph, self)
+        
+    def get_parent_snapshot(self):
+        return self.__parent_snapshot
+        
+    def get_calculation_graph(self):
+        return self.__calculation_graph
+        
+    def get_changed_setup_attributes(self):
+        return self.__changed_setup_attributes
+        
+    def get_number_of_stored_values(self):
+        """
+        Returns the number of values and override values stored by this snapshot and not shared with the snapshot it was forked from
+        """
+        return len(self.__values) + len(self.__override_values)
+        
+    def get_value(self, setup_attribute):
+        snapshot = self
+        
+        # Use the value of the closest snapshot that has stored one
+        while snapshot != None:
+            if setup_attribute in snapshot.__values:
+                return snapshot.__values[setup_attribute]
+                
+            snapshot = snapshot.__parent_snapshot
+            
+        return setup_attribute.get_value()
+        
+    def get_override_value(self, setup_attribute):
+        snapshot = self
+        
+        # Use the override value of the closest snapshot that has stored one
+        while snapshot != None:
+            if setup_attribute in snapshot.__override_values:
+                return snapshot.__override_values[setup_attribute]
+                
+            snapshot = snapshot.__parent_snapshot
+            
+        return setup_attribute.get_override_value()
+        
+    def set_override_value(self, setup_attribute, override_value):
+        self.__override_values[setup_attribute] = override_value
+        self.__changed_setup_attributes.add(setup_attribute)
+        
+    def has_override_value(self, setup_attribute):
+        return self.get_override_value(setup_attribute) != None
+        
+    def reset_override_value(self, setup_attribute):
+        if self.has_override_value(setup_attribute):
+            self.set_override_value(setup_attribute, None)
+            
+    def get_current_value(self, setup_attribute):
+        override_value = self.get_override_value(setup_attribute)
+        
+        if override_value != None:
+            return override_value
+            
+        return self.get_value(setup_attribute)
+        
+    @measure("Calculation: CalculationSnapshot.calculate_values")
+    def calculate_values(self):
+        """
+        Recalculates the values of all setup attributes affected by override values changed since the last calculation
+        """
+        for step in self.calculate_values_in_steps(None):
+            pass
+            
+    def calculate_values_in_steps(self, num_setup_attributes_per_step):
+        """
+        Recalculates the values in the same way as calculate_values, yielding after each number of calculated setup attributes so that the calculation can be spread out over time
+        If not run to the end, all affected values are recalculated the next time
+        
+        num_setup_attributes_per_step: Number of setup attributes calculated between each yield, None never yielding
+        """
+        num_calculated_setup_attributes = 0
+        
+        for setup_attribute in self.__calculation_graph.get_affected_setup_attributes(self.__changed_setup_attributes):
+            if setup_attribute.is_calculated():
+                value = setup_attribute.combine_connected_values(self.__calculation_graph.get_input_setup_attributes(setup_attribute), self.get_current_value)
+                
+                # Only store values that differ to share as much as possible with the parent snapshot
+                if value != self.get_value(setup_attribute):
+                    self.__values[setup_attribute] = value
+                    
+                num_calculated_setup_attributes += 1
+                
+                if num_setup_attributes_per_step != None and num_calculated_setup_attributes % num_setup_attributes_per_step == 0:
+                    yield
+                    
+        self.__changed_setup_attributes = set()
+        
+    @measure("Calculation: CalculationSnapshot.apply")
+    def apply(self):
+        """
+        Sets the values and override values of the setup attributes to those of this snapshot
+        """
+        for setup_attribute in self.__calculation_graph.get_setup_attributes():
+            setup_attribute.set_value(self.get_value(setup_attribute))
+            setup_attribute.set_override_value(self.get_override_value(setup_attribute))
+            
+    def get_changed_override_values(self):
+        """
+        Returns a dictionary with the override values set or reset in this snapshot and the snapshots it was forked from, not including those copied by the first snapshot
+        """
+        changed_override_values = {}
+        snapshot = self
+        
+        # The closest snapshot that has stored an override value has the one to use
+        while snapshot.__parent_snapshot != None:
+            for setup_attribute, override_value in snapshot.__override_values.items():
+                changed_override_values.setdefault(setup_attribute, override_value)
+                
+            snapshot = snapshot.__parent_snapshot
+            
+        return changed_override_values
+        
+    def apply_changed_override_values(self):
+        """
+        Sets the override values set or reset in this snapshot and the snapshots it was forked from on the setup attributes, leaving all other values unchanged
+        """
+        for setup_attribute, override_value in self.get_changed_override_values().items():
+            setup_attribute.set_override_value(override_value)
@@ -1,24 +1,28 @@
 import os
 import numpy as np
 from helper_functions_general import convert_value_to_string, convert_string_to_value
-from config import *
 
-def combine_values(value_type, calculation_type, input_setup_attributes, setup_input_scalars_per_attribute, configuration_attribute, num_samples):
+def combine_values(value_type, calculation_type, input_value_types, input_values, setup_input_scalars_per_attribute, input_scalar, input_offset, num_samples):
     """
-    Returns a string of the calculated value by combining the value of all input setup attributes according to the calculation type
+    Returns a string of the calculated value by combining the values of all input setup attributes according to the calculation type
+    
+    input_value_types: List of value types of each input setup attribute
+    input_values: List of current values (tuples) of each input setup attribute
+    setup_input_scalars_per_attribute: List of input scalars (or None) of each input setup attribute
+    input_scalar: Scalar of the configuration attribute applied to the calculated value
+    input_offset: Offset of the configuration attribute added to the calculated value
     """
     calculated_value = value_type.default_value()
-    input_values = []
+    converted_input_values = []
     
     number_of_inputs = calculation_type.number_of_inputs()
     
     # Missing connected setup attributes for the given calculation type to be correctly calculated
-    if number_of_inputs != None and len(input_setup_attributes) != number_of_inputs:
+    if number_of_inputs != None and len(input_values) != number_of_inputs:
         return ("-",)
         
-    for i, input_setup_attribute in enumerate(input_setup_attributes):
-        input_value_type = input_setup_attribute.get_value_type()
-        input_value = input_setup_attribute.get_current_value()
+    for i, input_value in enumerate(input_values):
+        input_value_type = input_value_types[i]
         
         # If an input value could not previously be calculated, this value cannot be calculated either
         if input_value in (("-",), ("SETUP ERROR",)):
@@ -35,10 +39,10 @@ def combine_values(value_type, calculation_type, input_setup_attributes, setup_i
         if setup_input_scalars != None:
             input_value = apply_setup_input_scalars(input_value, np.array(setup_input_scalars), input_value_type.allowed_number_of_scalars())
             
-        input_values.append(input_value)
+        converted_input_values.append(input_value)
         
-    if len(input_values) > 0:
-        calculated_value = calculation_type.calculate_output_value(input_values, num_samples) * configuration_attribute.get_input_scalar() + configuration_attribute.get_input_offset()
+    if len(converted_input_values) > 0:
+        calculated_value = calculation_type.calculate_output_value(converted_input_values, num_samples) * input_scalar + input_offset
         calculated_value = value_type.adjust_to_range(calculated_value)
         
     return tuple(calculated_value)
@@ -86,6 +90,13 @@ class ValueType:
             
         return True
         
+    @staticmethod
+    def component_names():
+        """
+        Returns a tuple with the name of each number in a value, empty if the value type does not consist of numbers
+        """
+        return ()
+        
     @staticmethod
     def is_correct_input_value(input_value):
         """
@@ -134,6 +145,10 @@ class ValueTypeNumber(ValueType):
     def default_value():
         return np.zeros(1)
         
+    @staticmethod
+    def component_names():
+        return ("",)
+        
     @staticmethod
     def allowed_number_of_scalars():
         return (1,)
@@ -190,6 +205,10 @@ class ValueTypeProbability(ValueType):
     def default_value():
         return np.zeros(1)
         
+    @staticmethod
+    def component_names():
+        return ("",)
+        
     @staticmethod
     def allowed_number_of_scalars():
         return (1,)
@@ -257,6 +276,10 @@ class ValueTypeTriangleDistribution(ValueType):
     def default_value():
         return np.zeros(3)
         
+    @staticmethod
+    def component_names():
+        return ("a", "b", "c")
+        
     @staticmethod
     def allowed_number_of_scalars():
         return (1, 3)
@@ -0,0 +1,130 @@
+import atexit
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from general_calculations import combine_values
+from config import *
+
+executor = None # Processes kept between calculations, created when first needed, see get_executor
+executor_num_processes = 0 # Number of processes of the executor
+
+def calculate_values_in_parallel(calculation_graph, num_processes):
+    """
+    Calculates the values of all setup attributes in the graph without a value, where independent parts of the graph are calculated in separate processes
+    
+    calculation_graph: Graph containing all setup attributes that are calculated and all setup attributes they take input from
+    num_processes: Maximum number of processes to use
+    """
+    components = calculation_graph.get_connected_components()
+    
+    # Group the independent parts into one batch per process, where each batch is given the currently smallest number of setup attributes
+    num_batches = max(1, min(num_processes, len(components)))
+    batches = [[] for i in range(num_batches)]
+    
+    for component in sorted(components, key=len, reverse=True):
+        min(batches, key=len).extend(component)
+        
+    calculation_tasks = [compile_calculation_task(calculation_graph, batch) for batch in batches if len(batch) > 0]
+    
+    if len(calculation_tasks) > 1:
+        calculated_values_per_task = list(get_executor(len(calculation_tasks)).map(evaluate_calculation_task, calculation_tasks))
+    else:
+        calculated_values_per_task = [evaluate_calculation_task(calculation_task) for calculation_task in calculation_tasks]
+        
+    # Merge the results from each process
+    for batch, calculated_values in zip(batches, calculated_values_per_task):
+        for setup_attribute, calculated_value in zip(batch, calculated_values):
+            if setup_attribute.get_value() == None:
+                setup_attribute.set_value(calculated_value)
+                
+def get_executor(num_processes):
+    """
+    Returns the processes used for calculating, which are started once and kept between calculations, unless more processes are needed than are running
+    New processes are started rather than copies of this one, as copying the process of the GUI while other threads are running is not safe
+    """
+    global executor, executor_num_processes
+    
+    if executor == None or executor_num_processes < num_processes:
+        shutdown_executor()
+        executor = ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context("spawn"), initializer=reseed_random_generator)
+        executor_num_processes = num_processes
+        
+    return executor
+    
+@atexit.register
+def shutdown_executor():
+    """
+    Stops the processes used for calculating, which is done when the program exits
+    """
+    global executor, executor_num_processes
+    
+    if executor != None:
+        executor.shutdown()
+        executor = None
+        executor_num_processes = 0
+        
+def reseed_random_generator():
+    """
+    Gives each process its own random numbers, as processes might otherwise start from the same random state when sampling
+    """
+    np.random.seed()
+    
+def compile_calculation_task(calculation_graph, setup_attributes):
+    """
+    Returns a task that can be sent to another process for calculating the values of the specified setup attributes, which should be ordered so that inputs come before the setup attributes taking them as input
+    """
+    index_per_setup_attribute = {setup_attribute: i for i, setup_attribute in enumerate(setup_attributes)}
+    calculation_nodes = []
+    
+    for setup_attribute in setup_attributes:
+        value = setup_attribute.get_value()
+        override_value = setup_attribute.get_override_value()
+        input_setup_attributes = calculation_graph.get_input_setup_attributes(setup_attribute)
+        
+        configuration_attribute = setup_attribute.get_configuration_attribute()
+        value_type = configuration_attribute.get_value_type()
+        calculation_type = configuration_attribute.get_calculation_type()
+        
+        # Configuration errors are found before sending the task so that any warnings are shown
+        if value == None and not value_type.correctly_connected(calculation_type, list(configuration_attribute.get_input_configuration_attributes().keys())):
+            value = ("CONFIGURATION ERROR",)
+            
+        calculation_nodes.append((value, \
+                                  override_value, \
+                                  value_type, \
+                                  calculation_type, \
+                                  [index_per_setup_attribute[input_setup_attribute] for input_setup_attribute in input_setup_attributes], \
+                                  [input_setup_attribute.get_value_type() for input_setup_attribute in input_setup_attributes], \
+                                  list(input_setup_attributes.values()), \
+                                  configuration_attribute.get_input_scalar(), \
+                                  configuration_attribute.get_input_offset()))
+                                  
+    return (calculation_nodes, settings.get_num_samples())
+    
+def evaluate_calculation_task(calculation_task):
+    """
+    Returns a list of the values of each setup attribute in a task created by compile_calculation_task
+    """
+    calculation_nodes, num_samples = calculation_task
+    values = []
+    current_values = []
+    
+    for value, override_value, value_type, calculation_type, input_indices, input_value_types, setup_input_scalars_per_attribute, input_scalar, input_offset in calculation_nodes:
+        if value == None:
+            value = combine_values(value_type, \
+                                   calculation_type, \
+                                   input_value_types, \
+                                   [current_values[i] for i in input_indices], \
+                                   setup_input_scalars_per_attribute, \
+                                   input_scalar, \
+                                   input_offset, \
+                                   num_samples)
+                                   
+        values.append(value)
+        
+        if override_value != None:
+            current_values.append(override_value)
+        else:
+            current_values.append(value)
+            
+    return values
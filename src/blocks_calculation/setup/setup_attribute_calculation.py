@@ -8,6 +8,9 @@ class SetupAttribute:
         self.__value = None # None or a tuple
         self.__override_value = None # None or a tuple
         
+    def get_setup_class(self):
+        return self.__setup_class
+        
     def has_setup_class(self, setup_class):
         return self.__setup_class == setup_class
         
@@ -58,30 +61,49 @@ class SetupAttribute:
         if self.__value != None:
             return
             
-        connected_setup_attributes = []
-        setup_input_scalars_per_attribute = []
+        connected_setup_attributes = self.get_connected_setup_attributes()
         
         # First calculate any dependent connected setup attributes
-        for connected_setup_attribute, input_setup_scalars in self.get_connected_setup_attributes().items():
-            connected_setup_attributes.append(connected_setup_attribute)
-            setup_input_scalars_per_attribute.append(input_setup_scalars)
-            
+        for connected_setup_attribute in connected_setup_attributes:
             connected_setup_attribute.calculate_value()
             
         # Then calculate the value of this setup attribute considering all dependent connected setup attributes
+        self.__value = self.combine_connected_values(connected_setup_attributes, lambda connected_setup_attribute: connected_setup_attribute.get_current_value())
+        
+    def combine_connected_values(self, connected_setup_attributes, get_input_value):
+        """
+        Returns the value of this setup attribute calculated from the values of connected setup attributes, without storing it
+        
+        connected_setup_attributes: Dictionary with connected setup attributes as keys and their input scalars as values
+        get_input_value: Function returning the value that should be used for a connected setup attribute
+        """
         input_configuration_attributes = list(self.__configuration_attribute.get_input_configuration_attributes().keys())
         value_type = self.__configuration_attribute.get_value_type()
         calculation_type = self.__configuration_attribute.get_calculation_type()
         
-        if value_type.correctly_connected(calculation_type, input_configuration_attributes):
-            self.__value = combine_values(value_type, \
-                                          calculation_type, \
-                                          connected_setup_attributes, \
-                                          setup_input_scalars_per_attribute, \
-                                          self.__configuration_attribute, \
-                                          settings.get_num_samples())
-        else:
-            self.__value = ("CONFIGURATION ERROR",)
+        if not value_type.correctly_connected(calculation_type, input_configuration_attributes):
+            return ("CONFIGURATION ERROR",)
+            
+        return combine_values(value_type, \
+                              calculation_type, \
+                              [connected_setup_attribute.get_value_type() for connected_setup_attribute in connected_setup_attributes], \
+                              [get_input_value(connected_setup_attribute) for connected_setup_attribute in connected_setup_attributes], \
+                              list(connected_setup_attributes.values()), \
+                              self.__configuration_attribute.get_input_scalar(), \
+                              self.__configuration_attribute.get_input_offset(), \
+                              settings.get_num_samples())
+                              
+    def is_calculated(self):
+        """
+        Returns whether the value is calculated from connected setup attributes rather than entered manually
+        """
+        if self.is_hidden():
+            return True
+            
+        return self.has_connected_setup_attributes() and self.__configuration_attribute.get_calculation_type() != CalculationTypeQualitative
+        
+    def get_configuration_attribute(self):
+        return self.__configuration_attribute
             
     def get_value_type(self):
         return self.__configuration_attribute.get_value_type()
@@ -18,6 +18,9 @@ class SetupClass:
     def set_instance_name(self, instance_name):
         self.__instance_name = instance_name
         
+    def get_configuration_class(self):
+        return self.__configuration_class
+        
     def get_configuration_name(self):
         return self.__configuration_class.get_name()
         
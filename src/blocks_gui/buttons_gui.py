@@ -1,7 +1,6 @@
-import os
-import importlib.util
 from general_gui import GUIModelingBlock
 from script_interface import ScriptInterface
+from script_runner import ScriptRunner
 from helper_functions_general import convert_grid_coordinate_to_actual
 from default_coordinate_functions import get_save_coordinate, get_settings_coordinate, get_change_configuration_view_start_coordinate, get_change_setup_view_start_coordinate, get_create_class_coordinate, get_create_input_coordinate, get_to_setup_start_coordinate, get_create_connection_coordinate, get_calculate_values_coordinate, get_create_attribute_offset, get_create_configuration_view_offset, get_create_setup_view_offset, get_run_script_start_coordinate
 from config import *
@@ -173,25 +172,25 @@ class TouchButton(Button):
         Button for calculating the values of all setup attributes
         """
         x, y = get_calculate_values_coordinate(LENGTH_UNIT) # Uses LENGTH_UNIT as zoom is ignored
-        command = lambda: model.calculate_values()
+        command = lambda: model.calculate_current_values()
         return TouchButton(model, view, "Calculate", x, y, CALCULATE_VALUES_WIDTH, CALCULATE_VALUES_HEIGHT, CALCULATE_VALUES_COLOR, command, ignore_zoom=True)
         
     @staticmethod
-    def run_script(model, view, script_path, script_name, num_script_buttons):
+    def run_script(model, view, script_name, num_script_buttons):
         """
         Button for running the corrosponding script
         """
-        # Import the module of the script
-        spec = importlib.util.spec_from_file_location(script_name, os.path.join(script_path, f"{script_name}.py"))
-        script_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(script_module)
-        
         x, y = get_run_script_start_coordinate(LENGTH_UNIT) # Uses LENGTH_UNIT as zoom is ignored
         y -= num_script_buttons * RUN_SCRIPT_HEIGHT
         
-        script_interface = ScriptInterface(model)
-        command = lambda: script_module.script_control(script_interface)
-        return TouchButton(model, view, script_name, x, y, RUN_SCRIPT_WIDTH, RUN_SCRIPT_HEIGHT, RUN_SCRIPT_COLOR, command, ignore_zoom=True)
+        script_runner = ScriptRunner(model, ScriptInterface(model), script_name)
+        command = lambda: script_runner.press()
+        
+        # Pressing the button while the script is running cancels the script
+        button = TouchButton(model, view, script_name, x, y, RUN_SCRIPT_WIDTH, RUN_SCRIPT_HEIGHT, RUN_SCRIPT_COLOR, command, ignore_zoom=True)
+        script_runner.set_button(button)
+        
+        return button
         
     @staticmethod
     def clear_script(model, view):
@@ -12,6 +12,7 @@ class GUICircleIndicator:
         self.__radius = radius
         self.__color = color
         self.__outline_width = outline_width
+        self.__text = text
         self.__circle = None
         self.__label = None
         
@@ -47,6 +48,12 @@ class GUICircleIndicator:
     def get_x(self):
         return self.__x
         
+    def get_text(self):
+        return self.__text
+        
+    def get_color(self):
+        return self.__color
+        
     def create(self, text):
         """
         Draws the indicator on the canvas
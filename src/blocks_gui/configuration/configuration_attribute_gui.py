@@ -120,6 +120,7 @@ class GUIConfigurationAttribute(GUIModelingBlock):
         """
         Sets whether the corresponding setup version of this attribute should be hidden from setup views
         """
+        self.get_model().restore_deferred_setup_views()
         self.__configuration_attribute.set_hidden(is_hidden)
         
         if is_hidden:
@@ -160,6 +161,7 @@ class GUIConfigurationAttribute(GUIModelingBlock):
         """
         self.__configuration_attribute.set_name(name)
         self.update_text()
+        self.get_model().increment_version()
         
     def get_value_type(self):
         return self.__configuration_attribute.get_value_type()
@@ -269,7 +271,7 @@ class GUIConfigurationAttribute(GUIModelingBlock):
             delete_all(self.__setup_attributes_gui)
             
     def save_state(self):
-        return {"configuration_attribute_gui": str(self), \
+        return {"configuration_attribute_gui": self.get_save_id(), \
                 "name": self.get_name(), \
                 "value_type": self.__configuration_attribute.get_value_type(), \
                 "input_scalar": self.get_input_scalar(), \
@@ -67,6 +67,7 @@ class GUIConfigurationClass(GUIClass):
             
         # Create new
         else:
+            self.get_model().restore_deferred_setup_views() # Saved setup views are restored with the current attributes
             configuration_attribute_gui = GUIConfigurationAttribute.new(self.get_model(), self.get_view(), self)
             
             # Update any existing linked GUI configuration classes
@@ -85,6 +86,8 @@ class GUIConfigurationClass(GUIClass):
         self.__add_attribute_button.move_block(0, ATTRIBUTE_HEIGHT)
         
     def remove_attribute(self, configuration_attribute_gui_to_remove):
+        self.get_model().restore_deferred_setup_views()
+        
         index_first_move_up = self.__configuration_attributes_gui.index(configuration_attribute_gui_to_remove)
         self.__configuration_class.remove_attribute(configuration_attribute_gui_to_remove.get_configuration_attribute())
         self.__configuration_attributes_gui.remove(configuration_attribute_gui_to_remove)
@@ -120,6 +123,8 @@ class GUIConfigurationClass(GUIClass):
         if move_to_index >= len(configuration_attributes_gui) or move_to_index < 0:
             return
             
+        self.get_model().restore_deferred_setup_views()
+        
         # Swap GUI positions of blocks
         configuration_attributes_gui[move_from_index].move_block(0, -steps_to_move_up)
         configuration_attributes_gui[move_to_index].move_block(0, steps_to_move_up)
@@ -135,6 +140,8 @@ class GUIConfigurationClass(GUIClass):
             
             setup_class_gui.update_setup_attribute_gui_order()
             
+        self.get_model().increment_version()
+            
     def get_setup_classes_gui(self):
         return self.__setup_classes_gui
             
@@ -163,6 +170,7 @@ class GUIConfigurationClass(GUIClass):
         """
         self.__configuration_class.set_name(name)
         self.set_text(name)
+        self.get_model().increment_version()
         
         # Update linked GUI configuration classes
         for linked_configuration_class_gui in self.get_model().get_linked_configuration_classes_gui(self):
@@ -186,6 +194,7 @@ class GUIConfigurationClass(GUIClass):
             setup_class_gui.update_value_input_types(specific_attribute_index=specific_attribute_index, update_linked=False)
             
     def delete(self):
+        self.get_model().restore_deferred_setup_views()
         super().delete()
         
         # Remove button for creating setup version and delete all setup class version if there are no currently linked copies of this configuration class
@@ -197,7 +206,7 @@ class GUIConfigurationClass(GUIClass):
         self.get_view().remove_configuration_class_gui(self)
         
     def save_state(self):
-        saved_states = super().save_state() | {"name": self.get_name(), "configuration_class_gui": str(self), "configuration_attributes_gui": []}
+        saved_states = super().save_state() | {"name": self.get_name(), "configuration_class_gui": self.get_save_id(), "configuration_attributes_gui": []}
         
         for configuration_attribute_gui in self.__configuration_attributes_gui:
             saved_states["configuration_attributes_gui"].append(configuration_attribute_gui.save_state())
@@ -171,11 +171,18 @@ class GUIConnectionTriangle(GUIBlock):
     def open_options(self):
         self.__connection.open_options()
             
-    def put_down_block(self):
+    def put_down_block(self, setup_class_gui_to_attach_to=None):
         """
         When releasing the block after dragging it, attempt to attach to an adjacent setup class
+        
+        setup_class_gui_to_attach_to: Only attempt to attach to this GUI setup class, instead of searching all GUI setup classes in the view
         """
-        for setup_class_gui in self.get_view().get_setup_classes_gui():
+        if setup_class_gui_to_attach_to != None:
+            setup_classes_gui = [setup_class_gui_to_attach_to]
+        else:
+            setup_classes_gui = self.get_view().get_setup_classes_gui()
+            
+        for setup_class_gui in setup_classes_gui:
             is_adjacent, direction = setup_class_gui.is_adjacent([(self.get_x(), self.get_y())])
             
             # Attach to class
@@ -296,6 +303,15 @@ class GUIConnectionTriangle(GUIBlock):
             
         super().delete()
         
+    def save_state(self):
+        """
+        Returns the position of the block and the save ID of the GUI setup class it is attached to, None if not attached, so that it can be attached without searching the view when restored
+        """
+        if self.__attached_setup_class_gui == None:
+            return super().save_state() | {"setup_class_gui": None}
+            
+        return super().save_state() | {"setup_class_gui": self.__attached_setup_class_gui.get_save_id()}
+        
 class GUIConnectionScalarsIndicator(GUIModelingBlock):
     """
     Manages indicator that shows the input scalars for a directional connection in setup views
@@ -451,7 +451,7 @@ class GUIConnection:
             self.remove_lines()
             
     def save_state(self):
-        saved_states = {"start_block": str(self.__start_block), \
+        saved_states = {"start_block": self.__start_block.get_save_id(), \
                         "start_direction": self.__start_direction, \
                         "end_direction": self.__end_direction, \
                         "corner_coordinates": [], \
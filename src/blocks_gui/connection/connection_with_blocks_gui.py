@@ -8,7 +8,7 @@ class GUIConnectionWithBlocks(GUIConnection):
     """
     Manages directional connection with already attached triangle blocks found in setup views
     """
-    def __init__(self, model, view, *, start_coordinate=None, end_coordinate=None, input_scalars=None, input_scalars_indicator_coordinate=None):
+    def __init__(self, model, view, *, start_coordinate=None, end_coordinate=None, input_scalars=None, input_scalars_indicator_coordinate=None, start_setup_class_gui=None, end_setup_class_gui=None):
         self.__model = model
         self.__view = view
         self.__input_scalars = (1,)
@@ -23,13 +23,13 @@ class GUIConnectionWithBlocks(GUIConnection):
         if start_coordinate != None:
             start_block.move_block(start_coordinate[0] - start_block.get_x(), \
                                    start_coordinate[1] - start_block.get_y())
-            start_block.put_down_block()
+            start_block.put_down_block(start_setup_class_gui)
             
         # Move end block to specified coordinate
         if end_coordinate != None:
             end_block.move_block(end_coordinate[0] - end_block.get_x(), \
                                  end_coordinate[1] - end_block.get_y())
-            end_block.put_down_block()
+            end_block.put_down_block(end_setup_class_gui)
             
         if input_scalars != None:
             self.set_input_scalars(input_scalars)
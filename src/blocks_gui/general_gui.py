@@ -1,3 +1,4 @@
+import uuid
 import tkinter as tk
 import tkinter.font as tkfont
 import numpy as np
@@ -414,6 +415,7 @@ class GUIModelingBlock(GUIBlock):
             self.__text_width = width
             
         self.set_text(text) # Ensure line break
+        self.__save_id = None # Refers to the block in saves, see get_save_id
         
     def is_adjacent(self, coordinates):
         """
@@ -434,6 +436,18 @@ class GUIModelingBlock(GUIBlock):
                     
         return False, ""
         
+    def get_save_id(self):
+        """
+        Returns the ID that refers to the block in saves, which stays the same across saves so that saved files referring to each other stay consistent when only some are rewritten
+        """
+        if self.__save_id == None:
+            self.__save_id = uuid.uuid4().hex
+            
+        return self.__save_id
+        
+    def set_save_id(self, save_id):
+        self.__save_id = save_id
+        
     def get_text(self):
         """
         Returns the text on the block
@@ -41,6 +41,7 @@ class GUISetupAttribute(GUIModelingBlock):
                          bind_left=MOUSE_PRESS)
         
         self.__entry_value = None # Manual entry field
+        self.__shown_label_value = ("-", TEXT_COLOR, view.get_length_unit()) # Text, color and length unit last shown in the label, used to skip updates that would not change it
         
         configuration_attribute_gui.add_setup_attribute_gui(self)
         self.update_text()
@@ -131,6 +132,12 @@ class GUISetupAttribute(GUIModelingBlock):
         for linked_setup_attribute_gui in self.get_model().get_linked_setup_attributes_gui(self):
         	linked_setup_attribute_gui.set_displayed_value(self.__entry_value.get_entry_text())
         	
+    def get_shown_label_value(self):
+        """
+        Returns the text last shown in the label of the value, which is hidden while there is a manual entry field
+        """
+        return self.__shown_label_value[0]
+        
     def has_manually_entered_value(self):
         return self.__entry_value != None
         
@@ -146,6 +153,21 @@ class GUISetupAttribute(GUIModelingBlock):
         """
         self.__setup_attribute.set_value(convert_string_to_value(self.__entry_value.get_entry_text()))
         
+    def get_entered_value(self):
+        """
+        Returns the value of the text in the manual entry field, which is used as the value of the setup attribute when calculating, or None if there is no entry field
+        """
+        if self.__entry_value == None:
+            return None
+            
+        return convert_string_to_value(self.__entry_value.get_entry_text())
+        
+    def has_changed_entered_value(self):
+        """
+        Returns whether the text in the manual entry field differs from the value of the setup attribute, meaning that it has not been calculated since it was entered
+        """
+        return self.__entry_value != None and self.get_entered_value() != self.__setup_attribute.get_value()
+        
     def set_displayed_value(self, text, color=None):
         """
         Sets the value that is displayed either as the resulting calculated value or that in an entry field
@@ -156,8 +178,13 @@ class GUISetupAttribute(GUIModelingBlock):
         if text == None:
             text = "ERROR"
             
-        # Set value in Label
+        # Set value in Label, unless it already shows the same value
         if self.__entry_value == None:
+            if self.__shown_label_value == (text, color, self.get_length_unit()):
+                return
+                
+            self.__shown_label_value = (text, color, self.get_length_unit())
+            
             text, font = get_text_that_fits(self.get_canvas(), self.__label_value, text, self.get_text_width(), False, self.get_length_unit())
             self.get_view().get_canvas().itemconfig(self.__label_value, text=text, font=font, fill=color)
             
@@ -168,7 +195,12 @@ class GUISetupAttribute(GUIModelingBlock):
     def display_calculated_value(self):
         """
         Updates the currently shown value to match the calculated value, where an override value is shown if it exists
+        The value is shown later if showing values is currently deferred, except in entry fields as their text is used as the value when calculating
         """
+        if self.get_model().is_display_deferred() and (self.__entry_value == None or self.__setup_attribute.has_override_value()):
+            self.get_model().defer_display_of_setup_attribute_gui(self)
+            return
+            
         if self.__setup_attribute.has_override_value():
             self.switch_to_value_label(False)
             self.set_displayed_value(convert_value_to_string(self.__setup_attribute.get_override_value()), "red")
@@ -109,6 +109,7 @@ class GUISetupClass(GUIClass):
         
         self.__setup_attributes_gui.append(setup_attribute_gui)
         self.add_attached_block(setup_attribute_gui)
+        self.get_model().increment_version()
         
         return setup_attribute_gui
         
@@ -163,6 +164,7 @@ class GUISetupClass(GUIClass):
         index_first_move_up = self.__setup_attributes_gui.index(setup_attribute_gui_to_remove)
         self.__setup_attributes_gui.remove(setup_attribute_gui_to_remove)
         self.remove_attached_block(setup_attribute_gui_to_remove)
+        self.get_model().increment_version()
         
         # Move up all GUI setup attributes after the removed one
         for setup_attribute_gui in self.__setup_attributes_gui[index_first_move_up:]:
@@ -192,8 +194,12 @@ class GUISetupClass(GUIClass):
         
     def create_script_marker_indicator(self, text, color, update_linked=True):
         """
-        Indicator that is added by scripts to mark classes
+        Indicator that is added by scripts to mark classes, which is created later if showing values is currently deferred
         """
+        if self.get_model().is_display_deferred():
+            self.get_model().defer_script_marker(self, text, color, update_linked)
+            return
+            
         self.__script_marker_indicators.append(GUICircleIndicator(self.get_view(), \
                                                                   self.get_x()+2*SCRIPT_MARKER_CIRCLE_RADIUS*(0.5+len(self.__script_marker_indicators)), \
                                                                   self.get_y()-SCRIPT_MARKER_CIRCLE_RADIUS, \
@@ -206,6 +212,9 @@ class GUISetupClass(GUIClass):
             for linked_setup_class_gui in self.get_model().get_linked_setup_classes_gui(self):
                 linked_setup_class_gui.create_script_marker_indicator(text, color, False)
                 
+    def get_script_marker_indicators(self):
+        return self.__script_marker_indicators
+                
     def reset_changes_by_scripts(self):
         """
         Remove any changes or additions made by scripts
@@ -219,6 +228,7 @@ class GUISetupClass(GUIClass):
             script_marker_indicator.remove()
             
         self.__script_marker_indicators = []
+        self.get_model().discard_deferred_script_markers(self)
         
     def update_value_input_types(self, *, specific_attribute_index=None, update_linked=True):
         """
@@ -245,6 +255,18 @@ class GUISetupClass(GUIClass):
         for setup_attribute_gui in self.__setup_attributes_gui:
             setup_attribute_gui.display_calculated_value()
             
+    def display_values(self):
+        """
+        Shows the current values of all setup attributes of this setup class without calculating them
+        """
+        for setup_attribute_gui in self.__setup_attributes_gui:
+            setup_attribute = setup_attribute_gui.get_setup_attribute()
+            
+            if setup_attribute.has_override_value() or setup_attribute.is_calculated():
+                setup_attribute_gui.display_calculated_value()
+            else:
+                setup_attribute_gui.update_value_input_type(False) # Restores the entry field if it was replaced when showing an override value
+            
     def reset_calculated_values(self):
         """
         Resets the calculated value of all setup attributes so that the program knows which ones should be recalculated later
@@ -276,6 +298,7 @@ class GUISetupClass(GUIClass):
         """
         self.__setup_class.set_instance_name(name)
         self.update_text()
+        self.get_model().increment_version()
         
     def update_text(self, update_linked=True):
         """
@@ -294,7 +317,7 @@ class GUISetupClass(GUIClass):
         self.get_view().remove_setup_class_gui(self)
         
     def save_state(self):
-        saved_states = super().save_state() | {"name": self.get_name(), "configuration_class_gui": str(self.__configuration_class_gui), "setup_attributes_gui": []}
+        saved_states = super().save_state() | {"name": self.get_name(), "setup_class_gui": self.get_save_id(), "configuration_class_gui": self.__configuration_class_gui.get_save_id(), "setup_attributes_gui": []}
         
         for setup_attribute_gui in self.__setup_attributes_gui:
             saved_states["setup_attributes_gui"].append(setup_attribute_gui.save_state())
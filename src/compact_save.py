@@ -0,0 +1,229 @@
+import numpy as np
+from configuration_class_calculation import ConfigurationClass
+from calculation_model import CalculationModel
+from helper_functions_general import open_atomically
+from config import *
+
+COMPACT_SAVE_FORMAT_VERSION = 1 # Incremented whenever the arrays in the compact save change
+
+def save_compact(model, file_path):
+    """
+    Saves the model as columnar arrays in a compressed NumPy file, where the calculation model is stored separately from the layout of the views
+    Classes and attributes are referred to by integer IDs given by their order in the arrays, and connections are stored as explicit edges between IDs
+    Linked copies of a class share the same ID, being placed in several views
+    """
+    configuration_class_ids = {} # Key: Configuration class, Value: ID
+    configuration_attribute_ids = {} # Key: Configuration attribute, Value: ID
+    setup_class_ids = {} # Key: Setup class, Value: ID
+    
+    def add_configuration_class(configuration_class):
+        if not configuration_class in configuration_class_ids:
+            configuration_class_ids[configuration_class] = len(configuration_class_ids)
+            
+            for configuration_attribute in configuration_class.get_configuration_attributes():
+                configuration_attribute_ids[configuration_attribute] = len(configuration_attribute_ids)
+                
+    for configuration_view in model.get_configuration_views():
+        for configuration_class_gui in configuration_view.get_configuration_classes_gui():
+            add_configuration_class(configuration_class_gui.get_configuration_class())
+            
+    for setup_view in model.get_setup_views():
+        for setup_class_gui in setup_view.get_setup_classes_gui():
+            setup_class = setup_class_gui.get_setup_class()
+            add_configuration_class(setup_class.get_configuration_class())
+            setup_class_ids.setdefault(setup_class, len(setup_class_ids))
+            
+    arrays = {"version": np.array(COMPACT_SAVE_FORMAT_VERSION)}
+    
+    # Configuration classes and attributes
+    arrays["configuration_class_names"] = np.array([configuration_class.get_name() for configuration_class in configuration_class_ids], dtype=str)
+    arrays["configuration_attribute_class_ids"] = np.array([configuration_class_ids[configuration_attribute.get_configuration_class()] for configuration_attribute in configuration_attribute_ids], dtype=np.int64)
+    arrays["configuration_attribute_names"] = np.array([configuration_attribute.get_name() for configuration_attribute in configuration_attribute_ids], dtype=str)
+    arrays["configuration_attribute_value_types"] = np.array([configuration_attribute.get_value_type().__name__ for configuration_attribute in configuration_attribute_ids], dtype=str)
+    arrays["configuration_attribute_calculation_types"] = np.array(["" if configuration_attribute.get_calculation_type() == None else configuration_attribute.get_calculation_type().__name__ for configuration_attribute in configuration_attribute_ids], dtype=str)
+    arrays["configuration_attribute_input_scalars"] = np.array([configuration_attribute.get_input_scalar() for configuration_attribute in configuration_attribute_ids], dtype=np.float64)
+    arrays["configuration_attribute_input_offsets"] = np.array([configuration_attribute.get_input_offset() for configuration_attribute in configuration_attribute_ids], dtype=np.float64)
+    arrays["configuration_attribute_hidden"] = np.array([configuration_attribute.is_hidden() for configuration_attribute in configuration_attribute_ids], dtype=bool)
+    
+    # Edges (configuration attribute ID, input configuration attribute ID)
+    configuration_edges = []
+    configuration_edges_internal = []
+    
+    for configuration_attribute, configuration_attribute_id in configuration_attribute_ids.items():
+        for input_configuration_attribute, is_internal in configuration_attribute.get_input_configuration_attributes().items():
+            if input_configuration_attribute in configuration_attribute_ids:
+                configuration_edges.append((configuration_attribute_id, configuration_attribute_ids[input_configuration_attribute]))
+                configuration_edges_internal.append(is_internal)
+                
+    arrays["configuration_edges"] = np.array(configuration_edges, dtype=np.int64).reshape(-1, 2)
+    arrays["configuration_edges_internal"] = np.array(configuration_edges_internal, dtype=bool)
+    
+    # Setup classes
+    arrays["setup_class_configuration_class_ids"] = np.array([configuration_class_ids[setup_class.get_configuration_class()] for setup_class in setup_class_ids], dtype=np.int64)
+    arrays["setup_class_names"] = np.array([setup_class.get_instance_name() for setup_class in setup_class_ids], dtype=str)
+    
+    # Edges (setup class ID, input setup class ID), where the input scalars of edge i are setup_edge_scalars[setup_edge_scalar_starts[i]:setup_edge_scalar_starts[i+1]]
+    setup_edges = []
+    setup_edge_scalars = []
+    setup_edge_scalar_starts = [0]
+    
+    for setup_class, setup_class_id in setup_class_ids.items():
+        for input_setup_class, input_scalars in setup_class.get_input_setup_classes().items():
+            if input_setup_class in setup_class_ids:
+                setup_edges.append((setup_class_id, setup_class_ids[input_setup_class]))
+                setup_edge_scalars.extend(input_scalars)
+                setup_edge_scalar_starts.append(len(setup_edge_scalars))
+                
+    arrays["setup_edges"] = np.array(setup_edges, dtype=np.int64).reshape(-1, 2)
+    arrays["setup_edge_scalars"] = np.array(setup_edge_scalars, dtype=np.float64)
+    arrays["setup_edge_scalar_starts"] = np.array(setup_edge_scalar_starts, dtype=np.int64)
+    
+    # Entered values (setup class ID, attribute index), where the components of value i are at value_component_starts[i]:value_component_starts[i+1]
+    # Calculated values are left out as they follow from the rest
+    value_ids = []
+    value_component_starts = [0]
+    value_component_numbers = []
+    value_component_texts = []
+    value_component_is_text = []
+    
+    for setup_class, setup_class_id in setup_class_ids.items():
+        for i, setup_attribute in enumerate(setup_class.get_setup_attributes()):
+            if setup_attribute.get_value() != None and not setup_attribute.is_calculated():
+                value_ids.append((setup_class_id, i))
+                
+                for component in setup_attribute.get_value():
+                    is_text = isinstance(component, str)
+                    value_component_numbers.append(np.nan if is_text else component)
+                    value_component_texts.append(component if is_text else "")
+                    value_component_is_text.append(is_text)
+                    
+                value_component_starts.append(len(value_component_numbers))
+                
+    arrays["value_ids"] = np.array(value_ids, dtype=np.int64).reshape(-1, 2)
+    arrays["value_component_starts"] = np.array(value_component_starts, dtype=np.int64)
+    arrays["value_component_numbers"] = np.array(value_component_numbers, dtype=np.float64)
+    arrays["value_component_texts"] = np.array(value_component_texts, dtype=str)
+    arrays["value_component_is_text"] = np.array(value_component_is_text, dtype=bool)
+    
+    # Layout, where each block is a class ID placed in a view
+    views = model.get_configuration_views() + model.get_setup_views()
+    arrays["view_names"] = np.array([view.get_name() for view in views], dtype=str)
+    arrays["view_is_configuration"] = np.array([view in model.get_configuration_views() for view in views], dtype=bool)
+    arrays["view_is_excluded"] = np.array([view in model.get_setup_views() and view.is_excluded() for view in views], dtype=bool)
+    arrays["view_grid_offsets"] = np.array([view.get_grid_offset() for view in views], dtype=np.float64).reshape(-1, 2)
+    
+    blocks = [] # Tuples (view ID, class ID, x, y)
+    
+    for view_id, view in enumerate(views):
+        if view in model.get_configuration_views():
+            for configuration_class_gui in view.get_configuration_classes_gui():
+                blocks.append((view_id, configuration_class_ids[configuration_class_gui.get_configuration_class()], configuration_class_gui.get_x(), configuration_class_gui.get_y()))
+        else:
+            for setup_class_gui in view.get_setup_classes_gui():
+                blocks.append((view_id, setup_class_ids[setup_class_gui.get_setup_class()], setup_class_gui.get_x(), setup_class_gui.get_y()))
+                
+    arrays["block_ids"] = np.array([block[:2] for block in blocks], dtype=np.int64).reshape(-1, 2)
+    arrays["block_positions"] = np.array([block[2:] for block in blocks], dtype=np.float64).reshape(-1, 2)
+    
+    with open_atomically(file_path, "wb") as file_save:
+        np.savez_compressed(file_save, **arrays)
+        
+class CompactSave:
+    """
+    Save written by save_compact, from which the calculation model is created without any GUI and the layout is read separately
+    """
+    def __init__(self, file_path):
+        with np.load(file_path, allow_pickle=False) as file_save:
+            self.__arrays = {name: file_save[name] for name in file_save.files}
+            
+        version = int(self.__arrays["version"])
+        
+        if version > COMPACT_SAVE_FORMAT_VERSION:
+            raise ValueError(f"The save {file_path} has format version {version}, while only versions up to {COMPACT_SAVE_FORMAT_VERSION} are supported")
+            
+    def get_view_names(self, *, is_configuration_view=False):
+        return [str(view_name) for view_name, is_configuration in zip(self.__arrays["view_names"], self.__arrays["view_is_configuration"]) if is_configuration == is_configuration_view]
+        
+    def get_view_id(self, view_name, is_configuration_view=False):
+        for view_id, (current_view_name, is_configuration) in enumerate(zip(self.__arrays["view_names"], self.__arrays["view_is_configuration"])):
+            if current_view_name == view_name and is_configuration == is_configuration_view:
+                return view_id
+                
+        raise KeyError(view_name)
+        
+    def is_excluded(self, view_name):
+        return bool(self.__arrays["view_is_excluded"][self.get_view_id(view_name)])
+        
+    def get_grid_offset(self, view_name, is_configuration_view=False):
+        return tuple(self.__arrays["view_grid_offsets"][self.get_view_id(view_name, is_configuration_view)].tolist())
+        
+    def get_layout(self, view_name, is_configuration_view=False):
+        """
+        Returns a tuple (class IDs, positions) of the blocks in the specified view, where the IDs refer to configuration classes in configuration views and setup classes in setup views
+        """
+        is_in_view = self.__arrays["block_ids"][:, 0] == self.get_view_id(view_name, is_configuration_view)
+        return self.__arrays["block_ids"][is_in_view, 1], self.__arrays["block_positions"][is_in_view]
+        
+    def create_calculation_model(self):
+        """
+        Returns a calculation model with the setup classes of all setup views that are not excluded, created in one pass over the arrays
+        """
+        arrays = self.__arrays
+        value_types = {value_type.__name__: value_type for value_type in VALUE_TYPES}
+        calculation_types = {calculation_type.__name__: calculation_type for calculation_type in CALCULATION_TYPES}
+        
+        configuration_classes = [ConfigurationClass(str(name)) for name in arrays["configuration_class_names"]]
+        configuration_attributes = []
+        
+        for configuration_class_id, name, value_type, calculation_type, input_scalar, input_offset, is_hidden in zip(arrays["configuration_attribute_class_ids"].tolist(), \
+                                                                                                                    arrays["configuration_attribute_names"], \
+                                                                                                                    arrays["configuration_attribute_value_types"], \
+                                                                                                                    arrays["configuration_attribute_calculation_types"], \
+                                                                                                                    arrays["configuration_attribute_input_scalars"].tolist(), \
+                                                                                                                    arrays["configuration_attribute_input_offsets"].tolist(), \
+                                                                                                                    arrays["configuration_attribute_hidden"].tolist()):
+            configuration_attribute = configuration_classes[configuration_class_id].create_attribute(str(name))
+            configuration_attribute.set_value_type(value_types[str(value_type)])
+            configuration_attribute.set_calculation_type(calculation_types.get(str(calculation_type)))
+            configuration_attribute.set_input_scalar(input_scalar)
+            configuration_attribute.set_input_offset(input_offset)
+            configuration_attribute.set_hidden(is_hidden)
+            configuration_attributes.append(configuration_attribute)
+            
+        for (configuration_attribute_id, input_configuration_attribute_id), is_internal in zip(arrays["configuration_edges"].tolist(), arrays["configuration_edges_internal"].tolist()):
+            configuration_attributes[configuration_attribute_id].add_input_configuration_attribute(configuration_attributes[input_configuration_attribute_id], is_internal)
+            
+        setup_classes = []
+        
+        for configuration_class_id, name in zip(arrays["setup_class_configuration_class_ids"].tolist(), arrays["setup_class_names"]):
+            setup_class = configuration_classes[configuration_class_id].create_setup_version()
+            setup_class.set_instance_name(str(name))
+            setup_classes.append(setup_class)
+            
+        setup_edge_scalar_starts = arrays["setup_edge_scalar_starts"].tolist()
+        setup_edge_scalars = arrays["setup_edge_scalars"].tolist()
+        
+        for i, (setup_class_id, input_setup_class_id) in enumerate(arrays["setup_edges"].tolist()):
+            input_scalars = tuple(setup_edge_scalars[setup_edge_scalar_starts[i]:setup_edge_scalar_starts[i+1]])
+            setup_classes[setup_class_id].set_input_setup_class(setup_classes[input_setup_class_id], input_scalars)
+            
+        value_component_starts = arrays["value_component_starts"].tolist()
+        value_component_numbers = arrays["value_component_numbers"].tolist()
+        value_component_texts = arrays["value_component_texts"].tolist()
+        value_component_is_text = arrays["value_component_is_text"].tolist()
+        
+        for i, (setup_class_id, attribute_index) in enumerate(arrays["value_ids"].tolist()):
+            components = range(value_component_starts[i], value_component_starts[i+1])
+            value = tuple(value_component_texts[j] if value_component_is_text[j] else value_component_numbers[j] for j in components)
+            setup_classes[setup_class_id].get_setup_attributes()[attribute_index].set_value(value)
+            
+        calculation_model = CalculationModel()
+        
+        for view_name in self.get_view_names():
+            if not self.is_excluded(view_name):
+                calculation_model.add_setup_view(view_name)
+                
+                for setup_class_id in self.get_layout(view_name)[0].tolist():
+                    calculation_model.add_setup_class(view_name, setup_classes[setup_class_id])
+                    
+        return calculation_model
@@ -1,5 +1,10 @@
+import os
+import time
+import tempfile
+import threading
 import numpy as np
 import tkinter.font as tkfont
+from contextlib import contextmanager
 
 def convert_value_to_string(value):
     """
@@ -267,3 +272,49 @@ def delete_all(to_delete_list, manual_delete=False):
             to_delete_list[i].delete(True)
         else:
             to_delete_list[i].delete()
+
+@contextmanager
+def open_atomically(file_path, mode="w"):
+    """
+    Opens a temporary file in the same directory as the file path, which replaces the file once it has been written so that an interrupted write never leaves the file partially written
+    """
+    file_descriptor, temporary_file_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)), prefix=".", suffix=".tmp")
+    
+    try:
+        with os.fdopen(file_descriptor, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+            
+        os.replace(temporary_file_path, file_path)
+        
+    except BaseException:
+        if os.path.exists(temporary_file_path):
+            os.remove(temporary_file_path)
+            
+        raise
+        
+active_time_recorders = [] # Objects with a record(name, elapsed_time) method, such as profilers of running scripts, which measure() reports to
+active_time_recorders_lock = threading.Lock()
+
+@contextmanager
+def measure(name):
+    """
+    Records the time spent within the block in all active time recorders, doing nothing if there are none
+    """
+    if len(active_time_recorders) == 0:
+        yield
+        return
+        
+    start_time = time.perf_counter()
+    
+    try:
+        yield
+    finally:
+        elapsed_time = time.perf_counter() - start_time
+        
+        with active_time_recorders_lock:
+            time_recorders = list(active_time_recorders)
+            
+        for time_recorder in time_recorders:
+            time_recorder.record(name, elapsed_time)
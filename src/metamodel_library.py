@@ -0,0 +1,261 @@
+import os
+import pickle
+import hashlib
+from helper_functions_general import open_atomically
+from config import *
+
+METAMODEL_ID_SEPARATOR = "@" # Separates the name and the version in the ID of a metamodel, such as YACRAF 1@2
+
+def get_metamodel_id(name, version):
+    return f"{name}{METAMODEL_ID_SEPARATOR}{version}"
+    
+def split_metamodel_id(metamodel_id):
+    """
+    Returns a tuple (name, version) of the ID of a metamodel
+    """
+    name, version = metamodel_id.rsplit(METAMODEL_ID_SEPARATOR, 1)
+    return name, int(version)
+    
+def get_reference_path(metamodel_id):
+    """
+    Returns the path that saves list instead of the path to a configuration view of their own (see Model.save) to refer to a metamodel in the library
+    """
+    return os.path.join(METAMODEL_LIBRARY_DIRECTORY, f"{metamodel_id}.pickle")
+    
+def is_reference_path(file_path):
+    return os.path.basename(os.path.dirname(file_path)) == METAMODEL_LIBRARY_DIRECTORY
+    
+def get_metamodel_id_from_path(file_path):
+    return os.path.splitext(os.path.basename(file_path))[0]
+    
+def get_signature(saved_states):
+    """
+    Returns the saved states of a configuration view without the grid offset, where save IDs are replaced by their order in the view so that copies of the same metamodel created separately are equal
+    Also returns a list of the save IDs in that order
+    """
+    grid_offset, saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui = saved_states
+    save_ids = []
+    
+    for saved_states_configuration_class_gui in saved_states_configuration_classes_gui:
+        save_ids.append(saved_states_configuration_class_gui["configuration_class_gui"])
+        save_ids.extend(saved_states_configuration_attribute_gui["configuration_attribute_gui"] for saved_states_configuration_attribute_gui in saved_states_configuration_class_gui["configuration_attributes_gui"])
+        
+    indices = {save_id: i for i, save_id in enumerate(save_ids)}
+    
+    signature_configuration_classes_gui = [saved_states_configuration_class_gui | {"configuration_class_gui": indices[saved_states_configuration_class_gui["configuration_class_gui"]], \
+                                                                                   "configuration_attributes_gui": [saved_states_configuration_attribute_gui | {"configuration_attribute_gui": indices[saved_states_configuration_attribute_gui["configuration_attribute_gui"]]} \
+                                                                                                                    for saved_states_configuration_attribute_gui in saved_states_configuration_class_gui["configuration_attributes_gui"]]} \
+                                           for saved_states_configuration_class_gui in saved_states_configuration_classes_gui]
+                                           
+    # Connections from attributes in other views keep their save IDs
+    signature_configuration_inputs_gui = [saved_states_configuration_input_gui | {"connections": [saved_states_connection | {"start_block": indices.get(saved_states_connection["start_block"], saved_states_connection["start_block"])} \
+                                                                                                  for saved_states_connection in saved_states_configuration_input_gui["connections"]]} \
+                                          for saved_states_configuration_input_gui in saved_states_configuration_inputs_gui]
+                                          
+    return (signature_configuration_classes_gui, signature_configuration_inputs_gui), save_ids
+    
+def replace_save_ids(saved_states, mapping_save_id):
+    """
+    Returns the saved states of a configuration view where the save IDs of configuration classes and attributes, including those that connections start from, are replaced according to the mapping
+    """
+    grid_offset, saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui = saved_states
+    
+    saved_states_configuration_classes_gui = [saved_states_configuration_class_gui | {"configuration_class_gui": mapping_save_id.get(saved_states_configuration_class_gui["configuration_class_gui"], saved_states_configuration_class_gui["configuration_class_gui"]), \
+                                                                                      "configuration_attributes_gui": [saved_states_configuration_attribute_gui | {"configuration_attribute_gui": mapping_save_id.get(saved_states_configuration_attribute_gui["configuration_attribute_gui"], saved_states_configuration_attribute_gui["configuration_attribute_gui"])} \
+                                                                                                                       for saved_states_configuration_attribute_gui in saved_states_configuration_class_gui["configuration_attributes_gui"]]} \
+                                              for saved_states_configuration_class_gui in saved_states_configuration_classes_gui]
+                                              
+    saved_states_configuration_inputs_gui = [saved_states_configuration_input_gui | {"connections": [saved_states_connection | {"start_block": mapping_save_id.get(saved_states_connection["start_block"], saved_states_connection["start_block"])} \
+                                                                                                     for saved_states_connection in saved_states_configuration_input_gui["connections"]]} \
+                                             for saved_states_configuration_input_gui in saved_states_configuration_inputs_gui]
+                                             
+    return (grid_offset, saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui)
+    
+class MetamodelLibrary:
+    """
+    Stores metamodels that saves refer to by ID instead of each save having its own copy, as one file per version with the saved states of a configuration view (see ConfigurationView.get_saved_states)
+    A version is never changed once published, so each file is only read once per process and then shared by all models and saves that refer to it
+    """
+    __read_metamodels = {} # Key: Path to file, Value: Tuple (hash of file, saved states), shared by all libraries in the process
+    
+    def __init__(self, directory):
+        self.__directory = directory
+        
+    def get_directory(self):
+        return self.__directory
+        
+    def get_file_path(self, metamodel_id):
+        return os.path.join(self.__directory, f"{metamodel_id}.pickle")
+        
+    def get_metamodel_ids(self, name=None):
+        """
+        Returns the IDs of all metamodels in the library, or of all versions of the metamodel with the specified name, from the oldest to the most recent version
+        """
+        if not os.path.exists(self.__directory):
+            return []
+            
+        metamodel_ids = []
+        
+        for file_name in os.listdir(self.__directory):
+            metamodel_id, extension = os.path.splitext(file_name)
+            
+            if extension != ".pickle" or not METAMODEL_ID_SEPARATOR in metamodel_id:
+                continue
+                
+            if name == None or split_metamodel_id(metamodel_id)[0] == name:
+                metamodel_ids.append(metamodel_id)
+                
+        return sorted(metamodel_ids, key=split_metamodel_id)
+        
+    def get_latest_metamodel_id(self, name):
+        """
+        Returns the ID of the most recent version of the metamodel with the specified name, None if there is none
+        """
+        metamodel_ids = self.get_metamodel_ids(name)
+        
+        if len(metamodel_ids) == 0:
+            return None
+            
+        return metamodel_ids[-1]
+        
+    def read(self, metamodel_id):
+        """
+        Returns a tuple (hash of the file, saved states) of a metamodel, where the file is only read the first time in each process
+        The saved states are shared, so they must not be changed
+        """
+        file_path = os.path.abspath(self.get_file_path(metamodel_id))
+        
+        if not file_path in self.__read_metamodels:
+            with open(file_path, "rb") as file_pickle:
+                data = file_pickle.read()
+                
+            self.__read_metamodels[file_path] = (hashlib.sha256(data).hexdigest(), pickle.loads(data))
+            
+        return self.__read_metamodels[file_path]
+        
+    def publish(self, name, saved_states):
+        """
+        Adds the saved states of a configuration view as a new version of the metamodel with the specified name, unless they are the same as those of an existing version
+        
+        Returns the ID of the version
+        """
+        data = pickle.dumps(saved_states)
+        
+        for metamodel_id in self.get_metamodel_ids(name):
+            if self.read(metamodel_id)[0] == hashlib.sha256(data).hexdigest():
+                return metamodel_id
+                
+        latest_metamodel_id = self.get_latest_metamodel_id(name)
+        
+        if latest_metamodel_id == None:
+            metamodel_id = get_metamodel_id(name, 1)
+        else:
+            metamodel_id = get_metamodel_id(name, split_metamodel_id(latest_metamodel_id)[1] + 1)
+            
+        os.makedirs(self.__directory, exist_ok=True)
+        
+        with open_atomically(self.get_file_path(metamodel_id), "wb") as file_pickle:
+            file_pickle.write(data)
+            
+        return metamodel_id
+        
+    def find(self, name, saved_states):
+        """
+        Returns the ID of the most recent version of the metamodel with the specified name that only differs from the saved states in the grid offset and the save IDs (see get_signature),
+        and a dictionary mapping the save IDs in the saved states to those in the version, None if there is no such version
+        """
+        signature, save_ids = get_signature(saved_states)
+        
+        for metamodel_id in reversed(self.get_metamodel_ids(name)):
+            signature_version, save_ids_version = get_signature(self.read(metamodel_id)[1])
+            
+            if signature_version == signature:
+                return metamodel_id, dict(zip(save_ids, save_ids_version))
+                
+        return None
+        
+def migrate_save(save_path, metamodel_library, *, update_to_latest=False):
+    """
+    Moves the configuration views of a save into the metamodel library, so that the save refers to them instead of having its own copies
+    Configuration views equal to a version already in the library refer to it (see MetamodelLibrary.find), where the setup views of the save are changed to use its save IDs,
+    while other configuration views are published as new versions
+    
+    update_to_latest: Whether to also change references to older versions to the most recent version of each metamodel, if it has all configuration classes used by the setup views
+    
+    Returns the IDs of the metamodels the save refers to
+    """
+    file_paths_saves_path = os.path.join(save_path, os.path.basename(FILE_PATHS_SAVES_PATH))
+    
+    with open(file_paths_saves_path, "r") as file_with_paths:
+        file_paths = [line.strip() for line in file_with_paths if line.strip() != ""]
+        
+    setup_file_paths = [file_path for file_path in file_paths if os.path.basename(os.path.dirname(file_path)) == SETUP_SAVES_DIRECTORY]
+    saved_states_setup_views = {}
+    
+    for file_path in setup_file_paths:
+        with open(os.path.join(save_path, file_path), "rb") as file_pickle:
+            saved_states_setup_views[file_path] = pickle.load(file_pickle)
+            
+    used_configuration_class_save_ids = {saved_states_setup_class_gui["configuration_class_gui"] for grid_offset, is_excluded, saved_states_setup_classes_gui, saved_states_connections_with_blocks in saved_states_setup_views.values() \
+                                         for saved_states_setup_class_gui in saved_states_setup_classes_gui}
+                                         
+    mapping_save_id = {} # Key: Save ID in the save, Value: Save ID in the library
+    migrated_file_paths = {} # Key: Path to configuration view in the save, Value: Reference path
+    
+    # Refer to versions in the library that are equal to the configuration views
+    saved_states_configuration_views = {}
+    
+    for file_path in file_paths:
+        if os.path.basename(os.path.dirname(file_path)) != CONFIGURATION_SAVES_DIRECTORY:
+            continue
+            
+        with open(os.path.join(save_path, file_path), "rb") as file_pickle:
+            saved_states_configuration_views[file_path] = pickle.load(file_pickle)
+            
+        found = metamodel_library.find(os.path.splitext(os.path.basename(file_path))[0], saved_states_configuration_views[file_path])
+        
+        if found != None:
+            metamodel_id, mapping_save_id_version = found
+            mapping_save_id.update(mapping_save_id_version)
+            migrated_file_paths[file_path] = get_reference_path(metamodel_id)
+            
+    # Publish the others, where connections from configuration views that now refer to the library use its save IDs
+    for file_path, saved_states in saved_states_configuration_views.items():
+        if not file_path in migrated_file_paths:
+            metamodel_id = metamodel_library.publish(os.path.splitext(os.path.basename(file_path))[0], replace_save_ids(saved_states, mapping_save_id))
+            migrated_file_paths[file_path] = get_reference_path(metamodel_id)
+            
+    if update_to_latest:
+        for file_path in file_paths:
+            if not is_reference_path(file_path):
+                continue
+                
+            metamodel_id = get_metamodel_id_from_path(file_path)
+            latest_metamodel_id = metamodel_library.get_latest_metamodel_id(split_metamodel_id(metamodel_id)[0])
+            
+            configuration_class_save_ids = {mapping_save_id.get(save_id, save_id) for save_id in used_configuration_class_save_ids}
+            save_ids_version = {saved_states_configuration_class_gui["configuration_class_gui"] for saved_states_configuration_class_gui in metamodel_library.read(metamodel_id)[1][1]}
+            save_ids_latest = {saved_states_configuration_class_gui["configuration_class_gui"] for saved_states_configuration_class_gui in metamodel_library.read(latest_metamodel_id)[1][1]}
+            
+            if (configuration_class_save_ids & save_ids_version) <= save_ids_latest:
+                migrated_file_paths[file_path] = get_reference_path(latest_metamodel_id)
+            else:
+                print(f"Could not update {metamodel_id} to {latest_metamodel_id}, as configuration classes used in {save_path} were removed")
+                
+    # Setup views refer to configuration classes by their save IDs
+    for file_path, (grid_offset, is_excluded, saved_states_setup_classes_gui, saved_states_connections_with_blocks) in saved_states_setup_views.items():
+        if any(saved_states_setup_class_gui["configuration_class_gui"] in mapping_save_id for saved_states_setup_class_gui in saved_states_setup_classes_gui):
+            saved_states_setup_classes_gui = [saved_states_setup_class_gui | {"configuration_class_gui": mapping_save_id.get(saved_states_setup_class_gui["configuration_class_gui"], saved_states_setup_class_gui["configuration_class_gui"])} \
+                                              for saved_states_setup_class_gui in saved_states_setup_classes_gui]
+                                              
+            with open_atomically(os.path.join(save_path, file_path), "wb") as file_pickle:
+                pickle.dump((grid_offset, is_excluded, saved_states_setup_classes_gui, saved_states_connections_with_blocks), file_pickle)
+                
+    with open_atomically(file_paths_saves_path, "w") as file_with_paths:
+        file_with_paths.write("".join(f"{migrated_file_paths.get(file_path, file_path)}\n" for file_path in file_paths))
+        
+    # The copies are only removed once the save refers to the library
+    for file_path in saved_states_configuration_views:
+        os.remove(os.path.join(save_path, file_path))
+        
+    return [get_metamodel_id_from_path(migrated_file_paths.get(file_path, file_path)) for file_path in file_paths if is_reference_path(migrated_file_paths.get(file_path, file_path))]
@@ -1,9 +1,19 @@
 import os
+import hashlib
+import time
+from contextlib import contextmanager
 from configuration_view import ConfigurationView
 from setup_view import SetupView
 from setup_attribute_gui import GUISetupAttribute
 from connection_gui import GUIConnection
-from helper_functions_general import delete_all
+from helper_functions_general import delete_all, open_atomically, measure
+from calculation_graph import CalculationGraph
+from parallel_calculation import calculate_values_in_parallel
+from script_registry import ScriptRegistry
+from script_result_cache import ScriptResultCache, get_model_hashes, get_configuration_hash
+from compact_save import save_compact
+from autosave import Autosaver
+from metamodel_library import MetamodelLibrary, split_metamodel_id
 from config import *
 
 class Model:
@@ -15,11 +25,30 @@ class Model:
         self.__configuration_views = []
         self.__setup_views = []
         self.__current_view = None
+        self.__version = 0 # Incremented whenever views, classes or attributes are added, removed, renamed or reordered, used to know when cached lookups are outdated
         
         self.__currently_pressed_keys = set()
         
         self.__linked_configuration_groups_per_number = {}
         self.__linked_setup_groups_per_number = {}
+        self.__mapping_configuration_class_gui = {} # Maps configuration class IDs from the saves to newly created ones, used when restoring setup views
+        
+        self.__stale_setup_views = set() # Setup views that might show outdated values as only the values of other setup views were calculated
+        self.__calculated_model_hash = None # Hash of the model when all values were last calculated, see has_current_values
+        self.__saved_values_num_samples = None # Number of samples the values in the restored saves were calculated with, None if they can not be used, see has_saved_values
+        self.__saved_values_configuration_hash = None # Hash of the configurations the values in the restored saves were calculated with
+        self.__deferred_values_num_samples = None # Number of samples the values in the saves of setup views that have not been restored yet were calculated with, None if they can not be used, see has_current_deferred_values
+        self.__deferred_values_configuration_hash = None # Hash of the configurations the values in the saves of setup views that have not been restored yet were calculated with
+        
+        self.__script_registry = ScriptRegistry(SCRIPTS_PATH) # Scripts shared by all setup views
+        self.__script_result_cache = ScriptResultCache() # Results of previous runs of scripts
+        self.__autosaver = Autosaver(AUTOSAVES_PATH)
+        self.__metamodel_library = MetamodelLibrary(METAMODELS_PATH) # Metamodels shared by all saves
+        self.__last_autosave_time = time.monotonic()
+        
+        self.__display_deferral_depth = 0 # Number of nested defer_display blocks currently entered
+        self.__deferred_setup_attributes_gui = {} # Setup attributes whose values are shown when the outermost defer_display block exits, dictionary used as an ordered set
+        self.__deferred_script_markers = [] # Tuples (GUI setup class, text, color, update_linked) of markers created when the outermost defer_display block exits
         
         self.__root.title("Canvas")
         self.__root.geometry(f"{settings.get_canvas_width()}x{settings.get_canvas_height()}")
@@ -27,6 +56,7 @@ class Model:
         self.__root.columnconfigure(0, weight=1)
         
         excluded_setup_views = []
+        uses_saved_values = False
         
         # Create new views
         if not os.path.exists(FILE_PATHS_SAVES_PATH) or force_new_save:
@@ -39,8 +69,6 @@ class Model:
         # Restore saved views
         else:
             with open(FILE_PATHS_SAVES_PATH, "r") as file_with_paths:
-                mapping_configuration_class_gui = {} # Used to map configuration class IDs from the saves to newly created ones
-                
                 for line in file_with_paths:
                     file_path = line.strip()
                     view_directory, view_name = os.path.split(file_path)
@@ -48,15 +76,18 @@ class Model:
                     
                     view_directory = os.path.split(view_directory)[1]
                     
-                    # Restore saved configuration view
-                    if view_directory == CONFIGURATION_SAVES_DIRECTORY:
+                    # Restore saved configuration view, or the metamodel in the library that the save refers to
+                    if view_directory in (CONFIGURATION_SAVES_DIRECTORY, METAMODEL_LIBRARY_DIRECTORY):
+                        if view_directory == METAMODEL_LIBRARY_DIRECTORY:
+                            view_name = split_metamodel_id(view_name)[0]
+                            
                         configuration_view = self.create_view(True, view_name)
-                        mapping_configuration_class_gui.update(configuration_view.restore_save(file_path, self.__linked_configuration_groups_per_number))
+                        self.__mapping_configuration_class_gui.update(configuration_view.restore_save(file_path, self.__linked_configuration_groups_per_number))
                         
-                    # Restore saved setup view
+                    # Read saved setup view, where its blocks are created when it is first shown
                     elif view_directory == SETUP_SAVES_DIRECTORY:
                         setup_view = self.create_view(False, view_name)
-                        is_excluded = setup_view.restore_save(file_path, mapping_configuration_class_gui, self.__linked_setup_groups_per_number)
+                        is_excluded = setup_view.load_save(file_path)
                         
                         if is_excluded:
                             excluded_setup_views.append(setup_view)
@@ -64,6 +95,11 @@ class Model:
                 for view in self.__configuration_views + self.__setup_views:
                     view.update_shown_order()
                     
+            # The values in the saves are shown instead of being calculated again if the saves have not changed since they were saved together
+            if os.path.exists(SAVED_VALUES_HASH_PATH):
+                with open(SAVED_VALUES_HASH_PATH, "r") as file_hash:
+                    uses_saved_values = file_hash.read().strip() == self.get_saved_values_hash()
+                    
         # Attempt to find and set a suitable default view
         if len(self.__configuration_views) > 0:
             self.change_view(self.__configuration_views[0])
@@ -74,10 +110,20 @@ class Model:
         for setup_view in excluded_setup_views:
             setup_view.set_excluded(True)
             
+        # Set once the views have been created, as changes to the model discard the saved values
+        if uses_saved_values:
+            self.use_saved_values()
+            self.__deferred_values_num_samples = settings.get_num_samples()
+            self.__deferred_values_configuration_hash = get_configuration_hash(self)
+            
         root.bind("<KeyPress>", self.on_key_press)
         root.bind("<KeyRelease>", self.on_key_release)
         
-        self.calculate_values()
+        # All values are calculated once something changes
+        if not self.has_saved_values():
+            self.calculate_values()
+            
+        self.__root.after(AUTOSAVE_CHECK_INTERVAL, self.check_autosave)
         
     def on_key_press(self, event):
         """
@@ -253,6 +299,10 @@ class Model:
             if linked_group_number == None:
                 linked_group_number = len(linked_groups_per_number)
                 
+                # Numbers can be missing while setup views have not been restored yet
+                while linked_group_number in linked_groups_per_number:
+                    linked_group_number += 1
+                    
             linked_groups_per_number[linked_group_number] = [class_gui_to_copy]
             class_gui_to_copy.set_linked_group_number(linked_group_number)
             
@@ -320,6 +370,7 @@ class Model:
                 view.move_change_view_button(views_to_consider_moving[view_to_swap_with_index], not move_up)
                 
             views_to_consider_moving[view_index], views_to_consider_moving[view_to_swap_with_index] = views_to_consider_moving[view_to_swap_with_index], views_to_consider_moving[view_index]
+            self.increment_version()
             
     def update_add_to_setup_button_order(self):
         for setup_view in self.__setup_views:
@@ -349,6 +400,8 @@ class Model:
         else:
             self.__setup_views.append(new_view)
             
+        self.increment_version()
+            
         # Add button to change to the new view from existing views
         for view in self.__configuration_views + self.__setup_views:
             view.add_change_view_button(new_view, is_configuration_view)
@@ -378,7 +431,12 @@ class Model:
             print("Cannot delete the view, at least one view needs to exist")
             return
             
+        # Create the blocks of the view so that they are removed from linked groups and configuration classes
+        if view_to_delete in self.__setup_views and not view_to_delete.is_restored():
+            self.restore_deferred_setup_view(view_to_delete)
+            
         view_to_delete.delete()
+        self.increment_version()
         
         # Remove button to change to the deleted view from all other views
         for view in self.__configuration_views + self.__setup_views:
@@ -412,6 +470,25 @@ class Model:
             else:
                 self.change_view(self.__configuration_views[0])
                 
+    def get_script_registry(self):
+        return self.__script_registry
+        
+    def get_metamodel_library(self):
+        return self.__metamodel_library
+        
+    def get_script_result_cache(self):
+        return self.__script_result_cache
+        
+    def get_version(self):
+        return self.__version
+        
+    def increment_version(self):
+        """
+        Marks that blocks or views have been added, removed or renamed, where the values in saves that have not been restored yet might no longer be the same as calculated values
+        """
+        self.__version += 1
+        self.discard_saved_values()
+        
     def get_current_view(self):
         return self.__current_view
         
@@ -422,9 +499,117 @@ class Model:
         if view == None:
             return
             
+        if view in self.__setup_views and not view.is_restored():
+            self.restore_deferred_setup_view(view)
+            
         self.__current_view = view
         view.tkraise()
         
+        # Calculate values that were not calculated when only calculating the values of other setup views
+        if view in self.__stale_setup_views:
+            self.calculate_values(scope_view=view)
+            
+    def restore_deferred_setup_view(self, setup_view):
+        """
+        Creates the blocks of a setup view whose save has not been restored yet and calculates their values
+        All other such setup views with linked copies of the same setup classes are restored at the same time, as setup views without linked copies in common do not affect the values of each other
+        """
+        setup_views_to_restore = {setup_view}
+        linked_group_numbers = setup_view.get_deferred_linked_group_numbers()
+        has_found_setup_view = True
+        
+        while has_found_setup_view:
+            has_found_setup_view = False
+            
+            for other_setup_view in self.__setup_views:
+                if not other_setup_view in setup_views_to_restore and not other_setup_view.is_restored() and \
+                   not other_setup_view.get_deferred_linked_group_numbers().isdisjoint(linked_group_numbers):
+                    setup_views_to_restore.add(other_setup_view)
+                    linked_group_numbers.update(other_setup_view.get_deferred_linked_group_numbers())
+                    has_found_setup_view = True
+                    
+        # Linked group numbers from the save might already be used by setup classes created since
+        mapping_linked_group_number = {}
+        
+        for linked_group_number in sorted(linked_group_numbers):
+            new_linked_group_number = linked_group_number
+            
+            while new_linked_group_number in self.__linked_setup_groups_per_number or new_linked_group_number in mapping_linked_group_number.values():
+                new_linked_group_number += 1
+                
+            mapping_linked_group_number[linked_group_number] = new_linked_group_number
+            
+        setup_views_to_restore = [other_setup_view for other_setup_view in self.__setup_views if other_setup_view in setup_views_to_restore]
+        restores_values = self.has_saved_values()
+        
+        for other_setup_view in setup_views_to_restore:
+            other_setup_view.restore_deferred_save(self.__mapping_configuration_class_gui, self.__linked_setup_groups_per_number, mapping_linked_group_number, restores_values)
+            
+        # Nothing has been calculated or changed since the saves were read, as that discards the saved values, and creating the blocks of the saves does not change their values
+        if restores_values:
+            self.use_saved_values()
+            
+            for other_setup_view in setup_views_to_restore:
+                if not other_setup_view.is_excluded():
+                    for setup_class_gui in other_setup_view.get_setup_classes_gui():
+                        setup_class_gui.display_values()
+                        
+            return
+            
+        for other_setup_view in setup_views_to_restore:
+            if not other_setup_view.is_excluded():
+                for setup_class_gui in other_setup_view.get_setup_classes_gui():
+                    setup_class_gui.reset_calculated_values()
+                    
+        for other_setup_view in setup_views_to_restore:
+            if not other_setup_view.is_excluded():
+                for setup_class_gui in other_setup_view.get_setup_classes_gui():
+                    setup_class_gui.calculate_values()
+                    
+    def has_saved_values(self):
+        """
+        Returns whether the values in the saves that were restored are the same as calculated values would be, so that setup views can be restored without calculating their values
+        This is the case if the saves have not changed since they were saved together, nothing has been calculated or changed since they were read and the number of samples and the configurations are the same
+        """
+        return self.__saved_values_num_samples == settings.get_num_samples() and self.__saved_values_configuration_hash == get_configuration_hash(self)
+        
+    def use_saved_values(self):
+        """
+        Marks that the values in the saves that were restored are the same as calculated values would be with the current number of samples and configurations
+        """
+        self.__saved_values_num_samples = settings.get_num_samples()
+        self.__saved_values_configuration_hash = get_configuration_hash(self)
+        
+    def discard_saved_values(self):
+        self.__saved_values_num_samples = None
+        self.__saved_values_configuration_hash = None
+        
+    def has_current_deferred_values(self):
+        """
+        Returns whether the values in the saves of setup views that have not been restored yet are the same as calculated values would be, so that the saves can be written again without restoring them
+        This is the case if the values were current when the saves were read and the number of samples and the configurations are the same, as values entered in restored setup views do not affect setup views without linked copies in common
+        """
+        return self.__deferred_values_num_samples == settings.get_num_samples() and self.__deferred_values_configuration_hash == get_configuration_hash(self)
+        
+    def get_saved_values_hash(self):
+        """
+        Returns a hash of the saves last read or written by all views and the number of samples, where the saves include the values of all setup attributes
+        """
+        saves = [view.get_last_save() for view in self.__configuration_views + self.__setup_views]
+        
+        return hashlib.sha256(repr((settings.get_num_samples(), saves)).encode()).hexdigest()
+        
+    def restore_deferred_setup_views(self):
+        """
+        Creates the blocks of all setup views whose saves have not been restored yet, used before changes that the saves cannot be restored after, such as changing the attributes of configuration classes
+        """
+        for setup_view in self.__setup_views:
+            if not setup_view.is_restored():
+                self.restore_deferred_setup_view(setup_view)
+                
+    def get_restored_setup_views(self):
+        return [setup_view for setup_view in self.__setup_views if setup_view.is_restored()]
+        
     def get_num_configuration_classes(self):
         """
         Returns the total number of configuration classes across all configuration views
@@ -436,27 +621,135 @@ class Model:
             
         return num_configuration_classes
         
-    def reset_script_changes(self):
+    def reset_script_changes(self, *, calculate_values=True):
         """
         Resets any changes or additions made by scripts to all setup views
         """
-        for setup_view in self.__setup_views:
+        for setup_view in self.get_restored_setup_views():
             for setup_class_gui in setup_view.get_setup_classes_gui():
                 setup_class_gui.reset_changes_by_scripts()
                 
-        self.calculate_values()
+        if calculate_values:
+            self.calculate_values()
+            
+    def calculate_current_values(self):
+        """
+        Calculates the values of setup attributes in all setup views, or only those needed for the current view if specified in the settings
+        """
+        if settings.calculates_current_view_only() and self.__current_view in self.__setup_views:
+            self.calculate_values(scope_view=self.__current_view)
+        else:
+            self.calculate_values()
+            
+    def get_upstream_setup_classes(self, setup_view):
+        """
+        Returns a set of all setup classes in the specified setup view and those they directly or indirectly take input from, including those in other views
+        """
+        upstream_setup_classes = set()
+        
+        if not setup_view.is_restored():
+            return upstream_setup_classes
+            
+        to_visit = [setup_class_gui.get_setup_class() for setup_class_gui in setup_view.get_setup_classes_gui()]
+        
+        while len(to_visit) > 0:
+            setup_class = to_visit.pop()
+            
+            if not setup_class in upstream_setup_classes:
+                upstream_setup_classes.add(setup_class)
+                to_visit.extend(setup_class.get_input_setup_classes().keys())
+                
+        return upstream_setup_classes
+        
+    def get_downstream_setup_classes(self, setup_classes):
+        """
+        Returns a set of the specified setup classes and all setup classes that directly or indirectly take input from them, among those in and upstream of the restored setup views
+        """
+        # Setup classes taking each setup class as input, found by visiting each setup class once
+        dependent_setup_classes = {} # Key: Setup class, Value: List of setup classes taking it as input
+        visited_setup_classes = set()
+        to_visit = [setup_class_gui.get_setup_class() for setup_view in self.get_restored_setup_views() for setup_class_gui in setup_view.get_setup_classes_gui()]
+        
+        while len(to_visit) > 0:
+            setup_class = to_visit.pop()
+            
+            if not setup_class in visited_setup_classes:
+                visited_setup_classes.add(setup_class)
+                
+                for input_setup_class in setup_class.get_input_setup_classes():
+                    dependent_setup_classes.setdefault(input_setup_class, []).append(setup_class)
+                    to_visit.append(input_setup_class)
+                    
+        downstream_setup_classes = set()
+        to_visit = list(setup_classes)
+        
+        while len(to_visit) > 0:
+            setup_class = to_visit.pop()
+            
+            if not setup_class in downstream_setup_classes:
+                downstream_setup_classes.add(setup_class)
+                to_visit.extend(dependent_setup_classes.get(setup_class, []))
+                
+        return downstream_setup_classes
+        
+    def get_stale_setup_views(self):
+        return self.__stale_setup_views
         
-    def calculate_values(self):
+    @measure("Calculation: Model.calculate_values")
+    def calculate_values(self, *, scope_view=None):
         """
         Calculates the values of setup attributes
+        
+        scope_view: Setup view to only calculate the values needed for, where other setup views are calculated when changed to, None calculating all values
+        """
+        for step in self.calculate_values_in_steps(None, scope_view=scope_view):
+            pass
+            
+    def calculate_values_in_steps(self, num_setup_attributes_per_step, *, scope_view=None):
+        """
+        Calculates the values in the same way as calculate_values, yielding after each number of calculated setup attributes so that the program can respond in between
+        The values are shown once all have been calculated, and if not run to the end, all values are calculated the next time
+        
+        num_setup_attributes_per_step: Number of setup attributes calculated between each yield, None never yielding
         """
+        # The values are not current until the calculation has finished, in case it is stopped before
+        calculated_model_hash = self.__calculated_model_hash
+        self.__calculated_model_hash = None
+        
+        # Values entered since the saves were read might affect setup views that have not been restored yet, which are then calculated when restored
+        self.discard_saved_values()
+        
+        if scope_view == None:
+            scoped_setup_classes = None
+            setup_views_to_calculate = self.get_restored_setup_views()
+            self.__stale_setup_views = set()
+        else:
+            scoped_setup_classes = self.get_upstream_setup_classes(scope_view)
+            setup_views_to_calculate = [scope_view]
+            self.__stale_setup_views.discard(scope_view)
+            
+            # Values entered but not calculated in other setup views are only used when those are calculated
+            changed_setup_classes = set(scoped_setup_classes)
+            
+            for setup_view in self.get_restored_setup_views():
+                for setup_class_gui in setup_view.get_setup_classes_gui():
+                    if any(setup_attribute_gui.has_changed_entered_value() for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui()):
+                        changed_setup_classes.add(setup_class_gui.get_setup_class())
+                        
+            # Other setup views showing or depending on any of the recalculated or entered setup classes might show outdated values
+            downstream_setup_classes = self.get_downstream_setup_classes(changed_setup_classes)
+            
+            for setup_view in self.get_restored_setup_views():
+                if setup_view != scope_view and any(setup_class_gui.get_setup_class() in downstream_setup_classes for setup_class_gui in setup_view.get_setup_classes_gui()):
+                    self.__stale_setup_views.add(setup_view)
+                    
         seen_instances = {} # Key: Instance name, Value: List of GUI setup classes
         seen_linked_groups = set()
         
-        # Reset all values that do not have a manual entry field
-        for setup_view in self.__setup_views:
+        # Reset all values that do not have a manual entry field, where setup views that have not been restored yet are calculated when restored
+        for setup_view in self.get_restored_setup_views():
             for setup_class_gui in setup_view.get_setup_classes_gui():
-                if not setup_view.is_excluded():
+                if not setup_view.is_excluded() and (scoped_setup_classes == None or setup_class_gui.get_setup_class() in scoped_setup_classes):
                     setup_class_gui.reset_calculated_values()
                     
                 # Used for finding duplicate names
@@ -487,12 +780,113 @@ class Model:
                         
                     print(f"\t\t{setup_class_gui.get_view().get_name()}{text_linked_group}")
                     
-        # Calculates the values of any attribute that had its value reset
-        for setup_view in self.__setup_views:
+        setup_classes_to_calculate = set()
+        
+        if num_setup_attributes_per_step != None or settings.get_num_calculation_processes() > 1:
+            for setup_view in setup_views_to_calculate:
+                if not setup_view.is_excluded():
+                    setup_classes_to_calculate.update(self.get_upstream_setup_classes(setup_view))
+                    
+        # Calculates in the order of the calculation graph when calculating in steps, as calculating one setup class might otherwise calculate all setup classes it takes input from at once
+        if num_setup_attributes_per_step != None:
+            num_calculated_setup_attributes = 0
+            
+            for setup_attribute in CalculationGraph(setup_classes_to_calculate).get_topological_order():
+                if setup_attribute.get_value() == None:
+                    setup_attribute.calculate_value()
+                    num_calculated_setup_attributes += 1
+                    
+                    if num_calculated_setup_attributes % num_setup_attributes_per_step == 0:
+                        yield
+                        
+        # Calculates independent parts of the setup views in separate processes
+        elif settings.get_num_calculation_processes() > 1:
+            calculate_values_in_parallel(CalculationGraph(setup_classes_to_calculate), settings.get_num_calculation_processes())
+            
+        # Calculates the values of any attribute that had its value reset and shows the values
+        for setup_view in setup_views_to_calculate:
             for setup_class_gui in setup_view.get_setup_classes_gui():
                 if not setup_view.is_excluded():
                     setup_class_gui.calculate_values()
                     
+        if scope_view == None and len(self.get_restored_setup_views()) == len(self.__setup_views):
+            self.__calculated_model_hash = get_model_hashes(self)[1]
+        else:
+            self.__calculated_model_hash = calculated_model_hash
+            
+    def has_current_values(self):
+        """
+        Returns whether all values in restored setup views are the same as calculate_values would calculate, which is the case if nothing has been changed or entered since all values were last calculated
+        """
+        if self.__calculated_model_hash == None or len(self.__stale_setup_views) > 0:
+            return False
+            
+        for setup_view in self.__setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
+                    if setup_attribute_gui.has_changed_entered_value():
+                        return False
+                        
+        return get_model_hashes(self)[1] == self.__calculated_model_hash
+        
+    @contextmanager
+    def defer_display(self):
+        """
+        Context where values and script markers are not shown when changed, but shown once when the outermost context exits, used to avoid redrawing the same values many times
+        """
+        self.__display_deferral_depth += 1
+        
+        try:
+            yield
+        finally:
+            self.__display_deferral_depth -= 1
+            
+            if self.__display_deferral_depth == 0:
+                self.display_deferred()
+                
+    def is_display_deferred(self):
+        return self.__display_deferral_depth > 0
+        
+    def defer_display_of_setup_attribute_gui(self, setup_attribute_gui):
+        self.__deferred_setup_attributes_gui[setup_attribute_gui] = None
+        
+    def defer_script_marker(self, setup_class_gui, text, color, update_linked):
+        self.__deferred_script_markers.append((setup_class_gui, text, color, update_linked))
+        
+    def discard_deferred_script_markers(self, setup_class_gui):
+        self.__deferred_script_markers = [deferred_script_marker for deferred_script_marker in self.__deferred_script_markers if deferred_script_marker[0] != setup_class_gui]
+        
+    @measure("GUI redraw: Model.display_deferred")
+    def display_deferred(self):
+        """
+        Shows the values and creates the script markers that were deferred, skipping those of blocks deleted in the meantime
+        """
+        deferred_setup_attributes_gui = self.__deferred_setup_attributes_gui
+        deferred_script_markers = self.__deferred_script_markers
+        
+        self.__deferred_setup_attributes_gui = {}
+        self.__deferred_script_markers = []
+        
+        for setup_attribute_gui in deferred_setup_attributes_gui:
+            setup_class_gui = setup_attribute_gui.get_setup_class_gui()
+            
+            if setup_attribute_gui in setup_class_gui.get_setup_attributes_gui() and setup_class_gui in setup_class_gui.get_view().get_setup_classes_gui():
+                setup_attribute_gui.display_calculated_value()
+                
+        for setup_class_gui, text, color, update_linked in deferred_script_markers:
+            if setup_class_gui in setup_class_gui.get_view().get_setup_classes_gui():
+                setup_class_gui.create_script_marker_indicator(text, color, update_linked)
+                
+    @measure("GUI redraw: Model.display_values")
+    def display_values(self):
+        """
+        Shows the current values of setup attributes without calculating them
+        """
+        for setup_view in self.get_restored_setup_views():
+            if not setup_view.is_excluded():
+                for setup_class_gui in setup_view.get_setup_classes_gui():
+                    setup_class_gui.display_values()
+                    
     """
     def get_setup_view_names(self):
         return [view.get_name() for view in self.__setup_views]
@@ -514,33 +908,149 @@ class Model:
         while view.get_name() in existing_view_names:
             view.set_name(f"{view.get_name()} ({added_number})")
         
-    def save(self):
+    def get_views_to_save(self):
         """
-        Saves all configuration and setup views
+        Returns all views in the order they are restored, where configuration views come first as they need to be restored before setup views so that they can use the configurations
+        Views are renamed if their names overlap, so that each view is saved to its own file
         """
-        self.calculate_values()
+        configuration_view_names = set()
+        setup_view_names = set()
         
+        for configuration_view in self.__configuration_views:
+            self.update_duplicate_view_name(configuration_view, configuration_view_names)
+            configuration_view_names.add(configuration_view.get_name())
+            
+        for setup_view in self.__setup_views:
+            self.update_duplicate_view_name(setup_view, setup_view_names)
+            setup_view_names.add(setup_view.get_name())
+            
+        return self.__configuration_views + self.__setup_views
+        
+    def get_mapping_deferred_linked_group_number(self):
+        """
+        Returns a dictionary mapping the linked group numbers in the saves of setup views that have not been restored yet to numbers not used by restored setup classes, used when saving those setup views as read from their saves
+        """
+        deferred_linked_group_numbers = set()
+        
+        for setup_view in self.__setup_views:
+            deferred_linked_group_numbers.update(setup_view.get_deferred_linked_group_numbers())
+            
+        mapping_linked_group_number = {}
+        
+        for linked_group_number in sorted(deferred_linked_group_numbers):
+            new_linked_group_number = linked_group_number
+            
+            while new_linked_group_number in self.__linked_setup_groups_per_number or \
+                  (new_linked_group_number != linked_group_number and new_linked_group_number in deferred_linked_group_numbers) or \
+                  new_linked_group_number in mapping_linked_group_number.values():
+                new_linked_group_number += 1
+                
+            mapping_linked_group_number[linked_group_number] = new_linked_group_number
+            
+        return mapping_linked_group_number
+        
+    def get_saved_states_views(self):
+        """
+        Returns a list of tuples (path to the file save, saved states) of all views, which do not refer to any blocks so that they can be written to file in a separate thread
+        Setup views that have not been restored yet are included as read from their saves, where linked group numbers already used by restored setup classes are changed
+        """
+        mapping_linked_group_number = self.get_mapping_deferred_linked_group_number()
+        saved_states_views = []
+        
+        for view in self.get_views_to_save():
+            if view in self.__setup_views:
+                saved_states_views.append((view.get_save_file_path(), view.get_saved_states(mapping_linked_group_number)))
+            else:
+                saved_states_views.append((view.get_save_file_path(), view.get_saved_states()))
+                
+        return saved_states_views
+        
+    def autosave(self):
+        """
+        Takes a snapshot of the states of all views, which are written as an autosave in a separate thread
+        Values are not calculated first, so values entered since the last calculation are not included
+        
+        Returns whether an autosave was started, which is not the case while the previous autosave is still being written
+        """
+        with measure("Saving: Model.autosave"):
+            is_started = self.__autosaver.autosave(self.get_saved_states_views(), settings.get_num_autosaves())
+            
+        if is_started:
+            self.__last_autosave_time = time.monotonic()
+            
+        return is_started
+        
+    def check_autosave(self):
+        """
+        Autosaves if the time between autosaves specified in the settings has passed, checking again after AUTOSAVE_CHECK_INTERVAL
+        """
+        if settings.get_autosave_interval() > 0 and time.monotonic() - self.__last_autosave_time >= settings.get_autosave_interval() * 60:
+            self.autosave()
+            
+        self.__root.after(AUTOSAVE_CHECK_INTERVAL, self.check_autosave)
+        
+    def get_autosaver(self):
+        return self.__autosaver
+        
+    def save(self):
+        """
+        Saves all configuration and setup views, where only the files of views that have changed since they were last saved or restored are written
+        Each file is replaced at once, so that a save that is interrupted leaves the files of the previous save intact
+        Setup views that have not been restored yet are saved as read from their saves, unless their values need to be calculated
+        """
+        if not self.has_current_deferred_values():
+            self.restore_deferred_setup_views()
+            
+        # Values entered or changed since the last calculation are included in the save
+        if not self.has_current_values():
+            self.calculate_values()
+            
         for directory in [CONFIGURATION_SAVES_DIRECTORY, SETUP_SAVES_DIRECTORY]:
             os.makedirs(os.path.join(SAVES_PATH, directory), exist_ok=True)
             
-        configuration_view_names = set()
-        setup_view_names = set()
+        file_paths = []
+        is_any_written = False
+        mapping_linked_group_number = self.get_mapping_deferred_linked_group_number()
+        
+        for view in self.get_views_to_save():
+            if view in self.__setup_views:
+                file_path, is_written = view.save(mapping_linked_group_number)
+            else:
+                file_path, is_written = view.save()
+                
+            file_paths.append(file_path)
+            is_any_written = is_any_written or is_written
         
         # Create file where the path and view type of each saved view is stored, also storing the order of the views
-        with open(FILE_PATHS_SAVES_PATH, "w") as file_with_paths:
-            # Need to store configuration views first as they need to be restored before setup views so that they can use the configurations
-            for configuration_view in self.__configuration_views:
-                self.update_duplicate_view_name(configuration_view, configuration_view_names)
-                configuration_view_names.add(configuration_view.get_name())
+        text_file_paths = "".join(f"{file_path}\n" for file_path in file_paths)
+        saved_text_file_paths = None
                 
-                file_path = configuration_view.save()
-                file_with_paths.write(f"{file_path}\n")
+        if os.path.exists(FILE_PATHS_SAVES_PATH):
+            with open(FILE_PATHS_SAVES_PATH, "r") as file_with_paths:
+                saved_text_file_paths = file_with_paths.read()
+                
+        if text_file_paths != saved_text_file_paths:
+            with open_atomically(FILE_PATHS_SAVES_PATH, "w") as file_with_paths:
+                file_with_paths.write(text_file_paths)
+                
+            is_any_written = True
+            
+        # Hash used to know whether the values in the saves can be shown without calculating them when restored
+        saved_values_hash = self.get_saved_values_hash()
+        previous_saved_values_hash = None
+        
+        if os.path.exists(SAVED_VALUES_HASH_PATH):
+            with open(SAVED_VALUES_HASH_PATH, "r") as file_hash:
+                previous_saved_values_hash = file_hash.read().strip()
                 
-            for setup_view in self.__setup_views:
-                self.update_duplicate_view_name(setup_view, setup_view_names)
-                setup_view_names.add(setup_view.get_name())
+        if saved_values_hash != previous_saved_values_hash:
+            with open_atomically(SAVED_VALUES_HASH_PATH, "w") as file_hash:
+                file_hash.write(f"{saved_values_hash}\n")
                 
-                file_path = setup_view.save()
-                file_with_paths.write(f"{file_path}\n")
+        # Also save the model in a format that can be loaded without any GUI, see CompactSave, which only changes if any view has changed
+        # It is created from the blocks of all setup views, so those that have not been restored yet are restored first
+        if is_any_written or not os.path.exists(COMPACT_SAVE_PATH):
+            self.restore_deferred_setup_views()
+            save_compact(self, COMPACT_SAVE_PATH)
                 
         settings.save()
@@ -42,13 +42,15 @@ class Options:
         Options for configuration and setup views
         """
         from setup_view import SetupView
+        from system_model_import import import_system_model_into_view
+        from attribute_export import export_setup_view
         
         is_setup_view = isinstance(view, SetupView)
         
         if is_setup_view:
-            columns = 5
+            columns = 7
         else:
-            columns = 3
+            columns = 4
         
         options = Options(model, view, 3, columns, "View")
         
@@ -70,6 +72,26 @@ class Options:
             
             current_column += 1
             
+            entry_text_import = tk.StringVar()
+            options.add_entry(0, current_column, "Import system model (.json or .csv file):", "", lambda: import_system_model_into_view(view, entry_text_import.get()), entry_text_import)
+            
+            current_column += 1
+            
+            entry_text_export = tk.StringVar()
+            options.add_entry(0, current_column, "Export values (.csv, .jsonl or .npz file):", "", lambda: export_setup_view(view, entry_text_export.get()), entry_text_export)
+            
+            current_column += 1
+            
+        else:
+            if view.get_metamodel_id() == None:
+                options.add_label(0, current_column, "Publish to metamodel library:")
+            else:
+                options.add_label(0, current_column, f"Published as {view.get_metamodel_id()}:")
+                
+            options.add_button(1, current_column, "Publish", lambda: view.publish_metamodel())
+            
+            current_column += 1
+            
         options.add_label(0, current_column, "Delete view:")
         options.add_button(1, current_column, "Delete", lambda: model.delete_view(view))
         
@@ -78,14 +100,38 @@ class Options:
         """
         Options for general settings to the program
         """
-        options = Options(model, view, 2, 2, "General settings")
+        options = Options(model, view, 2, 10, "General settings")
         
         entry_text = tk.StringVar()
         options.add_entry(0, 0, "Number of samples when sampling distributions:", settings.get_num_samples(), lambda: set_num_samples(entry_text.get()), entry_text)
         
+        entry_text_processes = tk.StringVar()
+        options.add_entry(0, 3, "Number of processes when calculating values:", settings.get_num_calculation_processes(), lambda: set_num_calculation_processes(entry_text_processes.get()), entry_text_processes)
+        
         options.add_label(0, 1, "Warn for duplicate class instance names:")
         options.add_toggle_button(1, 1, "Print warnings", settings.warns_duplicate_names(), lambda: settings.set_warn_duplicate_names(True), lambda: settings.set_warn_duplicate_names(False))
         
+        options.add_label(0, 2, "Calculate values only for the current system view:")
+        options.add_toggle_button(1, 2, "Current view only", settings.calculates_current_view_only(), lambda: settings.set_calculate_current_view_only(True), lambda: settings.set_calculate_current_view_only(False))
+        
+        options.add_label(0, 4, "Run scripts while the program can still be used:")
+        options.add_toggle_button(1, 4, "In background", settings.runs_scripts_in_background(), lambda: settings.set_run_scripts_in_background(True), lambda: settings.set_run_scripts_in_background(False))
+        
+        options.add_label(0, 5, "Report the time spent in each part of scripts:")
+        options.add_toggle_button(1, 5, "Profile scripts", settings.profiles_scripts(), lambda: settings.set_profile_scripts(True), lambda: settings.set_profile_scripts(False))
+        
+        options.add_label(0, 6, "Run scripts in a separate process without access to the rest of the program:")
+        options.add_toggle_button(1, 6, "Separate process", settings.runs_scripts_in_subprocess(), lambda: settings.set_run_scripts_in_subprocess(True), lambda: settings.set_run_scripts_in_subprocess(False))
+        
+        options.add_label(0, 7, "Show the result of the previous run of a script if neither the script nor the model has changed:")
+        options.add_toggle_button(1, 7, "Cache results", settings.caches_script_results(), lambda: settings.set_cache_script_results(True), lambda: settings.set_cache_script_results(False))
+        
+        entry_text_autosave_interval = tk.StringVar()
+        options.add_entry(0, 8, "Minutes between autosaves (0 turns autosaving off):", settings.get_autosave_interval(), lambda: set_autosave_interval(entry_text_autosave_interval.get()), entry_text_autosave_interval)
+        
+        entry_text_num_autosaves = tk.StringVar()
+        options.add_entry(0, 9, "Number of autosaves kept:", settings.get_num_autosaves(), lambda: set_num_autosaves(entry_text_num_autosaves.get()), entry_text_num_autosaves)
+        
     @staticmethod
     def configuration_class(model, view, configuration_class_gui, configuration_views):
         """
@@ -313,3 +359,21 @@ def set_num_samples(num_samples_string):
         settings.set_num_samples(abs(int(num_samples_string)))
     except:
         settings.set_num_samples(1)
+
+def set_num_calculation_processes(num_calculation_processes_string):
+    try:
+        settings.set_num_calculation_processes(max(1, abs(int(num_calculation_processes_string))))
+    except:
+        settings.set_num_calculation_processes(1)
+        
+def set_autosave_interval(autosave_interval_string):
+    try:
+        settings.set_autosave_interval(abs(float(autosave_interval_string)))
+    except:
+        settings.set_autosave_interval(0)
+        
+def set_num_autosaves(num_autosaves_string):
+    try:
+        settings.set_num_autosaves(max(1, abs(int(num_autosaves_string))))
+    except:
+        settings.set_num_autosaves(1)
@@ -0,0 +1,200 @@
+import os
+import json
+import struct
+import numpy as np
+from helper_functions_general import open_atomically
+
+RESULT_STORE_FORMAT_VERSION = 1 # Incremented whenever the index or the column files change
+NPY_HEADER_LENGTH = 128 # Bytes before the values in each column file, fixed so that the header can be rewritten when rows are appended
+
+def write_npy_header(file, dtype, shape):
+    """
+    Writes the header of a NumPy .npy file (format version 1.0), padded to NPY_HEADER_LENGTH bytes
+    """
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": tuple(shape)})
+    
+    if len(header) >= NPY_HEADER_LENGTH - 10:
+        raise ValueError(f"The header {header} does not fit in the column file")
+        
+    header = header.ljust(NPY_HEADER_LENGTH - 11) + "\n"
+    file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+    
+class ResultStore:
+    """
+    Stores results that might not fit in memory, such as the attribute values of each scenario of a batch run, as one NumPy .npy file per column that rows are appended to
+    Each row holds one value per column, where all values in a column are arrays of the same shape, such as the numbers of an attribute value or its samples
+    The file index.json lists the key identifying each column, such as (class_type, class_instance, attribute), its data type and the shape of its values, as well as the number of rows
+    Columns are read as memory-mapped arrays, so that only the parts that are used are read from the files
+    """
+    def __init__(self, directory):
+        self.__directory = directory
+        self.__columns = [] # Dictionaries with the key, file, data type and value shape of each column, as stored in the index
+        self.__column_ids = {} # Key: Key of column, Value: Index of column
+        self.__num_rows = 0
+        
+        if os.path.exists(self.get_index_path()):
+            with open(self.get_index_path(), "r") as file_index:
+                index = json.load(file_index)
+                
+            if index["version"] > RESULT_STORE_FORMAT_VERSION:
+                raise ValueError(f"The result store {directory} has format version {index['version']}, but only versions up to {RESULT_STORE_FORMAT_VERSION} are supported")
+                
+            self.__num_rows = index["num_rows"]
+            
+            for column in index["columns"]:
+                self.__column_ids[tuple(column["key"])] = len(self.__columns)
+                self.__columns.append(column)
+                
+    def get_directory(self):
+        return self.__directory
+        
+    def get_index_path(self):
+        return os.path.join(self.__directory, "index.json")
+        
+    def get_num_rows(self):
+        return self.__num_rows
+        
+    def get_keys(self):
+        return [tuple(column["key"]) for column in self.__columns]
+        
+    def add_column(self, key, shape=(), dtype=np.float64):
+        """
+        Adds a column, which can only be done before any rows are appended
+        
+        key: Tuple of strings identifying the column, such as (class_type, class_instance, attribute)
+        shape: Shape of each value in the column, () for single numbers
+        """
+        key = tuple(key)
+        
+        if self.__num_rows > 0:
+            raise ValueError(f"Could not add the column {key}, as columns can only be added before any rows are appended")
+            
+        if key in self.__column_ids:
+            raise ValueError(f"The result store already has a column {key}")
+            
+        column = {"key": list(key), "file": f"{len(self.__columns)}.npy", "dtype": np.lib.format.dtype_to_descr(np.dtype(dtype)), "shape": list(shape)}
+        os.makedirs(self.__directory, exist_ok=True)
+        
+        with open(os.path.join(self.__directory, column["file"]), "wb") as file_column:
+            write_npy_header(file_column, np.dtype(dtype), (0,) + tuple(shape))
+            
+        self.__column_ids[key] = len(self.__columns)
+        self.__columns.append(column)
+        self.save_index()
+        
+    def append(self, values):
+        """
+        Appends rows to all columns, writing them to the end of the column files
+        
+        values: Dictionary with the key of each column and an array with one row per appended row as values, or a sequence of such arrays in the order of the columns
+        """
+        if isinstance(values, dict):
+            missing_keys = [key for key in self.get_keys() if not key in values]
+            
+            if len(missing_keys) > 0:
+                raise ValueError(f"Missing values for {len(missing_keys)} of the columns when appending, for example {missing_keys[0]}")
+                
+            values = [values[key] for key in self.get_keys()]
+            
+        if len(values) != len(self.__columns):
+            raise ValueError(f"Expected values for {len(self.__columns)} columns, but got {len(values)}")
+            
+        arrays = []
+        
+        for column, column_values in zip(self.__columns, values):
+            array = np.ascontiguousarray(column_values, dtype=np.dtype(column["dtype"]))
+            
+            if array.shape[1:] != tuple(column["shape"]):
+                raise ValueError(f"Expected values of shape {tuple(column['shape'])} for the column {tuple(column['key'])}, but got {array.shape[1:]}")
+                
+            arrays.append(array)
+            
+        num_rows = {len(array) for array in arrays}
+        
+        if len(num_rows) > 1:
+            raise ValueError(f"Expected the same number of rows for all columns, but got {sorted(num_rows)}")
+            
+        num_appended_rows = num_rows.pop() if len(num_rows) > 0 else 0
+        
+        for column, array in zip(self.__columns, arrays):
+            dtype = np.dtype(column["dtype"])
+            
+            with open(os.path.join(self.__directory, column["file"]), "r+b") as file_column:
+                # Removes any rows written after the index was last saved, such as by an append that was interrupted
+                file_column.truncate(NPY_HEADER_LENGTH + self.__num_rows * dtype.itemsize * int(np.prod(column["shape"])))
+                file_column.seek(0, os.SEEK_END)
+                file_column.write(array.tobytes())
+                
+                file_column.seek(0)
+                write_npy_header(file_column, dtype, (self.__num_rows + num_appended_rows,) + tuple(column["shape"]))
+                
+        self.__num_rows += num_appended_rows
+        self.save_index()
+        
+    def append_row(self, values):
+        """
+        Appends a single row, where values are given in the same way as for append but with one value per column instead of one array of values
+        """
+        if isinstance(values, dict):
+            self.append({key: np.expand_dims(np.asarray(value), 0) for key, value in values.items()})
+        else:
+            self.append([np.expand_dims(np.asarray(value), 0) for value in values])
+            
+    def append_attribute_values(self, script_interface, keys, *, view=None, snapshot=None):
+        """
+        Appends a row with the current value of each of the specified attributes, such as the result of one scenario, where the first matching attribute is used for each key
+        Columns are added for the keys when the first row is appended, where the values of all attributes need to be numbers so that the shapes of the columns are known
+        Values that are not numbers, such as ("SETUP ERROR",), are stored as NaN
+        
+        script_interface: Script interface to read the values from
+        keys: Sequence of keys (class_type, class_instance, attribute)
+        """
+        keys = [tuple(key) for key in keys]
+        values = []
+        
+        for key in keys:
+            attribute_values = script_interface.get_attribute_values(*key, view, snapshot=snapshot)
+            
+            if len(attribute_values) > 0 and attribute_values[0] != None and all(isinstance(element, float) for element in attribute_values[0]):
+                values.append(np.array(attribute_values[0], dtype=np.float64))
+            else:
+                values.append(None)
+                
+        if len(self.__columns) == 0:
+            for key, value in zip(keys, values):
+                if value is None:
+                    raise ValueError(f"Could not add a column for {key}, as the value of the attribute is not numbers")
+                    
+                self.add_column(key, value.shape)
+                
+        row = {}
+        
+        for key, value in zip(keys, values):
+            if value is None and key in self.__column_ids:
+                value = np.full(self.__columns[self.__column_ids[key]]["shape"], np.nan)
+                
+            row[key] = value
+            
+        self.append_row(row)
+        
+    def get_column(self, key):
+        """
+        Returns the values of a column as a read-only array with one row per appended row, which is memory-mapped so that values are only read from the file when used
+        """
+        key = tuple(key)
+        
+        if not key in self.__column_ids:
+            raise ValueError(f"The result store does not have a column {key}")
+            
+        column = self.__columns[self.__column_ids[key]]
+        shape = (self.__num_rows,) + tuple(column["shape"])
+        
+        # Empty files can not be memory-mapped
+        if np.prod(shape) == 0:
+            return np.empty(shape, dtype=np.dtype(column["dtype"]))
+            
+        return np.memmap(os.path.join(self.__directory, column["file"]), dtype=np.dtype(column["dtype"]), mode="r", offset=NPY_HEADER_LENGTH, shape=shape)
+        
+    def save_index(self):
+        with open_atomically(self.get_index_path(), "w") as file_index:
+            json.dump({"version": RESULT_STORE_FORMAT_VERSION, "num_rows": self.__num_rows, "columns": self.__columns}, file_index, indent=4)
@@ -0,0 +1,142 @@
+import asyncio
+import inspect
+import traceback
+from contextlib import nullcontext
+from config import *
+
+def is_async_script_control(script_control):
+    return inspect.iscoroutinefunction(script_control)
+    
+def run_script_control(script_control, script_interface):
+    """
+    Runs the script control function until it has finished, where script control functions defined with async def are given an async script interface and run in a new asyncio event loop
+    Used when running scripts outside of the thread of the GUI
+    """
+    if is_async_script_control(script_control):
+        asyncio.run(script_control(AsyncScriptInterface(script_interface)))
+    else:
+        script_control(script_interface)
+        
+class AsyncScriptInterface:
+    """
+    Script interface for script control functions defined with async def, where time consuming methods are awaited so that the program can respond in between
+    All other methods are the same as in the script interface it is created from
+    The same script runs in the event loop of the GUI (see TkScheduler) and in asyncio event loops
+    """
+    def __init__(self, script_interface, report_progress=None):
+        self.__script_interface = script_interface
+        self.__report_progress = report_progress # Function showing the progress, None passing it on to the script interface
+        
+    def __getattr__(self, name):
+        return getattr(self.__script_interface, name)
+        
+    async def pause(self):
+        """
+        Lets the program respond before continuing, which should be awaited regularly in long loops of the script
+        """
+        await asyncio.sleep(0)
+        
+    def progress(self, progress, text=""):
+        if self.__report_progress == None:
+            self.__script_interface.progress(progress, text)
+        else:
+            self.__report_progress(min(max(float(progress), 0), 1), str(text))
+            
+    async def calculate_values(self, *, snapshot=None):
+        """
+        Calculates values in the same way as the script interface, in steps of ASYNC_SCRIPT_STEP_SIZE setup attributes where the values in the setup views are shown once at the end
+        """
+        await self.pause()
+        
+        for step in self.__script_interface.calculate_values_in_steps(ASYNC_SCRIPT_STEP_SIZE, snapshot=snapshot):
+            await self.pause()
+            
+        await self.pause()
+        
+    async def calculate_snapshots(self, snapshots):
+        """
+        Calculates each of the snapshots, used for calculating many alternatives such as different override values
+        """
+        for snapshot in snapshots:
+            await self.calculate_values(snapshot=snapshot)
+            
+    async def reset_script_changes(self):
+        await self.pause()
+        self.__script_interface.reset_script_changes()
+        await self.pause()
+        
+    async def get_attribute_table(self, class_type, view=None, *, snapshot=None):
+        await self.pause()
+        return self.__script_interface.get_attribute_table(class_type, view, snapshot=snapshot)
+        
+    async def select(self, selector, *, snapshot=None):
+        await self.pause()
+        return self.__script_interface.select(selector, snapshot=snapshot)
+        
+    async def stream_attribute_values(self, view=None):
+        """
+        Async generator of the same values as the script interface, letting the program respond after each ASYNC_SCRIPT_STEP_SIZE values
+        """
+        for i, attribute_value in enumerate(self.__script_interface.stream_attribute_values(view)):
+            yield attribute_value
+            
+            if (i+1) % ASYNC_SCRIPT_STEP_SIZE == 0:
+                await self.pause()
+                
+class TkScheduler:
+    """
+    Runs a coroutine in the event loop of the GUI, where the coroutine runs until it awaits and is continued after the GUI has handled its events
+    Only awaiting the async script interface is supported, as other awaitables require an asyncio event loop
+    """
+    def __init__(self, root, step_context=nullcontext):
+        self.__root = root
+        self.__step_context = step_context # Function returning the context each step is run in
+        self.__coroutine = None
+        self.__on_finished = None
+        
+    def is_running(self):
+        return self.__coroutine != None
+        
+    def start(self, coroutine, on_finished):
+        """
+        on_finished: Function called with "finished", "cancelled" or "failed" when the coroutine stops
+        """
+        self.__coroutine = coroutine
+        self.__on_finished = on_finished
+        self.__root.after(ASYNC_SCRIPT_STEP_INTERVAL, self.step)
+        
+    def step(self):
+        """
+        Continues the coroutine until it awaits again
+        """
+        if self.__coroutine == None:
+            return
+            
+        try:
+            with self.__step_context():
+                awaited = self.__coroutine.send(None)
+                
+            if awaited != None:
+                raise RuntimeError(f"Scripts running in the program can only await the script interface, not {awaited}")
+                
+        except StopIteration:
+            self.stop("finished")
+        except Exception:
+            traceback.print_exc()
+            self.stop("failed")
+        else:
+            self.__root.after(ASYNC_SCRIPT_STEP_INTERVAL, self.step)
+            
+    def cancel(self):
+        """
+        Stops the coroutine where it is currently awaiting
+        """
+        self.stop("cancelled")
+        
+    def stop(self, message):
+        coroutine = self.__coroutine
+        self.__coroutine = None
+        
+        if coroutine != None:
+            coroutine.close()
+            self.__on_finished(message)
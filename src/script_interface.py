@@ -1,5 +1,14 @@
+import os
 import numpy as np
 from helper_functions_general import convert_value_to_string, convert_string_to_value
+from calculation_graph import CalculationGraph
+from calculation_snapshot import CalculationSnapshot
+from calculation_model import CalculationModel
+from script_selector import Selector
+from helper_functions_general import measure
+from result_store import ResultStore
+from attribute_export import export_setup_classes
+from config import *
     
 class ScriptInterface:
     """
@@ -10,10 +19,48 @@ class ScriptInterface:
     class_instance: Name of class instance (for example, DoS attack)
     attribute: Name of attribute (for example, Local difficulty)
     view: Setup view name to consider
+    snapshot: Snapshot created by create_snapshot or fork_snapshot to use instead of the shown values, None using the shown values
     """
-    def __init__(self, model):
+    def __init__(self, model, *, is_frozen=False):
+        """
+        is_frozen: Whether to find all blocks at once and keep them even if the model changes, so that the script interface can be used from other threads than that of the GUI as long as snapshots are used
+        """
         self.__model = model
-        self.__script_helper = ScriptHelper(model)
+        self.__script_helper = ScriptHelper(model, is_frozen)
+        self.__setup_attributes_gui_to_display = set() # Setup attributes with values changed by the script that are shown when the script ends
+        
+    def run(self, script_control):
+        """
+        Runs the script control function of a script and then shows any values changed by it that have not been shown
+        """
+        try:
+            with self.__model.defer_display():
+                script_control(self)
+        finally:
+            self.display_changed_values()
+            
+    @measure("GUI redraw: ScriptInterface.display_changed_values")
+    def display_changed_values(self):
+        """
+        Shows the values of setup attributes changed by the script since the values were last shown
+        """
+        for setup_attribute_gui in self.__setup_attributes_gui_to_display:
+            for linked_setup_attribute_gui in [setup_attribute_gui] + self.__model.get_linked_setup_attributes_gui(setup_attribute_gui):
+                linked_setup_attribute_gui.display_calculated_value()
+                
+        self.__setup_attributes_gui_to_display = set()
+        
+    def progress(self, progress, text=""):
+        """
+        Progress is only shown for scripts running in the background or defined with async def
+        """
+        pass
+        
+    def batch_update(self):
+        """
+        Returns a context where changed values and markers are only shown once when it exits, which is used automatically while a script runs
+        """
+        return self.__model.defer_display()
         
     def get_current_view_name(self):
         """
@@ -68,18 +115,117 @@ class ScriptInterface:
                         
         return input_class_names
         
-    def get_attribute_values(self, class_type, class_instance, attribute, view=None):
+    def get_attribute_values(self, class_type, class_instance, attribute, view=None, *, snapshot=None):
         """
         Returns a list of displayed values by the specified setup attributes, each value in turn represented by a list of individual values
         """
         self.__script_helper.check_type([class_type, class_instance, attribute, view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         attributes_values = []
         
         for setup_attribute_gui in self.__script_helper.get_setup_attributes_gui(view, class_type, class_instance, attribute):
-            attributes_values.append(setup_attribute_gui.get_setup_attribute().get_current_value())
+            if snapshot == None:
+                attributes_values.append(setup_attribute_gui.get_setup_attribute().get_current_value())
+            else:
+                attributes_values.append(snapshot.get_current_value(setup_attribute_gui.get_setup_attribute()))
             
         return attributes_values
         
+    def get_attribute_table(self, class_type, view=None, *, snapshot=None):
+        """
+        Returns a tuple (table, instance_names, column_names, error_mask) with the numeric attribute values of all instances of a class type at once
+        
+        table: 2-D float array with one row per class instance and one column per number in each numeric attribute, where triangle distributions take three columns
+        instance_names: List of the class instance name of each row
+        column_names: List of the attribute name of each column, followed by the name of the number within the value if there are multiple
+        error_mask: 2-D boolean array that is True where the value could not be calculated, such as ("SETUP ERROR",), where the table contains NaN
+        """
+        self.__script_helper.check_type([class_type, view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        setup_classes_gui = self.__script_helper.get_setup_classes_gui(view, class_type)
+        instance_names = [setup_class_gui.get_name() for setup_class_gui in setup_classes_gui]
+        
+        # Find the columns from the numeric attributes, which are the same for all instances of the class type
+        column_names = []
+        columns = [] # Tuples (attribute index, first column index, number of columns) for each numeric attribute
+        
+        if len(setup_classes_gui) > 0:
+            for i, setup_attribute_gui in enumerate(setup_classes_gui[0].get_setup_attributes_gui()):
+                component_names = setup_attribute_gui.get_setup_attribute().get_value_type().component_names()
+                
+                if len(component_names) > 0:
+                    columns.append((i, len(column_names), len(component_names)))
+                    
+                for component_name in component_names:
+                    if component_name == "":
+                        column_names.append(setup_attribute_gui.get_name())
+                    else:
+                        column_names.append(f"{setup_attribute_gui.get_name()} ({component_name})")
+                        
+        table = np.full((len(instance_names), len(column_names)), np.nan)
+        error_mask = np.zeros(table.shape, dtype=bool)
+        
+        for row, setup_class_gui in enumerate(setup_classes_gui):
+            setup_attributes = [setup_attribute_gui.get_setup_attribute() for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui()]
+            
+            for i, first_column, num_columns in columns:
+                if snapshot == None:
+                    value = setup_attributes[i].get_current_value()
+                else:
+                    value = snapshot.get_current_value(setup_attributes[i])
+                    
+                if value != None and len(value) == num_columns and all(isinstance(element, float) for element in value):
+                    table[row, first_column:first_column+num_columns] = value
+                else:
+                    error_mask[row, first_column:first_column+num_columns] = True
+                    
+        return table, instance_names, column_names, error_mask
+        
+    def select(self, selector, *, snapshot=None):
+        """
+        Returns a list of tuples (view, class_type, class_instance, attribute, value) of all setup attributes matching the selector, see Selector for the syntax
+        Linked copies are included once for each setup view they are in
+        
+        selector: Selector string, for example view^="Attack tree" class="Attack event" attribute="Global difficulty" value<3, or a Selector
+        """
+        self.__script_helper.check_type([selector], (str, Selector))
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        if isinstance(selector, str):
+            selector = self.__script_helper.get_selector(selector)
+            
+        class_type = selector.get_exact_name("class")
+        class_instance = selector.get_exact_name("instance")
+        attribute = selector.get_exact_name("attribute")
+        
+        matches = []
+        values = []
+        
+        for setup_view in self.__script_helper.get_setup_views(selector.get_exact_name("view")):
+            view = setup_view.get_name()
+            
+            if not selector.matches_name("view", view):
+                continue
+                
+            # Names required to be equal are looked up directly, the other conditions are checked for each found setup attribute
+            for setup_attribute_gui in self.__script_helper.get_setup_attributes_gui(view, class_type, class_instance, attribute):
+                setup_attribute = setup_attribute_gui.get_setup_attribute()
+                setup_class = setup_attribute.get_setup_class()
+                
+                if selector.matches_name("class", setup_class.get_configuration_name()) and \
+                   selector.matches_name("instance", setup_class.get_instance_name()) and \
+                   selector.matches_name("attribute", setup_attribute_gui.get_name()):
+                    if snapshot == None:
+                        value = setup_attribute.get_current_value()
+                    else:
+                        value = snapshot.get_current_value(setup_attribute)
+                        
+                    matches.append((view, setup_class.get_configuration_name(), setup_class.get_instance_name(), setup_attribute_gui.get_name(), value))
+                    values.append(value)
+                    
+        return [match for match, is_match in zip(matches, selector.match_values(values)) if is_match]
+        
     def convert_value_to_string(self, attribute_value):
         """
         Converts the specified tuple attribute value into a formatted string
@@ -88,26 +234,76 @@ class ScriptInterface:
         
         return convert_value_to_string(attribute_value)
         
-    def override_attribute_values(self, override_value, class_type, *, class_instance=None, attribute=None, view=None):
+    def override_attribute_values(self, override_value, class_type, *, class_instance=None, attribute=None, view=None, snapshot=None):
         """
         Overrides the displayed value of matching attributes with a temporary one
         """
         self.__script_helper.check_type([class_type, class_instance, attribute, view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         self.__script_helper.check_convert_to_type(override_value, str)
         
         override_value = convert_string_to_value(str(override_value))
         
         for setup_attribute_gui in self.__script_helper.get_setup_attributes_gui(view, class_type, class_instance, attribute):
-            setup_attribute_gui.get_setup_attribute().set_override_value(override_value)
+            if snapshot == None:
+                setup_attribute_gui.get_setup_attribute().set_override_value(override_value)
+            else:
+                snapshot.set_override_value(setup_attribute_gui.get_setup_attribute(), override_value)
+            
+    def override_attribute_values_bulk(self, override_values, keys=None, *, view=None, snapshot=None):
+        """
+        Overrides the displayed value of many attributes at once, where the values are shown when the script ends or values are calculated
+        
+        override_values: Dictionary with keys (class_type, class_instance, attribute) and override values as values, or a sequence of override values if keys are specified
+        keys: Sequence of keys (class_type, class_instance, attribute) for each of the override values, None if override_values is a dictionary
+        
+        Each override value is a number, a sequence of numbers (for example, a row of a NumPy array with three columns for triangle distributions) or a string
+        """
+        self.__script_helper.check_type([view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        if keys is None: # Keys can be a NumPy array, which can not be compared using ==
+            self.__script_helper.check_type([override_values], dict)
+            keys = list(override_values.keys())
+            override_values = list(override_values.values())
+            
+        elif len(keys) != len(override_values):
+            raise ValueError(f"Expected one override value per key, but got {len(override_values)} values for {len(keys)} keys")
+            
+        setup_attributes_gui_per_key = self.__script_helper.get_setup_attributes_gui_per_key(view)
+        missing_keys = []
+        
+        for key, override_value in zip(keys, override_values):
+            key = tuple(key)
+            
+            if not key in setup_attributes_gui_per_key:
+                missing_keys.append(key)
+                continue
+                
+            override_value = self.__script_helper.convert_to_attribute_value(override_value)
+            
+            for setup_attribute_gui in setup_attributes_gui_per_key[key]:
+                if snapshot == None:
+                    setup_attribute_gui.get_setup_attribute().set_override_value(override_value)
+                    self.__setup_attributes_gui_to_display.add(setup_attribute_gui)
+                else:
+                    snapshot.set_override_value(setup_attribute_gui.get_setup_attribute(), override_value)
+                    
+        if len(missing_keys) > 0:
+            print(f"Warning: Could not find attributes matching {len(missing_keys)} of the keys when overriding values, for example {missing_keys[0]}")
             
-    def reset_override_attribute_values(self, *, class_type=None, class_instance=None, attribute=None, view=None):
+    def reset_override_attribute_values(self, *, class_type=None, class_instance=None, attribute=None, view=None, snapshot=None):
         """
         Resets any override value of matching attributes
         """
         self.__script_helper.check_type([class_type, class_instance, attribute, view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         
         for setup_attribute_gui in self.__script_helper.get_setup_attributes_gui(view, class_type, class_instance, attribute):
-            setup_attribute_gui.attempt_to_reset_override_value()
+            if snapshot == None:
+                setup_attribute_gui.attempt_to_reset_override_value()
+            else:
+                snapshot.reset_override_value(setup_attribute_gui.get_setup_attribute())
             
     def set_class_marker(self, value, color, *, class_type=None, class_instance=None, view=None):
         """
@@ -119,106 +315,271 @@ class ScriptInterface:
         for setup_class_gui in self.__script_helper.get_instances_setup_class_gui(view, class_type, class_instance):
             setup_class_gui.create_script_marker_indicator(value, color)
             
-    def calculate_values(self):
+    def calculate_values(self, *, snapshot=None):
         """
         Calculates all attribute values in the setup views based on the current configuration
+        If a snapshot is specified, only its values affected by changes since its last calculation are recalculated
         """
-        self.__model.calculate_values()
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         
-    def reset_script_changes(self):
+        if snapshot == None:
+            self.__model.calculate_values()
+            self.__setup_attributes_gui_to_display = set() # All values are shown when calculating
+        else:
+            snapshot.calculate_values()
+            
+    def calculate_values_in_steps(self, num_setup_attributes_per_step, *, snapshot=None):
         """
-        Reset any changes made by scripts, such as override values and markers
+        Calculates values in the same way as calculate_values, yielding after each number of calculated setup attributes so that the program can respond in between
+        
+        num_setup_attributes_per_step: Number of setup attributes calculated between each yield, None never yielding
         """
-        self.__model.reset_script_changes()
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         
-class ScriptHelper:
-    def __init__(self, model):
-        self.__model = model
-        self.__cache = {} # To improve performance when getting the same elements multiple times
+        if snapshot == None:
+            yield from self.__model.calculate_values_in_steps(num_setup_attributes_per_step)
+            self.__setup_attributes_gui_to_display = set() # All values are shown when calculating
+        else:
+            yield from snapshot.calculate_values_in_steps(num_setup_attributes_per_step)
+            
+    def stream_attribute_values(self, view=None, *, snapshot=None):
+        """
+        Calculates attribute values without showing them, yielding tuples (view, class_type, class_instance, attribute, value) as soon as each value has been calculated
+        If a snapshot is specified, its values are calculated and yielded instead in the same order
+        """
+        self.__script_helper.check_type([view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         
-    def get_from_cache(self, identifier):
-        if identifier in self.__cache:
-            return self.__cache[identifier]
+        if snapshot == None:
+            return CalculationModel.from_model(self.__model).stream_values(view)
             
-        return None
+        return self.stream_snapshot_values(view, snapshot)
         
-    def get_setup_views(self, view):
-        cache_result = self.get_from_cache(view)
+    def stream_snapshot_values(self, view, snapshot):
+        snapshot.calculate_values()
+        view_names_per_setup_class = {} # Key: Setup class, Value: List of names of the setup views the setup class is in
         
-        if cache_result != None:
-            return cache_result
+        for setup_view in self.__script_helper.get_setup_views(view):
+            for setup_class_gui in self.__script_helper.get_setup_classes_gui(setup_view.get_name(), None):
+                view_names_per_setup_class.setdefault(setup_class_gui.get_setup_class(), []).append(setup_view.get_name())
+                
+        # Inputs come before the setup attributes taking them as input
+        for setup_attribute in snapshot.get_calculation_graph().get_topological_order():
+            setup_class = setup_attribute.get_setup_class()
             
-        setup_views = []
+            # Hidden attributes are not shown in the setup views
+            if setup_attribute.is_hidden():
+                continue
+                
+            for view_name in view_names_per_setup_class.get(setup_class, []):
+                yield (view_name, setup_class.get_configuration_name(), setup_class.get_instance_name(), setup_attribute.get_name(), snapshot.get_current_value(setup_attribute))
+                
+    def open_result_store(self, name):
+        """
+        Returns the result store with the specified name in scripts/results, which is created if it does not exist, see ResultStore
+        """
+        self.__script_helper.check_type([name], str)
         
-        for setup_view in self.__model.get_setup_views():
-            if view in (None, setup_view.get_name()):
-                if not setup_view.is_excluded():
-                    setup_views.append(setup_view)
-                    
-        return setup_views
+        return ResultStore(os.path.join(SCRIPT_RESULTS_PATH, name))
         
-    def get_setup_classes_gui(self, view, class_type):
-        cache_result = self.get_from_cache((view, class_type))
+    def append_attribute_values(self, result_store, keys, *, view=None, snapshot=None):
+        """
+        Appends the current values of the specified attributes as one row to a result store, such as the result of one scenario
+        """
+        self.__script_helper.check_type([view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        result_store.append_attribute_values(self, keys, view=view, snapshot=snapshot)
+        
+    def export_attribute_values(self, file_path, class_types=None, attributes=None, *, view=None, snapshot=None):
+        """
+        Writes the current values of the specified class types and attributes, None including all, to a CSV, JSON Lines or NumPy .npz file chosen by the extension of the file path
+        Relative file paths are placed in scripts/results, where the values are written one class instance at a time, see export_attribute_values in attribute_export
+        
+        Returns the path to the written file
+        """
+        self.__script_helper.check_type([file_path, view], str)
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
         
-        if cache_result != None:
-            return cache_result
+        setup_classes = []
+        
+        for class_type in (class_types if class_types != None else [None]):
+            self.__script_helper.check_type([class_type], str)
+            setup_classes.extend(setup_class_gui.get_setup_class() for setup_class_gui in self.__script_helper.get_setup_classes_gui(view, class_type))
             
-        setup_classes_gui = []
-        seen_setup_classes = set()
+        file_path = os.path.join(SCRIPT_RESULTS_PATH, file_path)
+        export_setup_classes(file_path, setup_classes, class_types=class_types, attributes=attributes, get_value=None if snapshot == None else snapshot.get_current_value)
         
-        for setup_view in self.get_setup_views(view):
-            for setup_class_gui in setup_view.get_setup_classes_gui():
-                if class_type in (None, setup_class_gui.get_configuration_name()):
-                    setup_class = setup_class_gui.get_setup_class()
-                    
-                    if not setup_class in seen_setup_classes:
-                        setup_classes_gui.append(setup_class_gui)
-                        seen_setup_classes.add(setup_class)
-                        
-        return setup_classes_gui
+        return file_path
         
-    def get_first_setup_class_gui(self, class_type):
-        cache_result = self.get_from_cache(class_type)
+    def create_frozen_copy(self):
+        """
+        Returns a script interface that can be used from another thread than that of the GUI, where all blocks are found at once and values entered but not calculated are calculated first
+        The returned script interface only reads values from and makes changes to snapshots, as the blocks of the GUI can only be accessed in its thread
+        """
+        frozen_script_interface = ScriptInterface(self.__model, is_frozen=True)
         
-        if cache_result != None:
-            return cache_result
+        if not self.__model.has_current_values():
+            self.__model.calculate_values()
             
-        for setup_view in self.get_setup_views(None):
-            for setup_class_gui in setup_view.get_setup_classes_gui():
-                if class_type in (None, setup_class_gui.get_configuration_name()):
-                    return setup_class_gui
-                    
-        return None
+        return frozen_script_interface
         
-    def get_instances_setup_class_gui(self, view, class_type, class_instance):
-        cache_result = self.get_from_cache((view, class_type, class_instance))
+    def create_snapshot(self):
+        """
+        Returns a snapshot of the current attribute values and override values, which can be changed and recalculated without changing the shown values
+        """
+        setup_classes = [setup_class_gui.get_setup_class() for setup_class_gui in self.__script_helper.get_setup_classes_gui(None, None)]
+        
+        return CalculationSnapshot(CalculationGraph(setup_classes))
+        
+    def fork_snapshot(self, snapshot):
+        """
+        Returns a new snapshot starting from the values of the specified one, sharing all values that are not changed afterwards
+        """
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        return snapshot.fork()
+        
+    def apply_snapshot(self, snapshot):
+        """
+        Shows the values and override values of the specified snapshot
+        """
+        self.__script_helper.check_type([snapshot], CalculationSnapshot)
+        
+        snapshot.apply()
+        self.__model.display_values()
+        
+    def reset_script_changes(self, *, calculate_values=True):
+        """
+        Reset any changes made by scripts, such as override values and markers
+        """
+        self.__model.reset_script_changes(calculate_values=calculate_values)
+        self.__setup_attributes_gui_to_display = set()
+        
+class ScriptHelper:
+    def __init__(self, model, is_frozen=False):
+        self.__model = model
+        self.__cache = {} # Lookup tables for finding matching blocks, where None in a key matches all
+        self.__cache_version = None # Version of the model when the lookup tables were created
+        self.__selectors = {} # Key: Selector string, Value: Compiled selector
+        self.__is_frozen = is_frozen # Whether the lookup tables are created once and kept even if the model changes
+        
+        if is_frozen:
+            self.create_cache()
+            
+    def is_cache_outdated(self):
+        return not self.__is_frozen and self.__cache_version != self.__model.get_version()
         
-        if cache_result != None:
-            return cache_result
+    def get_from_cache(self, table_name, identifier):
+        """
+        Returns the matching blocks in the specified lookup table, where the lookup tables are created again if the model has changed since they were created
+        """
+        if self.is_cache_outdated():
+            self.create_cache()
             
-        instance_setup_classes_gui = []
+        return self.__cache[table_name].get(identifier, [])
+        
+    def create_cache(self):
+        """
+        Creates lookup tables for finding setup views, classes and attributes in one pass over all setup views that are not excluded
+        """
+        # Scripts can read and change all setup views, so the blocks of those that have not been restored yet are created first
+        self.__model.restore_deferred_setup_views()
+        
+        setup_views = {}
+        setup_classes_gui = {}
+        instances_setup_class_gui = {}
+        setup_attributes_gui = {}
+        seen_setup_classes = {} # Key: Key in setup_classes_gui, Value: Set of setup classes to only include one of each linked copy
         
-        for setup_class_gui in self.get_setup_classes_gui(view, class_type):
-            if class_type in (None, setup_class_gui.get_configuration_name()) and class_instance in (None, setup_class_gui.get_name()):
-                instance_setup_classes_gui.append(setup_class_gui)
+        for setup_view in self.__model.get_setup_views():
+            if setup_view.is_excluded():
+                continue
                 
-        return instance_setup_classes_gui
+            for view in (None, setup_view.get_name()):
+                setup_views.setdefault(view, []).append(setup_view)
+                
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                setup_class = setup_class_gui.get_setup_class()
+                
+                for view in (None, setup_view.get_name()):
+                    for class_type in (None, setup_class_gui.get_configuration_name()):
+                        if setup_class in seen_setup_classes.setdefault((view, class_type), set()):
+                            continue
+                            
+                        seen_setup_classes[(view, class_type)].add(setup_class)
+                        setup_classes_gui.setdefault((view, class_type), []).append(setup_class_gui)
+                        
+                        for class_instance in (None, setup_class_gui.get_name()):
+                            instances_setup_class_gui.setdefault((view, class_type, class_instance), []).append(setup_class_gui)
+                            
+                            for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
+                                for attribute in (None, setup_attribute_gui.get_name()):
+                                    setup_attributes_gui.setdefault((view, class_type, class_instance, attribute), []).append(setup_attribute_gui)
+                                    
+        self.__cache = {"setup_views": setup_views, \
+                        "setup_classes_gui": setup_classes_gui, \
+                        "instances_setup_class_gui": instances_setup_class_gui, \
+                        "setup_attributes_gui": setup_attributes_gui}
+                        
+        self.__cache_version = self.__model.get_version()
         
-    def get_setup_attributes_gui(self, view, class_type, class_instance, attribute):
-        cache_result = self.get_from_cache((view, class_type, class_instance, attribute))
+    def get_setup_views(self, view):
+        return self.get_from_cache("setup_views", view)
+        
+    def get_setup_classes_gui(self, view, class_type):
+        return self.get_from_cache("setup_classes_gui", (view, class_type))
+        
+    def get_first_setup_class_gui(self, class_type):
+        setup_classes_gui = self.get_setup_classes_gui(None, class_type)
         
-        if cache_result != None:
-            return cache_result
+        if len(setup_classes_gui) == 0:
+            return None
             
-        setup_attributes_gui = []
+        return setup_classes_gui[0]
         
-        for setup_class_gui in self.get_instances_setup_class_gui(view, class_type, class_instance):
-            if class_instance in (None, setup_class_gui.get_name()):
+    def get_instances_setup_class_gui(self, view, class_type, class_instance):
+        return self.get_from_cache("instances_setup_class_gui", (view, class_type, class_instance))
+        
+    def get_setup_attributes_gui(self, view, class_type, class_instance, attribute):
+        return self.get_from_cache("setup_attributes_gui", (view, class_type, class_instance, attribute))
+        
+    def get_setup_attributes_gui_per_key(self, view):
+        """
+        Returns a dictionary with keys (class_type, class_instance, attribute) and lists of matching setup attributes as values, kept until the model changes
+        """
+        if self.is_cache_outdated() or not ("setup_attributes_gui_per_key", view) in self.__cache:
+            setup_attributes_gui_per_key = {}
+            
+            for setup_class_gui in self.get_setup_classes_gui(view, None):
                 for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
-                    if attribute in (None, setup_attribute_gui.get_name()):
-                        setup_attributes_gui.append(setup_attribute_gui)
+                    key = (setup_class_gui.get_configuration_name(), setup_class_gui.get_name(), setup_attribute_gui.get_name())
+                    setup_attributes_gui_per_key.setdefault(key, []).append(setup_attribute_gui)
+        
+            self.__cache[("setup_attributes_gui_per_key", view)] = setup_attributes_gui_per_key
                         
-        return setup_attributes_gui
+        return self.__cache[("setup_attributes_gui_per_key", view)]
+        
+    def get_selector(self, text):
+        """
+        Returns the compiled selector of the specified string, where each string is only compiled once
+        """
+        if not text in self.__selectors:
+            self.__selectors[text] = Selector(text)
+            
+        return self.__selectors[text]
+        
+    def convert_to_attribute_value(self, value):
+        """
+        Converts a string, number or sequence of numbers to a tuple attribute value
+        """
+        if isinstance(value, str):
+            return convert_string_to_value(value)
+            
+        try:
+            return tuple(float(element) for element in np.atleast_1d(value))
+        except (TypeError, ValueError):
+            raise TypeError(f"Cannot convert {value} of type {type(value)} to an attribute value")
         
     def check_type(self, list_to_check, type_to_check):
         """
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import threading
+import inspect
+from helper_functions_general import active_time_recorders, active_time_recorders_lock
+from config import *
+
+class ScriptProfiler:
+    """
+    Records the number of calls and time spent in each method of the script interface during one run of a script, as well as time spent calculating and showing values
+    """
+    def __init__(self, script_name):
+        self.__script_name = script_name
+        self.__statistics = {} # Key: Name of what was measured, Value: List [number of calls, total time, maximum time]
+        self.__lock = threading.Lock()
+        self.__start_time = None
+        self.__run_time = 0
+        self.__script_time = 0 # Time spent running the script control function, excluding showing the changes afterwards
+        
+    def get_script_name(self):
+        return self.__script_name
+        
+    def get_run_time(self):
+        return self.__run_time
+        
+    def start(self):
+        """
+        Starts the run, after which time spent calculating and showing values is recorded
+        """
+        self.__start_time = time.perf_counter()
+        
+        with active_time_recorders_lock:
+            active_time_recorders.append(self)
+            
+    def stop(self):
+        with active_time_recorders_lock:
+            if self in active_time_recorders:
+                active_time_recorders.remove(self)
+                
+        if self.__start_time != None:
+            self.__run_time = time.perf_counter() - self.__start_time
+            self.__start_time = None
+            
+    def record(self, name, elapsed_time):
+        with self.__lock:
+            statistics = self.__statistics.setdefault(name, [0, 0, 0])
+            statistics[0] += 1
+            statistics[1] += elapsed_time
+            statistics[2] = max(statistics[2], elapsed_time)
+            
+    def wrap(self, script_control):
+        """
+        Returns a script control function that records the time spent running it, where the script is given a script interface recording all calls made to it
+        """
+        def profiled_script_control(script_interface):
+            start_time = time.perf_counter()
+            
+            try:
+                script_control(ProfiledScriptInterface(script_interface, self))
+            finally:
+                self.__script_time = time.perf_counter() - start_time
+                
+        # Async scripts are timed from start to finish, including the time the program responds in between
+        async def profiled_async_script_control(script_interface):
+            start_time = time.perf_counter()
+            
+            try:
+                await script_control(ProfiledScriptInterface(script_interface, self))
+            finally:
+                self.__script_time = time.perf_counter() - start_time
+                
+        if inspect.iscoroutinefunction(script_control):
+            return profiled_async_script_control
+            
+        return profiled_script_control
+        
+    def get_statistics(self):
+        """
+        Returns a dictionary with what was measured as keys and dictionaries with the number of calls, total time and maximum time in seconds as values
+        """
+        with self.__lock:
+            statistics = {name: {"calls": calls, "total_time": total_time, "max_time": max_time} for name, (calls, total_time, max_time) in self.__statistics.items()}
+            
+        # Time spent by the script itself, outside of any calls to the script interface
+        interface_time = sum(name_statistics["total_time"] for name, name_statistics in statistics.items() if name.startswith("ScriptInterface."))
+        script_logic_time = max(0, self.__script_time - interface_time)
+        statistics["Script logic"] = {"calls": 1, "total_time": script_logic_time, "max_time": script_logic_time}
+        
+        return statistics
+        
+    def get_report(self):
+        """
+        Returns a dictionary with the statistics of the run that can be saved as JSON
+        """
+        return {"script": self.__script_name, \
+                "run_time": self.__run_time, \
+                "statistics": self.get_statistics()}
+                
+    def get_report_text(self):
+        """
+        Returns the statistics of the run as a table, ordered by the total time
+        """
+        lines = [f"Profile of the script {self.__script_name}, which ran for {self.__run_time:.3f} s", \
+                 f"{'Name':<50}{'Calls':>8}{'Total (s)':>12}{'Max (s)':>12}"]
+                 
+        for name, statistics in sorted(self.get_statistics().items(), key=lambda item: -item[1]["total_time"]):
+            lines.append(f"{name:<50}{statistics['calls']:>8}{statistics['total_time']:>12.4f}{statistics['max_time']:>12.4f}")
+            
+        return "\n".join(lines)
+        
+    def print_report(self):
+        print(self.get_report_text())
+        
+    def save_report(self, file_path):
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        
+        with open(file_path, "w") as file_report:
+            json.dump(self.get_report(), file_report, indent=4)
+            
+class ProfiledScriptInterface:
+    """
+    Script interface that passes all calls on to another script interface, recording the time spent in each method
+    """
+    def __init__(self, script_interface, script_profiler):
+        self.__script_interface = script_interface
+        self.__script_profiler = script_profiler
+        
+    def __getattr__(self, name):
+        attribute = getattr(self.__script_interface, name)
+        
+        if not callable(attribute):
+            return attribute
+            
+        script_profiler = self.__script_profiler
+        
+        def profiled_method(*args, **kwargs):
+            start_time = time.perf_counter()
+            
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                script_profiler.record(f"ScriptInterface.{name}", time.perf_counter() - start_time)
+                
+        async def profiled_async_method(*args, **kwargs):
+            start_time = time.perf_counter()
+            
+            try:
+                return await attribute(*args, **kwargs)
+            finally:
+                script_profiler.record(f"ScriptInterface.{name}", time.perf_counter() - start_time)
+                
+        if inspect.iscoroutinefunction(attribute):
+            return profiled_async_method
+            
+        return profiled_method
@@ -0,0 +1,59 @@
+import os
+import importlib.util
+from config import *
+
+class ScriptRegistry:
+    """
+    Imports the scripts found in the script directory, where each script is imported once when first run and shared by all views
+    A script is imported again if its file has been changed since it was last imported, so that scripts can be edited without restarting the program
+    """
+    def __init__(self, script_path):
+        self.__script_path = script_path
+        self.__modules = {} # Key: Script name, Value: Imported module of the script
+        self.__modification_times = {} # Key: Script name, Value: Modification time of the script file when it was imported
+        
+    def get_script_path(self):
+        return self.__script_path
+        
+    def get_script_names(self):
+        """
+        Returns a sorted list of the names of all scripts, without importing them
+        """
+        script_names = []
+        
+        for file_name_full in os.listdir(self.__script_path):
+            # Find all .py files
+            if file_name_full.strip()[-3:] == ".py":
+                file_name = file_name_full.strip().replace(".py", "")
+                
+                # Skip the template file
+                if file_name != "SCRIPT_TEMPLATE":
+                    script_names.append(file_name)
+                    
+        return sorted(script_names)
+        
+    def get_file_path(self, script_name):
+        return os.path.join(self.__script_path, f"{script_name}.py")
+        
+    def get_module(self, script_name):
+        """
+        Returns the imported module of the script, importing it if it has not been imported or if its file has changed since it was imported
+        """
+        modification_time = os.path.getmtime(self.get_file_path(script_name))
+        
+        if self.__modification_times.get(script_name) != modification_time:
+            spec = importlib.util.spec_from_file_location(script_name, self.get_file_path(script_name))
+            script_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(script_module)
+            
+            # Only replace the previous module once the script has been successfully imported
+            self.__modules[script_name] = script_module
+            self.__modification_times[script_name] = modification_time
+            
+        return self.__modules[script_name]
+        
+    def is_imported(self, script_name):
+        return script_name in self.__modules
+        
+    def get_script_control(self, script_name):
+        return self.get_module(script_name).script_control
@@ -0,0 +1,272 @@
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from config import *
+
+FILE_WRITING_METHOD_NAMES = ("export_attribute_values", "open_result_store", "append_attribute_values") # Methods of the script interface with effects outside of the program, which are not repeated when showing a cached result
+
+def get_script_hash(file_path):
+    """
+    Returns a hash of the source of the script in the specified file
+    """
+    with open(file_path, "rb") as file_script:
+        return hashlib.sha256(file_script.read()).hexdigest()
+        
+def get_configuration_description(model):
+    """
+    Returns a tuple (configuration_description, configuration_attribute_ids) describing the configurations, where configuration attributes are referred to by their order
+    """
+    configuration_description = []
+    configuration_attribute_ids = {}
+    
+    for configuration_view in model.get_configuration_views():
+        for configuration_class_gui in configuration_view.get_configuration_classes_gui():
+            for configuration_attribute in configuration_class_gui.get_configuration_class().get_configuration_attributes():
+                configuration_attribute_ids.setdefault(configuration_attribute, len(configuration_attribute_ids))
+                
+    for configuration_attribute, configuration_attribute_id in configuration_attribute_ids.items():
+        configuration_description.append((configuration_attribute_id, \
+                                          configuration_attribute.get_configuration_class().get_name(), \
+                                          configuration_attribute.get_name(), \
+                                          configuration_attribute.get_value_type(), \
+                                          configuration_attribute.get_calculation_type(), \
+                                          configuration_attribute.get_input_scalar(), \
+                                          configuration_attribute.get_input_offset(), \
+                                          configuration_attribute.is_hidden(), \
+                                          [(configuration_attribute_ids.get(input_configuration_attribute), is_internal) for input_configuration_attribute, is_internal in configuration_attribute.get_input_configuration_attributes().items()]))
+                                          
+    return configuration_description, configuration_attribute_ids
+    
+def get_configuration_hash(model):
+    """
+    Returns a hash of the configurations, which changes with any change to the metamodel that affects calculated values
+    """
+    return hashlib.sha256(repr(get_configuration_description(model)[0]).encode()).hexdigest()
+    
+def get_model_hashes(model):
+    """
+    Returns a tuple with two hashes of what scripts can read from the model
+    The first covers the configurations, the class instances, their connections, the entered values and the settings used when calculating
+    The second also covers the changes made by scripts, meaning the override values and markers
+    """
+    model_description, configuration_attribute_ids = get_configuration_description(model)
+    
+    # Class instances in each setup view, where linked copies share the same setup class
+    setup_class_ids = {}
+    entered_values = {} # Key: Setup attribute, Value: Value in its entry field, which might not have been calculated yet but is used when calculating
+    
+    for setup_view in model.get_setup_views():
+        for setup_class_gui in setup_view.get_setup_classes_gui():
+            setup_class_ids.setdefault(setup_class_gui.get_setup_class(), len(setup_class_ids))
+            
+            for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
+                if setup_attribute_gui.has_manually_entered_value():
+                    entered_values[setup_attribute_gui.get_setup_attribute()] = setup_attribute_gui.get_entered_value()
+                    
+    for setup_view in model.get_setup_views():
+        model_description.append((setup_view.get_name(), setup_view.is_excluded()))
+        
+        # Setup views that have not been restored yet are described by the save they were read from, as their blocks have not been created
+        if not setup_view.is_restored():
+            model_description.append(setup_view.get_last_save())
+            
+        for setup_class_gui in setup_view.get_setup_classes_gui():
+            model_description.append((setup_class_ids[setup_class_gui.get_setup_class()], setup_class_gui.get_configuration_name(), setup_class_gui.get_name()))
+            
+    # Connections and entered values, where calculated values are left out as they follow from the rest
+    for setup_class, setup_class_id in setup_class_ids.items():
+        model_description.append((setup_class_id, [(setup_class_ids.get(input_setup_class), input_scalars) for input_setup_class, input_scalars in setup_class.get_input_setup_classes().items()]))
+        
+        for setup_attribute in setup_class.get_setup_attributes():
+            model_description.append((configuration_attribute_ids.get(setup_attribute.get_configuration_attribute()), \
+                                      None if setup_attribute.is_calculated() else (setup_attribute.get_value(), entered_values.get(setup_attribute))))
+                                      
+    model_description.append((model.get_current_view().get_name(), settings.get_num_samples(), settings.calculates_current_view_only()))
+    model_hash = hashlib.sha256(repr(model_description).encode()).hexdigest()
+    
+    # Changes made by scripts
+    for setup_class in setup_class_ids:
+        model_description.append([setup_attribute.get_override_value() for setup_attribute in setup_class.get_setup_attributes()])
+        
+    for setup_view in model.get_setup_views():
+        for setup_class_gui in setup_view.get_setup_classes_gui():
+            model_description.append([(script_marker_indicator.get_text(), script_marker_indicator.get_color()) for script_marker_indicator in setup_class_gui.get_script_marker_indicators()])
+            
+    return model_hash, hashlib.sha256(repr(model_description).encode()).hexdigest()
+    
+class ScriptResult:
+    """
+    Changes made by a script and the text it printed, which can be shown again without running the script
+    """
+    def __init__(self, model, output):
+        self.__override_values = [] # Tuples (index of setup attribute, override value)
+        self.__script_markers = [] # Tuples (index of GUI setup class, text, color)
+        self.__output = output
+        
+        for i, setup_attribute in enumerate(ScriptResult.get_setup_attributes(model)):
+            if setup_attribute.has_override_value():
+                self.__override_values.append((i, setup_attribute.get_override_value()))
+                
+        for i, setup_class_gui in enumerate(ScriptResult.get_setup_classes_gui(model)):
+            for script_marker_indicator in setup_class_gui.get_script_marker_indicators():
+                self.__script_markers.append((i, script_marker_indicator.get_text(), script_marker_indicator.get_color()))
+                
+        self.__model_hashes = get_model_hashes(model) # Hashes of the model after the script finished
+        
+    @staticmethod
+    def get_setup_attributes(model):
+        """
+        Returns all setup attributes in the order used to refer to them, where linked copies are included once
+        """
+        setup_attributes = {}
+        
+        for setup_class_gui in ScriptResult.get_setup_classes_gui(model):
+            for setup_attribute in setup_class_gui.get_setup_class().get_setup_attributes():
+                setup_attributes[setup_attribute] = None
+                
+        return list(setup_attributes.keys())
+        
+    @staticmethod
+    def get_setup_classes_gui(model):
+        return [setup_class_gui for setup_view in model.get_setup_views() for setup_class_gui in setup_view.get_setup_classes_gui()]
+        
+    def get_output(self):
+        return self.__output
+        
+    def replay(self, model):
+        """
+        Makes the same changes as the script did and prints the same text, where the changes are only made if the model differs from when the script finished
+        """
+        if get_model_hashes(model)[1] != self.__model_hashes[1]:
+            with model.defer_display():
+                model.reset_script_changes(calculate_values=False)
+                setup_attributes = ScriptResult.get_setup_attributes(model)
+                setup_classes_gui = ScriptResult.get_setup_classes_gui(model)
+                
+                for i, override_value in self.__override_values:
+                    setup_attributes[i].set_override_value(override_value)
+                    
+                for i, text, color in self.__script_markers:
+                    setup_classes_gui[i].create_script_marker_indicator(text, color, False)
+                    
+                model.calculate_values()
+                
+        print(self.__output, end="")
+        
+class ScriptResultCache:
+    """
+    Results of previous runs of scripts, found by the hash of the source of the script and the hash of the model when it was run
+    """
+    def __init__(self, size=SCRIPT_RESULT_CACHE_SIZE):
+        self.__size = size
+        self.__script_results = OrderedDict() # Key: Tuple (script hash, model hash), Value: Script result, ordered from least to most recently used
+        
+    def get_script_result(self, script_hash, model_hashes):
+        """
+        Returns the result of a previous run of the script on the same model, or None if there is no such run
+        A result stored for a script that reset the changes by previous scripts before reading anything is found regardless of those changes
+        """
+        for model_hash in model_hashes:
+            key = (script_hash, model_hash)
+            
+            if key in self.__script_results:
+                self.__script_results.move_to_end(key)
+                return self.__script_results[key]
+                
+        return None
+        
+    def add_script_result(self, script_hash, model_hashes, resets_script_changes_first, script_result):
+        """
+        model_hashes: Hashes of the model before the script was run, see get_model_hashes
+        resets_script_changes_first: Whether the script reset the changes by previous scripts before reading anything, where the result does not depend on those changes
+        """
+        key = (script_hash, model_hashes[0] if resets_script_changes_first else model_hashes[1])
+        self.__script_results[key] = script_result
+        self.__script_results.move_to_end(key)
+        
+        while len(self.__script_results) > self.__size:
+            self.__script_results.popitem(last=False)
+            
+    def clear(self):
+        self.__script_results.clear()
+        
+    def __len__(self):
+        return len(self.__script_results)
+        
+class ScriptOutput:
+    """
+    Records the text printed by a script while still printing it, only considering text printed from the thread running the script
+    """
+    def __init__(self, thread=None):
+        self.__thread = thread # None considering the thread creating the recorder
+        self.__stream = None
+        self.__is_recording = False
+        self.__texts = []
+        
+        if self.__thread == None:
+            self.__thread = threading.current_thread()
+            
+    def set_thread(self, thread):
+        self.__thread = thread
+        
+    def start(self):
+        self.__stream = sys.stdout
+        self.__is_recording = True
+        sys.stdout = self
+        
+    def stop(self):
+        """
+        Stops recording, where printed text is only passed on if another recorder has been started since this one
+        """
+        self.__is_recording = False
+        
+        if sys.stdout is self:
+            sys.stdout = self.__stream
+            
+    def write(self, text):
+        if self.__is_recording and threading.current_thread() is self.__thread:
+            self.__texts.append(text)
+            
+        return self.__stream.write(text)
+        
+    def flush(self):
+        self.__stream.flush()
+        
+    def get_text(self):
+        return "".join(self.__texts)
+        
+class FirstCallRecorder:
+    """
+    Script interface that passes all calls on to another script interface, recording which method the script called first and whether it wrote files
+    """
+    def __init__(self, script_interface):
+        self.__script_interface = script_interface
+        self.__first_call_name = None
+        self.__writes_files = False
+        
+    def resets_script_changes_first(self):
+        return self.__first_call_name == "reset_script_changes"
+        
+    def writes_files(self):
+        """
+        Returns whether the script called any method writing files, where its result is not cached as the files would not be written again
+        """
+        return self.__writes_files
+        
+    def __getattr__(self, name):
+        attribute = getattr(self.__script_interface, name)
+        
+        if callable(attribute) and (self.__first_call_name == None or name in FILE_WRITING_METHOD_NAMES):
+            def recorded_method(*args, **kwargs):
+                if self.__first_call_name == None:
+                    self.__first_call_name = name
+                    
+                if name in FILE_WRITING_METHOD_NAMES:
+                    self.__writes_files = True
+                    
+                return attribute(*args, **kwargs)
+                
+            return recorded_method
+            
+        return attribute
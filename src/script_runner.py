@@ -0,0 +1,521 @@
+import os
+import threading
+import queue
+import traceback
+import multiprocessing
+from contextlib import nullcontext
+from script_profiler import ScriptProfiler
+from helper_functions_general import measure
+from script_subprocess import SharedValueStore, run_script_process
+from script_result_cache import ScriptResult, ScriptOutput, FirstCallRecorder, get_script_hash, get_model_hashes
+from script_async import AsyncScriptInterface, TkScheduler, is_async_script_control, run_script_control
+from config import *
+
+class ScriptCancelled(Exception):
+    """
+    Raised within a script running in the background when it has been cancelled
+    """
+    pass
+    
+class ScriptRunner:
+    """
+    Runs a script in a separate thread or process so that the program can be used while the script is running, where the changes made by the script are shown when it finishes
+    """
+    def __init__(self, model, script_interface, script_name):
+        self.__model = model
+        self.__script_interface = script_interface
+        self.__script_name = script_name
+        self.__button = None # Button that runs the script, which shows the progress and cancels the script when pressed while running
+        
+        self.__thread = None
+        self.__process = None
+        self.__scheduler = None # Runs async scripts in the event loop of the GUI
+        self.__shared_value_store = None # Values shared with the process running the script
+        self.__is_cancelled = False
+        self.__script_profiler = None # Profiler of the current run, None if not profiled
+        self.__script_hash = None # Hash of the script of the current run, None if its result is not cached
+        self.__model_hashes = None # Hashes of the model when the current run started
+        self.__script_output = None # Text printed by the current run
+        self.__first_call_recorder = None
+        self.__subprocess_result = None # Tuple (printed text, whether the script first reset changes by previous scripts) sent by the process running the script
+        self.__messages = queue.Queue() # Messages from the thread or process running the script, handled in the thread of the GUI
+        
+    def set_button(self, button):
+        self.__button = button
+        
+    def get_thread(self):
+        return self.__thread
+        
+    def get_process(self):
+        return self.__process
+        
+    def get_scheduler(self):
+        return self.__scheduler
+        
+    def is_running(self):
+        return self.__thread != None or self.__process != None or self.__scheduler != None
+        
+    def press(self, script_control=None):
+        """
+        Runs the script, or cancels it if it is already running
+        
+        script_control: Script control function to run, None using that of the script with the name of this runner
+        """
+        if self.is_running():
+            self.cancel()
+            return
+            
+        self.__script_hash = None
+        
+        # Scripts run from their file are cached by the source of the script
+        if script_control == None and settings.caches_script_results():
+            if self.replay_cached_script_result():
+                return
+                
+        # Scripts running in a separate process are imported there instead
+        if settings.runs_scripts_in_subprocess():
+            self.run_in_subprocess(self.__model.get_script_registry().get_file_path(self.__script_name))
+            return
+            
+        if script_control == None:
+            script_control = self.__model.get_script_registry().get_script_control(self.__script_name)
+            
+        if settings.runs_scripts_in_background():
+            self.run_in_background(script_control)
+            
+        elif is_async_script_control(script_control):
+            self.run_cooperatively(script_control)
+            
+        else:
+            self.start_profiler()
+            self.start_recording()
+            
+            try:
+                self.__script_interface.run(self.get_profiled_script_control(self.get_recorded_script_control(script_control)))
+                self.add_script_result()
+            finally:
+                self.stop_recording()
+                self.stop_profiler()
+                
+    def replay_cached_script_result(self):
+        """
+        Shows the result of a previous run if neither the script nor the model has changed since, otherwise prepares for caching the result of this run
+        Returns whether a previous result was shown
+        """
+        script_hash = get_script_hash(self.__model.get_script_registry().get_file_path(self.__script_name))
+        model_hashes = get_model_hashes(self.__model)
+        script_result = self.__model.get_script_result_cache().get_script_result(script_hash, model_hashes)
+        
+        if script_result != None:
+            print(f"Showing the result of the previous run of the script {self.__script_name}, as neither the script nor the model has changed")
+            script_result.replay(self.__model)
+            return True
+            
+        self.__script_hash = script_hash
+        self.__model_hashes = model_hashes
+        return False
+        
+    def start_recording(self, thread=None):
+        """
+        Starts recording what the script prints if its result is cached
+        
+        thread: Thread running the script, None if run in the current thread
+        """
+        self.__script_output = None
+        self.__first_call_recorder = None
+        self.__subprocess_result = None
+        
+        if self.__script_hash != None:
+            self.__script_output = ScriptOutput(thread)
+            self.__script_output.start()
+            
+    def stop_recording(self):
+        if self.__script_output != None:
+            self.__script_output.stop()
+            
+        self.__script_hash = None
+        
+    def get_recorded_script_control(self, script_control):
+        """
+        Returns the script control function, which records whether the script first resets changes by previous scripts if its result is cached
+        """
+        if self.__script_hash == None:
+            return script_control
+            
+        def recorded_script_control(script_interface):
+            self.__first_call_recorder = FirstCallRecorder(script_interface)
+            script_control(self.__first_call_recorder)
+            
+        async def recorded_async_script_control(script_interface):
+            self.__first_call_recorder = FirstCallRecorder(script_interface)
+            await script_control(self.__first_call_recorder)
+            
+        if is_async_script_control(script_control):
+            return recorded_async_script_control
+            
+        return recorded_script_control
+        
+    def add_script_result(self):
+        """
+        Stores the changes made by the finished script and the text it printed, to be shown again instead of running the script on the same model
+        """
+        if self.__script_hash == None:
+            return
+            
+        if self.__subprocess_result != None:
+            output, resets_script_changes_first, writes_files = self.__subprocess_result
+        elif self.__script_output != None and self.__first_call_recorder != None:
+            output = self.__script_output.get_text()
+            resets_script_changes_first = self.__first_call_recorder.resets_script_changes_first()
+            writes_files = self.__first_call_recorder.writes_files()
+        else:
+            return
+            
+        # Files written by the script would not be written again when showing the result, such as if they were deleted since
+        if writes_files:
+            return
+            
+        self.__model.get_script_result_cache().add_script_result(self.__script_hash, self.__model_hashes, resets_script_changes_first, ScriptResult(self.__model, output))
+        
+    def start_profiler(self):
+        """
+        Starts profiling the run if specified in the settings
+        """
+        self.__script_profiler = None
+        
+        if settings.profiles_scripts():
+            self.__script_profiler = ScriptProfiler(self.__script_name)
+            self.__script_profiler.start()
+            
+    def stop_profiler(self):
+        """
+        Prints the report of the profiled run and saves it as JSON in the directory for script profiles
+        """
+        if self.__script_profiler != None:
+            self.__script_profiler.stop()
+            self.__script_profiler.print_report()
+            self.__script_profiler.save_report(os.path.join(SCRIPT_PROFILES_PATH, f"{self.__script_name}.json"))
+            self.__script_profiler = None
+            
+    def get_script_profiler(self):
+        return self.__script_profiler
+        
+    def get_profiled_script_control(self, script_control):
+        """
+        Returns the script control function, which records the time spent in it and in each call to the script interface if the run is profiled
+        """
+        if self.__script_profiler == None:
+            return script_control
+            
+        return self.__script_profiler.wrap(script_control)
+        
+    def run_in_background(self, script_control):
+        """
+        Starts running the script in a separate thread against a snapshot of the current values
+        """
+        self.__is_cancelled = False
+        self.start_profiler()
+        background_script_interface = BackgroundScriptInterface(self.__script_interface, self)
+        
+        self.__thread = threading.Thread(target=self.run_script, args=(self.get_profiled_script_control(self.get_recorded_script_control(script_control)), background_script_interface), daemon=True)
+        self.start_recording(self.__thread)
+        self.__thread.start()
+        
+        self.show_progress(0)
+        self.__model.get_root().after(SCRIPT_PROGRESS_INTERVAL, self.handle_messages)
+        
+    def run_cooperatively(self, script_control):
+        """
+        Starts running an async script in the event loop of the GUI, where the program responds each time the script awaits the script interface
+        Changes are shown as they are made, as the script uses the shown values
+        """
+        self.__is_cancelled = False
+        self.start_profiler()
+        self.start_recording()
+        
+        script_control = self.get_profiled_script_control(self.get_recorded_script_control(script_control))
+        
+        self.__scheduler = TkScheduler(self.__model.get_root(), self.__model.defer_display)
+        self.__scheduler.start(script_control(AsyncScriptInterface(self.__script_interface, self.show_progress)), self.finish_cooperatively)
+        
+        self.show_progress(0)
+        
+    def finish_cooperatively(self, message):
+        self.__script_interface.display_changed_values()
+        self.finish(message, None)
+        
+    def run_in_subprocess(self, script_file_path):
+        """
+        Starts running the script in a separate process, which reads the current values from shared memory and can not access the rest of the program
+        """
+        self.__is_cancelled = False
+        self.__subprocess_result = None
+        self.__shared_value_store = SharedValueStore(self.__model)
+        
+        # A new process is started rather than a copy of this one, as copying the process of the GUI is not safe
+        context = multiprocessing.get_context("spawn")
+        self.__messages = context.Queue()
+        
+        self.__process = context.Process(target=run_script_process, args=(script_file_path, self.__script_name, self.__shared_value_store.get_index(), self.__messages), daemon=True)
+        self.__process.start()
+        
+        self.show_progress(0)
+        self.__model.get_root().after(SCRIPT_PROGRESS_INTERVAL, self.handle_messages)
+        
+    def run_script(self, script_control, background_script_interface):
+        """
+        Runs the script, which is done in a separate thread
+        """
+        try:
+            run_script_control(script_control, background_script_interface)
+            self.__messages.put(("finished", background_script_interface))
+        except ScriptCancelled:
+            self.__messages.put(("cancelled", None))
+        except Exception:
+            traceback.print_exc()
+            self.__messages.put(("failed", None))
+            
+    def handle_messages(self):
+        """
+        Handles the messages sent from the thread or process running the script, which is done in the thread of the GUI
+        """
+        # Checked before handling the messages, as a process that has stopped has sent all its messages
+        has_process_stopped = self.__process != None and not self.__process.is_alive()
+        
+        while True:
+            try:
+                message, content = self.__messages.get_nowait()
+            except queue.Empty:
+                break
+                
+            if message == "progress":
+                self.show_progress(*content)
+            elif message == "recorded":
+                self.__subprocess_result = content
+            else:
+                self.finish(message, content)
+                return
+                
+        # A process that stopped without sending a message was either cancelled or crashed
+        if has_process_stopped:
+            if self.__is_cancelled:
+                self.finish("cancelled", None)
+            else:
+                print(f"Error: The process running the script {self.__script_name} stopped unexpectedly with exit code {self.__process.exitcode}")
+                self.finish("failed", None)
+                
+        # Check for new messages later while the script is running
+        elif self.is_running():
+            self.__model.get_root().after(SCRIPT_PROGRESS_INTERVAL, self.handle_messages)
+            
+    def finish(self, message, content):
+        """
+        Shows the changes made by the script if it finished, and shows that the script is no longer running
+        """
+        if message == "finished":
+            if self.__shared_value_store != None:
+                self.__shared_value_store.apply_changes(content, self.__model, self.__script_interface)
+            elif content != None:
+                content.apply_changes()
+                
+            self.add_script_result()
+            
+        elif message == "cancelled" and self.__scheduler != None:
+            print(f"Cancelled the script {self.__script_name}, changes made before it was cancelled are kept")
+        elif message == "cancelled":
+            print(f"Cancelled the script {self.__script_name}, no changes were made")
+        else:
+            print(f"Error: The script {self.__script_name} failed, no changes were made")
+            
+        if self.__process != None:
+            self.__process.join()
+            self.__process = None
+            self.__messages = queue.Queue()
+            
+        if self.__shared_value_store != None:
+            self.__shared_value_store.close()
+            self.__shared_value_store = None
+            
+        self.__thread = None
+        self.__scheduler = None
+        self.stop_recording()
+        self.stop_profiler()
+        
+        if self.__button != None:
+            self.__button.set_text(self.__script_name)
+            
+    def report_progress(self, progress, text):
+        """
+        Sends the progress of the script to the thread of the GUI, called from the thread running the script
+        """
+        self.__messages.put(("progress", (progress, text)))
+        
+    def show_progress(self, progress, text=""):
+        if self.__button != None:
+            self.__button.set_text(f"Cancel {round(progress * 100)}% {text}".strip())
+            
+    def cancel(self):
+        """
+        Requests the script to stop, where a script running in a thread stops the next time it interacts with the script interface, a process is stopped directly and an async script running in the event loop of the GUI stops where it awaits
+        """
+        self.__is_cancelled = True
+        
+        if self.__process != None:
+            self.__process.terminate()
+            
+        if self.__scheduler != None:
+            self.__scheduler.cancel()
+            
+    def check_cancelled(self):
+        if self.__is_cancelled:
+            raise ScriptCancelled()
+            
+class BackgroundScriptInterface:
+    """
+    Script interface used by scripts running in the background, where all values are read from and changed in a snapshot
+    Changes are stored and made to the shown views at once when the script has finished
+    """
+    def __init__(self, script_interface, script_runner):
+        self.__script_interface = script_interface # Only used in the thread of the GUI
+        self.__script_runner = script_runner
+        self.__frozen_script_interface = script_interface.create_frozen_copy() # Used in the thread running the script, which only accesses the blocks found when created
+        self.__snapshot = self.__frozen_script_interface.create_snapshot().fork() # Values and override values as changed by the script, forked so that only the changes are applied
+        self.__class_markers = [] # Arguments to set_class_marker of each marker added by the script
+        self.__resets_script_changes = False # Whether to reset changes made by previous scripts before showing the changes
+        
+    def get_snapshot(self):
+        return self.__snapshot
+        
+    @measure("GUI redraw: BackgroundScriptInterface.apply_changes")
+    def apply_changes(self):
+        """
+        Shows all changes made by the script, which is done in the thread of the GUI
+        Only the override values set or reset by the script are applied before calculating the values, keeping values entered or calculated while the script was running
+        """
+        with self.__script_interface.batch_update():
+            if self.__resets_script_changes:
+                self.__script_interface.reset_script_changes(calculate_values=False)
+                
+            for args, kwargs in self.__class_markers:
+                self.__script_interface.set_class_marker(*args, **kwargs)
+                
+            self.__snapshot.apply_changed_override_values()
+            self.__script_interface.calculate_values()
+            
+    def progress(self, progress, text=""):
+        """
+        progress: Value in [0, 1] of how much of the script has been completed
+        text: Short text shown together with the progress
+        """
+        self.__script_runner.check_cancelled()
+        self.__script_runner.report_progress(min(max(float(progress), 0), 1), str(text))
+        
+    def batch_update(self):
+        """
+        All changes are already shown at once when the script finishes
+        """
+        return nullcontext()
+        
+    def get_current_view_name(self):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_current_view_name()
+        
+    def get_class_type_names(self, view=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_class_type_names(view)
+        
+    def get_class_instance_names(self, class_type, view=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_class_instance_names(class_type, view)
+        
+    def get_attribute_names(self, class_type):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_attribute_names(class_type)
+        
+    def get_input_class_names(self, class_type, class_instance, **kwargs):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_input_class_names(class_type, class_instance, **kwargs)
+        
+    def get_attribute_values(self, class_type, class_instance, attribute, view=None, *, snapshot=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_attribute_values(class_type, class_instance, attribute, view, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def get_attribute_table(self, class_type, view=None, *, snapshot=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.get_attribute_table(class_type, view, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def select(self, selector, *, snapshot=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.select(selector, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def convert_value_to_string(self, attribute_value):
+        return self.__frozen_script_interface.convert_value_to_string(attribute_value)
+        
+    def override_attribute_values(self, override_value, class_type, *, snapshot=None, **kwargs):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.override_attribute_values(override_value, class_type, snapshot=self.get_snapshot_to_use(snapshot), **kwargs)
+        
+    def override_attribute_values_bulk(self, override_values, keys=None, *, view=None, snapshot=None):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.override_attribute_values_bulk(override_values, keys, view=view, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def reset_override_attribute_values(self, *, snapshot=None, **kwargs):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.reset_override_attribute_values(snapshot=self.get_snapshot_to_use(snapshot), **kwargs)
+        
+    def set_class_marker(self, value, color, **kwargs):
+        self.__script_runner.check_cancelled()
+        self.__class_markers.append(((value, color), kwargs))
+        
+    def calculate_values(self, *, snapshot=None):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.calculate_values(snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def calculate_values_in_steps(self, num_setup_attributes_per_step, *, snapshot=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.calculate_values_in_steps(num_setup_attributes_per_step, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def reset_script_changes(self):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.reset_override_attribute_values(snapshot=self.__snapshot)
+        self.__snapshot.calculate_values()
+        
+        self.__class_markers = []
+        self.__resets_script_changes = True
+        
+    def stream_attribute_values(self, view=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.stream_attribute_values(view, snapshot=self.__snapshot)
+        
+    def open_result_store(self, name):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.open_result_store(name)
+        
+    def append_attribute_values(self, result_store, keys, *, view=None, snapshot=None):
+        self.__script_runner.check_cancelled()
+        self.__frozen_script_interface.append_attribute_values(result_store, keys, view=view, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def export_attribute_values(self, file_path, class_types=None, attributes=None, *, view=None, snapshot=None):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.export_attribute_values(file_path, class_types, attributes, view=view, snapshot=self.get_snapshot_to_use(snapshot))
+        
+    def create_snapshot(self):
+        self.__script_runner.check_cancelled()
+        return self.__snapshot.fork()
+        
+    def fork_snapshot(self, snapshot):
+        self.__script_runner.check_cancelled()
+        return self.__frozen_script_interface.fork_snapshot(snapshot)
+        
+    def apply_snapshot(self, snapshot):
+        """
+        Continues from the values of the specified snapshot, which are shown when the script finishes
+        """
+        self.__script_runner.check_cancelled()
+        self.__snapshot = self.__frozen_script_interface.fork_snapshot(snapshot)
+        
+    def get_snapshot_to_use(self, snapshot):
+        if snapshot == None:
+            return self.__snapshot
+            
+        return snapshot
@@ -0,0 +1,135 @@
+import re
+import operator
+import numpy as np
+from helper_functions_general import convert_value_to_string
+from config import *
+
+class Selector:
+    """
+    Compiled selector for finding setup attributes, written as conditions separated by spaces
+    
+    Each condition is written as field, operator and value, for example: view^="Attack tree" class="Attack event" attribute="Global difficulty" value<3
+    Fields: view, class, instance, attribute (names) and value (attribute value)
+    Operators for names: = (equal), != (not equal), ^= (starts with), $= (ends with), *= (contains)
+    Operators for values: =, !=, <, <=, >, >=, where numbers are compared against all numbers in the value and text against the shown text
+    Values containing spaces are written within quotes
+    """
+    NAME_FIELDS = ("view", "class", "instance", "attribute")
+    
+    NAME_OPERATORS = {"=": operator.eq, \
+                      "!=": operator.ne, \
+                      "^=": lambda name, text: name.startswith(text), \
+                      "$=": lambda name, text: name.endswith(text), \
+                      "*=": lambda name, text: text in name}
+                      
+    VALUE_OPERATORS = {"=": np.equal, \
+                       "!=": np.not_equal, \
+                       "<": np.less, \
+                       "<=": np.less_equal, \
+                       ">": np.greater, \
+                       ">=": np.greater_equal}
+                       
+    PATTERN_CONDITION = re.compile(r"\s*(\w+)\s*(\^=|\$=|\*=|!=|<=|>=|=|<|>)\s*(\"[^\"]*\"|'[^']*'|[^\s\"']+)")
+    
+    def __init__(self, text):
+        self.__text = text
+        self.__name_conditions = {field: [] for field in Selector.NAME_FIELDS} # Key: Field, Value: List of tuples (operator symbol, text)
+        self.__value_conditions = [] # List of tuples (operator symbol, number or text)
+        
+        position = 0
+        
+        while position < len(text.rstrip()):
+            match = Selector.PATTERN_CONDITION.match(text, position)
+            
+            if match == None:
+                raise ValueError(f"Could not read the selector {text} at \"{text[position:].strip()}\"")
+                
+            field, symbol, literal = match.groups()
+            position = match.end()
+            is_quoted = literal[0] in ("\"", "'")
+            
+            if is_quoted:
+                literal = literal[1:-1]
+                
+            if field in Selector.NAME_FIELDS:
+                if not symbol in Selector.NAME_OPERATORS:
+                    raise ValueError(f"The operator {symbol} can not be used for {field} in the selector {text}, expected one of {tuple(Selector.NAME_OPERATORS.keys())}")
+                    
+                self.__name_conditions[field].append((symbol, literal))
+                
+            elif field == "value":
+                if not symbol in Selector.VALUE_OPERATORS:
+                    raise ValueError(f"The operator {symbol} can not be used for value in the selector {text}, expected one of {tuple(Selector.VALUE_OPERATORS.keys())}")
+                    
+                # Unquoted numbers are compared as numbers, all other values as text
+                if not is_quoted:
+                    try:
+                        literal = float(literal)
+                    except ValueError:
+                        pass
+                        
+                if isinstance(literal, str) and not symbol in ("=", "!="):
+                    raise ValueError(f"The operator {symbol} requires a number in the selector {text}")
+                    
+                self.__value_conditions.append((symbol, literal))
+                
+            else:
+                raise ValueError(f"Unknown field {field} in the selector {text}, expected one of {Selector.NAME_FIELDS + ('value',)}")
+                
+    def get_text(self):
+        return self.__text
+        
+    def get_exact_name(self, field):
+        """
+        Returns the name that the field has to be equal to, used for looking up matches directly, or None if there is no such condition
+        """
+        for symbol, text in self.__name_conditions[field]:
+            if symbol == "=":
+                return text
+                
+        return None
+        
+    def matches_name(self, field, name):
+        for symbol, text in self.__name_conditions[field]:
+            if not Selector.NAME_OPERATORS[symbol](name, text):
+                return False
+                
+        return True
+        
+    def has_value_conditions(self):
+        return len(self.__value_conditions) > 0
+        
+    def match_values(self, values):
+        """
+        Returns a boolean array which is True for each of the values (tuples) fulfilling all value conditions
+        """
+        matches = np.ones(len(values), dtype=bool)
+        
+        if not self.has_value_conditions():
+            return matches
+            
+        # Group the numeric values by their number of elements so that each group can be compared at once
+        indices_per_length = {}
+        
+        for i, value in enumerate(values):
+            if value != None and len(value) > 0 and all(isinstance(element, float) for element in value):
+                indices_per_length.setdefault(len(value), []).append(i)
+                
+        numeric_indices = np.array([i for indices in indices_per_length.values() for i in indices], dtype=int)
+        is_numeric = np.zeros(len(values), dtype=bool)
+        is_numeric[numeric_indices] = True
+        
+        for symbol, literal in self.__value_conditions:
+            if isinstance(literal, str):
+                texts = np.array([convert_value_to_string(value) if value != None else "" for value in values], dtype=object)
+                matches &= Selector.VALUE_OPERATORS[symbol](texts, literal).astype(bool)
+                continue
+                
+            # Values that are not numbers, such as text or errors, never match numeric conditions
+            matches &= is_numeric
+            
+            for length, indices in indices_per_length.items():
+                numbers = np.array([values[i] for i in indices], dtype=float).reshape(len(indices), length)
+                matches[indices] &= Selector.VALUE_OPERATORS[symbol](numbers, literal).all(axis=1)
+                
+        return matches
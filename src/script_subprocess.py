@@ -0,0 +1,534 @@
+import traceback
+import importlib.util
+import numpy as np
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+from helper_functions_general import convert_value_to_string, convert_string_to_value
+from general_calculations import combine_values
+from calculation_graph import CalculationGraph
+from script_selector import Selector
+from script_result_cache import ScriptOutput, FirstCallRecorder
+from script_async import run_script_control
+from result_store import ResultStore
+from attribute_export import export_attribute_values
+from config import *
+
+class SharedValueStore:
+    """
+    Current attribute values of all setup views that are not excluded, shared with a script running in a separate process
+    Numbers are placed in shared memory, where an index describes where the value of each setup attribute is found and how values are calculated
+    """
+    def __init__(self, model):
+        model.restore_deferred_setup_views() # The values of all setup views are shared, which are only found in their blocks
+        setup_views = [setup_view for setup_view in model.get_setup_views() if not setup_view.is_excluded()]
+        setup_classes = []
+        
+        for setup_view in setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                if not setup_class_gui.get_setup_class() in setup_classes:
+                    setup_classes.append(setup_class_gui.get_setup_class())
+                    
+        calculation_graph = CalculationGraph(setup_classes)
+        
+        # Each setup attribute is given a row, ordered so that inputs come before the setup attributes taking them as input
+        self.__setup_attributes = calculation_graph.get_topological_order() + calculation_graph.get_external_setup_attributes()
+        row_per_setup_attribute = {setup_attribute: row for row, setup_attribute in enumerate(self.__setup_attributes)}
+        
+        offsets = np.zeros(len(self.__setup_attributes), dtype=np.int64)
+        lengths = np.zeros(len(self.__setup_attributes), dtype=np.int64) # Number of numbers in each value, 0 if the value is found among the text values
+        text_values = {} # Key: Row, Value: Value (tuple) that does not consist of numbers
+        override_values = {} # Key: Row, Value: Override value (tuple)
+        calculation_nodes = {} # Key: Row, Value: Tuple describing how the value is calculated, only for calculated setup attributes
+        numbers = []
+        
+        for row, setup_attribute in enumerate(self.__setup_attributes):
+            value = setup_attribute.get_value()
+            
+            if value != None and len(value) > 0 and all(isinstance(element, float) for element in value):
+                offsets[row] = len(numbers)
+                lengths[row] = len(value)
+                numbers.extend(value)
+            else:
+                text_values[row] = value
+                
+            if setup_attribute.has_override_value():
+                override_values[row] = setup_attribute.get_override_value()
+                
+            if calculation_graph.has_setup_attribute(setup_attribute) and setup_attribute.is_calculated():
+                input_setup_attributes = calculation_graph.get_input_setup_attributes(setup_attribute)
+                configuration_attribute = setup_attribute.get_configuration_attribute()
+                value_type = configuration_attribute.get_value_type()
+                calculation_type = configuration_attribute.get_calculation_type()
+                
+                calculation_nodes[row] = (value_type.correctly_connected(calculation_type, list(configuration_attribute.get_input_configuration_attributes().keys())), \
+                                          value_type, \
+                                          calculation_type, \
+                                          [row_per_setup_attribute[input_setup_attribute] for input_setup_attribute in input_setup_attributes], \
+                                          [input_setup_attribute.get_value_type() for input_setup_attribute in input_setup_attributes], \
+                                          list(input_setup_attributes.values()), \
+                                          configuration_attribute.get_input_scalar(), \
+                                          configuration_attribute.get_input_offset())
+                                          
+        self.__shared_memory = shared_memory.SharedMemory(create=True, size=max(1, len(numbers)) * np.dtype(np.float64).itemsize)
+        np.ndarray((len(numbers),), dtype=np.float64, buffer=self.__shared_memory.buf)[:] = numbers
+        
+        # Names of the classes and attributes in each setup view, where linked copies are included in each view they are in
+        classes = [] # Tuples (class_type, class_instance, rows of the attributes, input class names)
+        class_id_per_setup_class = {}
+        class_views = [] # Tuples (view, class ID)
+        
+        for setup_view in setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                setup_class = setup_class_gui.get_setup_class()
+                
+                if not setup_class in class_id_per_setup_class:
+                    class_id_per_setup_class[setup_class] = len(classes)
+                    classes.append((setup_class_gui.get_configuration_name(), \
+                                    setup_class_gui.get_name(), \
+                                    [row_per_setup_attribute[setup_attribute_gui.get_setup_attribute()] for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui()], \
+                                    [(input_setup_class.get_configuration_name(), input_setup_class.get_instance_name()) for input_setup_class in setup_class.get_input_setup_classes()]))
+                                    
+                class_views.append((setup_view.get_name(), class_id_per_setup_class[setup_class]))
+                
+        self.__index = {"shared_memory_name": self.__shared_memory.name, \
+                        "number_of_numbers": len(numbers), \
+                        "offsets": offsets, \
+                        "lengths": lengths, \
+                        "text_values": text_values, \
+                        "override_values": override_values, \
+                        "calculation_nodes": calculation_nodes, \
+                        "attribute_names": [setup_attribute.get_name() for setup_attribute in self.__setup_attributes], \
+                        "component_names": [setup_attribute.get_value_type().component_names() for setup_attribute in self.__setup_attributes], \
+                        "classes": classes, \
+                        "class_views": class_views, \
+                        "current_view_name": model.get_current_view().get_name(), \
+                        "num_samples": settings.get_num_samples()}
+                        
+    def get_index(self):
+        return self.__index
+        
+    def get_setup_attribute(self, row):
+        return self.__setup_attributes[row]
+        
+    def close(self):
+        """
+        Releases the shared memory, after which the values can no longer be read by the script
+        """
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
+        
+    def apply_changes(self, changes, model, script_interface):
+        """
+        Makes the changes sent back by the script, which is done in the thread of the GUI
+        
+        changes: List of tuples, where the first element is the type of change, see SubprocessScriptInterface
+        """
+        with model.defer_display():
+            calculates_values = False
+            
+            for change in changes:
+                if change[0] == "reset_script_changes":
+                    model.reset_script_changes(calculate_values=False)
+                    
+                elif change[0] == "override":
+                    self.__setup_attributes[change[1]].set_override_value(change[2])
+                    
+                elif change[0] == "reset_override":
+                    self.__setup_attributes[change[1]].reset_override_value()
+                    
+                elif change[0] == "marker":
+                    value, color, class_type, class_instance, view = change[1:]
+                    script_interface.set_class_marker(value, color, class_type=class_type, class_instance=class_instance, view=view)
+                    
+                elif change[0] == "calculate":
+                    calculates_values = True
+                    
+            if calculates_values:
+                model.calculate_values()
+            else:
+                model.display_values()
+                
+def run_script_process(script_file_path, script_name, index, messages):
+    """
+    Runs a script in a separate process, where the changes made by the script and the text it printed are sent back through the messages queue when it finishes
+    """
+    try:
+        spec = importlib.util.spec_from_file_location(script_name, script_file_path)
+        script_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(script_module)
+        
+        script_interface = SubprocessScriptInterface(index, messages)
+        first_call_recorder = FirstCallRecorder(script_interface)
+        script_output = ScriptOutput()
+        script_output.start()
+        
+        try:
+            run_script_control(script_module.script_control, first_call_recorder)
+        finally:
+            script_output.stop()
+            script_interface.close()
+            
+        # What the script printed, whether it reset changes by previous scripts first and whether it wrote files, used if the program caches the result
+        messages.put(("recorded", (script_output.get_text(), first_call_recorder.resets_script_changes_first(), first_call_recorder.writes_files())))
+        messages.put(("finished", script_interface.get_changes()))
+    except Exception:
+        traceback.print_exc()
+        messages.put(("failed", None))
+        
+class SubprocessScriptInterface:
+    """
+    Script interface used by scripts running in a separate process, where values are read from shared memory and changes are sent back when the script finishes
+    Values calculated by the script are only kept within the process, where the values are calculated again in the program if the script calculates values
+    """
+    def __init__(self, index, messages):
+        self.__index = index
+        self.__messages = messages
+        
+        self.__shared_memory = shared_memory.SharedMemory(name=index["shared_memory_name"])
+        
+        self.__numbers = np.ndarray((index["number_of_numbers"],), dtype=np.float64, buffer=self.__shared_memory.buf)
+        
+        self.__override_values = dict(index["override_values"]) # Key: Row, Value: Override value (tuple)
+        self.__calculated_values = {} # Key: Row, Value: Value (tuple) calculated by the script
+        self.__changed_rows = set() # Rows with override values changed since values were last calculated
+        self.__changes = [] # Changes to send back when the script finishes
+        
+        # Lookup tables similar to those of ScriptHelper, where None in a key matches all
+        self.__rows = {} # Key: (view, class_type, class_instance, attribute), Value: List of rows
+        self.__class_ids = {} # Key: (view, class_type, class_instance), Value: List of class IDs
+        self.__dependent_rows = {} # Key: Row, Value: List of calculated rows taking it as input
+        self.__class_id_per_row = {} # Key: Row, Value: ID of the class the setup attribute belongs to
+        self.__view_names_per_class_id = {} # Key: Class ID, Value: List of names of the setup views the class is in
+        seen_class_ids = {}
+        
+        for class_id, (class_type, class_instance, rows, input_class_names) in enumerate(index["classes"]):
+            for row in rows:
+                self.__class_id_per_row[row] = class_id
+                
+        for view_name, class_id in index["class_views"]:
+            self.__view_names_per_class_id.setdefault(class_id, []).append(view_name)
+            
+        for view_name, class_id in index["class_views"]:
+            class_type, class_instance, rows, input_class_names = index["classes"][class_id]
+            
+            for view in (None, view_name):
+                for current_class_type in (None, class_type):
+                    if class_id in seen_class_ids.setdefault((view, current_class_type), set()):
+                        continue
+                        
+                    seen_class_ids[(view, current_class_type)].add(class_id)
+                    
+                    for current_class_instance in (None, class_instance):
+                        self.__class_ids.setdefault((view, current_class_type, current_class_instance), []).append(class_id)
+                        
+                        for row in rows:
+                            for attribute in (None, index["attribute_names"][row]):
+                                self.__rows.setdefault((view, current_class_type, current_class_instance, attribute), []).append(row)
+                                
+        for row, calculation_node in index["calculation_nodes"].items():
+            for input_row in calculation_node[3]:
+                self.__dependent_rows.setdefault(input_row, []).append(row)
+                
+    def close(self):
+        self.__numbers = None
+        self.__shared_memory.close()
+        
+    def get_changes(self):
+        return self.__changes
+        
+    def get_value(self, row):
+        if row in self.__calculated_values:
+            return self.__calculated_values[row]
+            
+        length = self.__index["lengths"][row]
+        
+        if length == 0:
+            return self.__index["text_values"][row]
+            
+        offset = self.__index["offsets"][row]
+        return tuple(float(number) for number in self.__numbers[offset:offset+length])
+        
+    def get_current_value(self, row):
+        if self.__override_values.get(row) != None:
+            return self.__override_values[row]
+            
+        return self.get_value(row)
+        
+    def get_view_names(self):
+        view_names = []
+        
+        for view_name, class_id in self.__index["class_views"]:
+            if not view_name in view_names:
+                view_names.append(view_name)
+                
+        return view_names
+        
+    def get_matching_rows(self, view, class_type, class_instance, attribute):
+        return self.__rows.get((view, class_type, class_instance, attribute), [])
+        
+    def get_matching_class_ids(self, view, class_type, class_instance):
+        return self.__class_ids.get((view, class_type, class_instance), [])
+        
+    def progress(self, progress, text=""):
+        self.__messages.put(("progress", (min(max(float(progress), 0), 1), str(text))))
+        
+    def batch_update(self):
+        return nullcontext()
+        
+    def get_current_view_name(self):
+        return self.__index["current_view_name"]
+        
+    def get_class_type_names(self, view=None):
+        return list(set(self.__index["classes"][class_id][0] for class_id in self.get_matching_class_ids(view, None, None)))
+        
+    def get_class_instance_names(self, class_type, view=None):
+        return [self.__index["classes"][class_id][1] for class_id in self.get_matching_class_ids(view, class_type, None)]
+        
+    def get_attribute_names(self, class_type):
+        class_ids = self.get_matching_class_ids(None, class_type, None)
+        
+        if len(class_ids) == 0:
+            return []
+            
+        return [self.__index["attribute_names"][row] for row in self.__index["classes"][class_ids[0]][2]]
+        
+    def get_input_class_names(self, class_type, class_instance, *, input_class_type=None, input_class_instance=None, view=None):
+        input_class_names = []
+        
+        for class_id in self.get_matching_class_ids(view, class_type, class_instance):
+            for current_input_class_type, current_input_class_instance in self.__index["classes"][class_id][3]:
+                if input_class_type in (None, current_input_class_type) and input_class_instance in (None, current_input_class_instance):
+                    if not (current_input_class_type, current_input_class_instance) in input_class_names:
+                        input_class_names.append((current_input_class_type, current_input_class_instance))
+                        
+        return input_class_names
+        
+    def get_attribute_values(self, class_type, class_instance, attribute, view=None, *, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        return [self.get_current_value(row) for row in self.get_matching_rows(view, class_type, class_instance, attribute)]
+        
+    def get_attribute_table(self, class_type, view=None, *, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        class_ids = self.get_matching_class_ids(view, class_type, None)
+        instance_names = [self.__index["classes"][class_id][1] for class_id in class_ids]
+        column_names = []
+        columns = [] # Tuples (attribute index, first column index, number of columns)
+        
+        if len(class_ids) > 0:
+            for i, row in enumerate(self.__index["classes"][class_ids[0]][2]):
+                component_names = self.__index["component_names"][row]
+                
+                if len(component_names) > 0:
+                    columns.append((i, len(column_names), len(component_names)))
+                    
+                for component_name in component_names:
+                    if component_name == "":
+                        column_names.append(self.__index["attribute_names"][row])
+                    else:
+                        column_names.append(f"{self.__index['attribute_names'][row]} ({component_name})")
+                        
+        table = np.full((len(instance_names), len(column_names)), np.nan)
+        error_mask = np.zeros(table.shape, dtype=bool)
+        
+        for table_row, class_id in enumerate(class_ids):
+            rows = self.__index["classes"][class_id][2]
+            
+            for i, first_column, num_columns in columns:
+                value = self.get_current_value(rows[i])
+                
+                if value != None and len(value) == num_columns and all(isinstance(element, float) for element in value):
+                    table[table_row, first_column:first_column+num_columns] = value
+                else:
+                    error_mask[table_row, first_column:first_column+num_columns] = True
+                    
+        return table, instance_names, column_names, error_mask
+        
+    def select(self, selector, *, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        
+        if isinstance(selector, str):
+            selector = Selector(selector)
+            
+        matches = []
+        values = []
+        
+        for view in self.get_view_names():
+            if not selector.matches_name("view", view):
+                continue
+                
+            for row in self.get_matching_rows(view, selector.get_exact_name("class"), selector.get_exact_name("instance"), selector.get_exact_name("attribute")):
+                class_type, class_instance, rows, input_class_names = self.__index["classes"][self.__class_id_per_row[row]]
+                attribute = self.__index["attribute_names"][row]
+                
+                if selector.matches_name("class", class_type) and selector.matches_name("instance", class_instance) and selector.matches_name("attribute", attribute):
+                    matches.append((view, class_type, class_instance, attribute, self.get_current_value(row)))
+                    values.append(self.get_current_value(row))
+                    
+        return [match for match, is_match in zip(matches, selector.match_values(values)) if is_match]
+        
+    def convert_value_to_string(self, attribute_value):
+        return convert_value_to_string(attribute_value)
+        
+    def override_attribute_values(self, override_value, class_type, *, class_instance=None, attribute=None, view=None, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        override_value = convert_string_to_value(str(override_value))
+        
+        for row in self.get_matching_rows(view, class_type, class_instance, attribute):
+            self.set_override_value(row, override_value)
+            
+    def override_attribute_values_bulk(self, override_values, keys=None, *, view=None, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        
+        if keys is None: # Keys can be a NumPy array, which can not be compared using ==
+            keys = list(override_values.keys())
+            override_values = list(override_values.values())
+            
+        elif len(keys) != len(override_values):
+            raise ValueError(f"Expected one override value per key, but got {len(override_values)} values for {len(keys)} keys")
+            
+        for key, override_value in zip(keys, override_values):
+            if isinstance(override_value, str):
+                override_value = convert_string_to_value(override_value)
+            else:
+                override_value = tuple(float(element) for element in np.atleast_1d(override_value))
+                
+            class_type, class_instance, attribute = tuple(key)
+            
+            for row in self.get_matching_rows(view, class_type, class_instance, attribute):
+                self.set_override_value(row, override_value)
+                
+    def set_override_value(self, row, override_value):
+        self.__override_values[row] = override_value
+        self.__changed_rows.add(row)
+        self.__changes.append(("override", row, override_value))
+        
+    def reset_override_attribute_values(self, *, class_type=None, class_instance=None, attribute=None, view=None, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        
+        for row in self.get_matching_rows(view, class_type, class_instance, attribute):
+            if self.__override_values.get(row) != None:
+                self.__override_values[row] = None
+                self.__changed_rows.add(row)
+                self.__changes.append(("reset_override", row))
+                
+    def set_class_marker(self, value, color, *, class_type=None, class_instance=None, view=None):
+        self.__changes.append(("marker", value, color, class_type, class_instance, view))
+        
+    def calculate_values(self, *, snapshot=None):
+        """
+        Calculates the values affected by override values changed since the last calculation, where the values are calculated again in the program when the script finishes
+        """
+        self.check_no_snapshot(snapshot)
+        
+        affected_rows = set()
+        to_visit = list(self.__changed_rows)
+        
+        while len(to_visit) > 0:
+            row = to_visit.pop()
+            
+            if not row in affected_rows:
+                affected_rows.add(row)
+                to_visit.extend(self.__dependent_rows.get(row, []))
+                
+        # Rows are ordered so that inputs come before the rows taking them as input
+        for row in sorted(affected_rows):
+            if not row in self.__index["calculation_nodes"]:
+                continue
+                
+            is_correctly_connected, value_type, calculation_type, input_rows, input_value_types, setup_input_scalars_per_attribute, input_scalar, input_offset = self.__index["calculation_nodes"][row]
+            
+            if not is_correctly_connected:
+                self.__calculated_values[row] = ("CONFIGURATION ERROR",)
+                continue
+                
+            self.__calculated_values[row] = combine_values(value_type, \
+                                                           calculation_type, \
+                                                           input_value_types, \
+                                                           [self.get_current_value(input_row) for input_row in input_rows], \
+                                                           setup_input_scalars_per_attribute, \
+                                                           input_scalar, \
+                                                           input_offset, \
+                                                           self.__index["num_samples"])
+                                                           
+        self.__changed_rows = set()
+        self.__changes.append(("calculate",))
+        
+    def calculate_values_in_steps(self, num_setup_attributes_per_step, *, snapshot=None):
+        """
+        Calculates the values at once, as the program responds while the script runs in its own process
+        """
+        self.calculate_values(snapshot=snapshot)
+        return iter(())
+        
+    def reset_script_changes(self):
+        """
+        Resets all override values and markers, including those made before the script started
+        """
+        for row, override_value in self.__override_values.items():
+            if override_value != None:
+                self.__changed_rows.add(row)
+                
+        self.__override_values = {}
+        self.__changes = [("reset_script_changes",)]
+        self.calculate_values()
+        
+    def stream_attribute_values(self, view=None):
+        # Rows are ordered so that inputs come before the rows taking them as input
+        for row in range(len(self.__index["attribute_names"])):
+            if not row in self.__class_id_per_row:
+                continue
+                
+            class_id = self.__class_id_per_row[row]
+            class_type, class_instance, rows, input_class_names = self.__index["classes"][class_id]
+            
+            for view_name in self.__view_names_per_class_id[class_id]:
+                if view in (None, view_name):
+                    yield (view_name, class_type, class_instance, self.__index["attribute_names"][row], self.get_current_value(row))
+                    
+    def open_result_store(self, name):
+        return ResultStore(os.path.join(SCRIPT_RESULTS_PATH, name))
+        
+    def append_attribute_values(self, result_store, keys, *, view=None, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        result_store.append_attribute_values(self, keys, view=view)
+        
+    def export_attribute_values(self, file_path, class_types=None, attributes=None, *, view=None, snapshot=None):
+        self.check_no_snapshot(snapshot)
+        attribute_names_per_class_type = {}
+        class_ids_per_class_type = {}
+        
+        for class_id in self.get_matching_class_ids(view, None, None):
+            class_type, class_instance, rows = self.__index["classes"][class_id][:3]
+            
+            if class_types == None or class_type in class_types:
+                if not class_type in attribute_names_per_class_type:
+                    attribute_names_per_class_type[class_type] = [self.__index["attribute_names"][row] for row in rows \
+                                                                  if attributes == None or self.__index["attribute_names"][row] in attributes]
+                                                                  
+                class_ids_per_class_type.setdefault(class_type, []).append(class_id)
+                
+        def get_rows():
+            for class_type, class_ids in class_ids_per_class_type.items():
+                for class_id in class_ids:
+                    class_type, class_instance, rows = self.__index["classes"][class_id][:3]
+                    values = {self.__index["attribute_names"][row]: self.get_current_value(row) for row in rows if self.__index["attribute_names"][row] in attribute_names_per_class_type[class_type]}
+                    
+                    yield class_type, class_instance, values
+                    
+        file_path = os.path.join(SCRIPT_RESULTS_PATH, file_path)
+        export_attribute_values(file_path, attribute_names_per_class_type, get_rows())
+        
+        return file_path
+        
+    def check_no_snapshot(self, snapshot):
+        if snapshot != None:
+            raise NotImplementedError("Snapshots can not be used by scripts running in a separate process")
+            
+    def create_snapshot(self):
+        self.check_no_snapshot(True)
+        
+    def fork_snapshot(self, snapshot):
+        self.check_no_snapshot(snapshot)
+        
+    def apply_snapshot(self, snapshot):
+        self.check_no_snapshot(snapshot)
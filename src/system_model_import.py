@@ -0,0 +1,281 @@
+import os
+import csv
+import json
+from helper_functions_general import convert_value_to_string, convert_string_to_value
+from config import *
+
+INSTANCE_COLUMNS = ("class_type", "class_instance") # Columns of CSV files with instances that are not attribute names
+CONNECTION_COLUMNS = ("source_class_type", "source_class_instance", "target_class_type", "target_class_instance", "input_scalars")
+
+def get_connections_file_path(file_path):
+    """
+    Returns the path to the CSV file with the connections of the instances in a CSV file, such as assets_connections.csv for assets.csv
+    """
+    root, extension = os.path.splitext(file_path)
+    return f"{root}_connections{extension}"
+    
+def convert_imported_value_to_string(value):
+    """
+    Converts a value from a JSON file, such as 5, "5 / 10" or [5, 10], to the string entered for a setup attribute
+    """
+    if isinstance(value, str):
+        return value
+        
+    if isinstance(value, (list, tuple)):
+        return convert_value_to_string(tuple(value))
+        
+    return convert_value_to_string((value,))
+    
+def read_system_model(file_path):
+    """
+    Reads the instances and connections of a system model from a JSON or CSV file
+    
+    JSON files hold a dictionary {"instances": [...], "connections": [...]}, where each instance is a dictionary with the class_type, the class_instance and a dictionary
+    of values per attribute name, and each connection a dictionary with the class types and instances of the source and target, and optionally the input_scalars
+    CSV files have the columns class_type and class_instance followed by one column per attribute name, where empty cells are skipped
+    The connections of a CSV file are read from a CSV file with the columns in CONNECTION_COLUMNS next to it, see get_connections_file_path
+    
+    Returns a tuple (instances, connections) of lists of dictionaries in the same format as in JSON files
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    
+    if extension == ".json":
+        with open(file_path, "r") as file_json:
+            system_model = json.load(file_json)
+            
+        return system_model.get("instances", []), system_model.get("connections", [])
+        
+    if extension != ".csv":
+        raise ValueError(f"Could not import {file_path}, as only .json and .csv files are supported")
+        
+    instances = []
+    connections = []
+    
+    with open(file_path, "r", newline="") as file_csv:
+        for row in csv.DictReader(file_csv):
+            values = {attribute_name: value for attribute_name, value in row.items() if not attribute_name in INSTANCE_COLUMNS and value not in (None, "")}
+            instances.append({"class_type": row["class_type"], "class_instance": row["class_instance"], "values": values})
+            
+    if os.path.exists(get_connections_file_path(file_path)):
+        with open(get_connections_file_path(file_path), "r", newline="") as file_csv:
+            for row in csv.DictReader(file_csv):
+                connection = {column: row[column] for column in CONNECTION_COLUMNS[:4]}
+                
+                if row.get("input_scalars") not in (None, ""):
+                    connection["input_scalars"] = row["input_scalars"]
+                    
+                connections.append(connection)
+                
+    return instances, connections
+    
+def get_layers(num_instances, connection_indices):
+    """
+    Returns the layer of each instance when laid out from top to bottom, where each instance is placed one layer below the lowest of its sources
+    Instances that are part of a cycle are placed in the layer below all others
+    
+    connection_indices: List of tuples (index of source instance, index of target instance)
+    """
+    targets_per_source = [[] for i in range(num_instances)]
+    num_sources = [0] * num_instances
+    
+    for source_index, target_index in connection_indices:
+        targets_per_source[source_index].append(target_index)
+        num_sources[target_index] += 1
+        
+    layers = [0] * num_instances
+    instances_to_visit = [index for index in range(num_instances) if num_sources[index] == 0]
+    num_visited = 0
+    
+    while len(instances_to_visit) > 0:
+        source_index = instances_to_visit.pop()
+        num_visited += 1
+        
+        for target_index in targets_per_source[source_index]:
+            layers[target_index] = max(layers[target_index], layers[source_index] + 1)
+            num_sources[target_index] -= 1
+            
+            if num_sources[target_index] == 0:
+                instances_to_visit.append(target_index)
+                
+    if num_visited < num_instances:
+        last_layer = max(layers) + 1
+        
+        for index in range(num_instances):
+            if num_sources[index] > 0:
+                layers[index] = last_layer
+                
+    return layers
+    
+def get_layout(heights, connection_indices, origin):
+    """
+    Returns the position of each instance, where instances are placed in rows from top to bottom according to their layers, see get_layers
+    Layers with more than IMPORT_LAYOUT_MAX_COLUMNS instances are split over multiple rows
+    
+    heights: Height of each instance, including its attributes
+    origin: Grid coordinate of the top left corner of the first instance
+    """
+    layers = get_layers(len(heights), connection_indices)
+    rows = []
+    
+    for layer in sorted(set(layers)):
+        indices = [index for index in range(len(heights)) if layers[index] == layer]
+        rows.extend(indices[i:i+IMPORT_LAYOUT_MAX_COLUMNS] for i in range(0, len(indices), IMPORT_LAYOUT_MAX_COLUMNS))
+        
+    positions = [None] * len(heights)
+    y = origin[1]
+    
+    for row in rows:
+        for column, index in enumerate(row):
+            positions[index] = (origin[0] + column * (CLASS_WIDTH + SETUP_WIDTH_ADDITION + IMPORT_LAYOUT_SPACING_X), y)
+            
+        y += max(heights[index] for index in row) + IMPORT_LAYOUT_SPACING_Y
+        
+    return positions
+    
+def get_connection_offsets(num_connections):
+    """
+    Returns the horizontal offsets from the left side of a setup class that the connections going out from or into it are attached at, spread evenly over its width
+    """
+    width = CLASS_WIDTH + SETUP_WIDTH_ADDITION
+    
+    if num_connections > width:
+        return [i % width for i in range(num_connections)]
+        
+    return [int((i + 0.5) * width / num_connections) for i in range(num_connections)]
+    
+def import_system_model(setup_view, file_path, *, calculate_values=True):
+    """
+    Adds the instances and connections of a system model read from a file (see read_system_model) to a setup view, placed below any blocks already in the view
+    All blocks are created in one pass, where the connections are directly attached to their setup classes instead of searching the view for adjacent ones,
+    and values are first shown once all blocks are created
+    
+    Returns the created GUI setup classes
+    """
+    model = setup_view.get_model()
+    instances, connections = read_system_model(file_path)
+    
+    configuration_classes_gui = {} # Key: Name of class type, Value: GUI configuration class
+    
+    for configuration_view in model.get_configuration_views():
+        for configuration_class_gui in configuration_view.get_configuration_classes_gui():
+            configuration_classes_gui.setdefault(configuration_class_gui.get_name(), configuration_class_gui)
+            
+    # Check the whole file before creating any blocks
+    instance_indices = {} # Key: (class type, class instance), Value: Index of instance
+    heights = []
+    
+    for instance in instances:
+        key = (instance["class_type"], instance["class_instance"])
+        
+        if not key[0] in configuration_classes_gui:
+            raise ValueError(f"Could not import the instance {key[1]}, as there is no class type {key[0]}")
+            
+        if key in instance_indices:
+            raise ValueError(f"Could not import the instance {key[1]} of {key[0]}, as it occurs more than once")
+            
+        attribute_names = [configuration_attribute_gui.get_name() for configuration_attribute_gui in configuration_classes_gui[key[0]].get_configuration_attributes_gui() if not configuration_attribute_gui.is_hidden()]
+        
+        for attribute_name in instance.get("values", {}):
+            if not attribute_name in attribute_names:
+                raise ValueError(f"Could not import the instance {key[1]}, as {key[0]} has no attribute {attribute_name}")
+                
+        instance_indices[key] = len(heights)
+        heights.append(CLASS_HEIGHT + len(attribute_names) * ATTRIBUTE_HEIGHT)
+        
+    connection_indices = []
+    input_scalars_per_connection = []
+    
+    for connection in connections:
+        source_key = (connection["source_class_type"], connection["source_class_instance"])
+        target_key = (connection["target_class_type"], connection["target_class_instance"])
+        
+        for key in (source_key, target_key):
+            if not key in instance_indices:
+                raise ValueError(f"Could not import the connection from {source_key} to {target_key}, as there is no instance {key[1]} of {key[0]} in the file")
+                
+        indices = (instance_indices[source_key], instance_indices[target_key])
+        
+        # Setup classes can only be connected once in each direction, and not to themselves
+        if indices in connection_indices or indices[0] == indices[1]:
+            continue
+            
+        input_scalars = connection.get("input_scalars", None)
+        
+        if isinstance(input_scalars, str):
+            input_scalars = convert_string_to_value(input_scalars)
+        elif input_scalars != None:
+            input_scalars = tuple(input_scalars)
+            
+        connection_indices.append(indices)
+        input_scalars_per_connection.append(input_scalars)
+        
+    # Place the instances below all blocks already in the view, aligned with the grid
+    grid_offset_x, grid_offset_y = setup_view.get_grid_offset()
+    origin_y = IMPORT_LAYOUT_ORIGIN[1] + grid_offset_y
+    
+    for setup_class_gui in setup_view.get_setup_classes_gui():
+        bottom_block = (setup_class_gui.get_setup_attributes_gui() or [setup_class_gui])[-1]
+        origin_y = max(origin_y, bottom_block.get_y() + bottom_block.get_height() + IMPORT_LAYOUT_SPACING_Y)
+        
+    positions = get_layout(heights, connection_indices, (IMPORT_LAYOUT_ORIGIN[0] + grid_offset_x, origin_y))
+    setup_classes_gui = []
+    
+    with model.defer_display():
+        for instance, position in zip(instances, positions):
+            setup_class_gui = setup_view.create_setup_class_gui(configuration_class_gui=configuration_classes_gui[instance["class_type"]], position=position)
+            setup_class_gui.set_name(instance["class_instance"])
+            
+            values = instance.get("values", {})
+            
+            for setup_attribute_gui in setup_class_gui.get_setup_attributes_gui():
+                if setup_attribute_gui.get_name() in values:
+                    setup_attribute_gui.set_displayed_value(convert_imported_value_to_string(values[setup_attribute_gui.get_name()]))
+                    
+            setup_classes_gui.append(setup_class_gui)
+            
+        # Attach connections to the bottom of their sources and the top of their targets, ordered by the position of the other end to avoid crossing lines
+        outgoing_indices = [[] for i in range(len(instances))]
+        incoming_indices = [[] for i in range(len(instances))]
+        
+        for connection_index, (source_index, target_index) in enumerate(connection_indices):
+            outgoing_indices[source_index].append(connection_index)
+            incoming_indices[target_index].append(connection_index)
+            
+        start_offsets = {}
+        end_offsets = {}
+        
+        for index in range(len(instances)):
+            outgoing_indices[index].sort(key=lambda connection_index: positions[connection_indices[connection_index][1]])
+            incoming_indices[index].sort(key=lambda connection_index: positions[connection_indices[connection_index][0]])
+            
+            start_offsets.update(zip(outgoing_indices[index], get_connection_offsets(len(outgoing_indices[index]))))
+            end_offsets.update(zip(incoming_indices[index], get_connection_offsets(len(incoming_indices[index]))))
+            
+        for connection_index, (source_index, target_index) in enumerate(connection_indices):
+            source_x, source_y = positions[source_index]
+            target_x, target_y = positions[target_index]
+            
+            setup_view.create_connection_with_blocks(start_coordinate=(source_x + start_offsets[connection_index], source_y + heights[source_index]), \
+                                                     end_coordinate=(target_x + end_offsets[connection_index], target_y - 1), \
+                                                     input_scalars=input_scalars_per_connection[connection_index], \
+                                                     start_setup_class_gui=setup_classes_gui[source_index], \
+                                                     end_setup_class_gui=setup_classes_gui[target_index])
+                                                     
+        setup_view.update_shown_order()
+        
+    if calculate_values:
+        model.calculate_values()
+        
+    return setup_classes_gui
+    
+def import_system_model_into_view(setup_view, file_path):
+    """
+    Imports a system model from the options of a setup view, printing why the import failed instead of raising an exception
+    """
+    if file_path.strip() == "":
+        return
+        
+    try:
+        import_system_model(setup_view, file_path.strip())
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Error: Could not import the system model from {file_path}: {error}")
@@ -1,11 +1,11 @@
 import os
-import pickle
 from view import View
 from configuration_class_gui import GUIConfigurationClass
 from configuration_input_gui import GUIConfigurationInput
 from buttons_gui import TouchButton
 from connection_gui import GUIConnection
 from helper_functions_general import delete_all
+from metamodel_library import get_reference_path, is_reference_path, get_metamodel_id_from_path
 from config import *
 
 class ConfigurationView(View):
@@ -17,6 +17,7 @@ class ConfigurationView(View):
         self.__configuration_classes_gui = []
         self.__configuration_inputs_gui = []
         self.__held_connection = None
+        self.__metamodel_id = None # ID of the metamodel in the library that the view was restored from or published as, see MetamodelLibrary
         
         self.__add_configuration_class_button = TouchButton.add_configuration_class(model, self) # Button to create a new configuration class
         self.__add_input_button = TouchButton.add_input(model, self) # Button to create a new input block
@@ -99,21 +100,62 @@ class ConfigurationView(View):
         
         return movable_items
         
-    def save(self):
+    def get_save_file_path(self):
+        """
+        Returns the path to the file save, which refers to the metamodel in the library if the view has not changed since it was restored from or published to the library
         """
-        Saves the state of the view
+        if self.is_same_as_metamodel():
+            return get_reference_path(self.__metamodel_id)
+            
+        return os.path.join(CONFIGURATION_SAVES_DIRECTORY, f"{self.get_name()}.pickle")
+        
+    def get_metamodel_id(self):
+        return self.__metamodel_id
+        
+    def is_same_as_metamodel(self):
+        """
+        Returns whether the view is the same as the metamodel in the library that it was restored from or published as, apart from the grid offset
+        """
+        if self.__metamodel_id == None:
+            return False
+            
+        return self.get_saved_states()[1:] == self.get_model().get_metamodel_library().read(self.__metamodel_id)[1][1:]
+        
+    def publish_metamodel(self):
+        """
+        Adds the view to the metamodel library as a new version of the metamodel with the name of the view, so that saves refer to it instead of having their own copy
+        
+        Returns the ID of the metamodel
+        """
+        self.__metamodel_id = self.get_model().get_metamodel_library().publish(self.get_name(), self.get_saved_states())
+        print(f"Published {self.get_name()} to the metamodel library as {self.__metamodel_id}")
+        
+        return self.__metamodel_id
+        
+    def get_saved_states(self):
+        """
+        Returns the grid offset and the states of all blocks, which do not refer to any blocks so that they can be written to file later
         """
-        # Save the state of all blocks
         saved_states_configuration_classes_gui = [class_gui.save_state() for class_gui in self.__configuration_classes_gui]
         saved_states_configuration_inputs_gui = [input_gui.save_state() for input_gui in self.__configuration_inputs_gui]
         
-        file_path = os.path.join(CONFIGURATION_SAVES_DIRECTORY, f"{self.get_name()}.pickle")
+        return (self.get_grid_offset(), saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui)
         
-        # Save grid offset and block states to file
-        with open(os.path.join(SAVES_PATH, file_path), "wb") as file_pickle:
-            pickle.dump((self.get_grid_offset(), saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui), file_pickle)
+    def save(self):
+        """
+        Saves the state of the view, where the file is only written if the state has changed since it was last saved or restored
             
-        return file_path
+        Returns the path to the file save and whether the file was written
+        """
+        file_path = self.get_save_file_path()
+        
+        # Metamodels in the library are never changed
+        if is_reference_path(file_path):
+            return file_path, False
+            
+        is_written = self.write_save(file_path, self.get_saved_states())
+        
+        return file_path, is_written
         
     def restore_save(self, file_path, linked_groups_per_number):
         """
@@ -125,76 +167,81 @@ class ConfigurationView(View):
         Returns mapping between IDs of blocks from the save to those recreated in this new view instance
         """
         try:
-            with open(os.path.join(SAVES_PATH, file_path), "rb") as file_pickle:
-                grid_offset, saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui = pickle.load(file_pickle)
-                self.set_grid_offset(grid_offset[0], grid_offset[1])
+            grid_offset, saved_states_configuration_classes_gui, saved_states_configuration_inputs_gui = self.read_save(file_path)
+            
+            if is_reference_path(file_path):
+                self.__metamodel_id = get_metamodel_id_from_path(file_path)
                 
-                mapping_configuration_class_gui = {} # Maps class IDs of GUI configuration classes from previous save to the IDs of the newly created classes
-                mapping_configuration_attribute_gui = {} # Maps class IDs of GUI configuration attributes from previous save to the IDs of the newly created classes
+            self.set_grid_offset(grid_offset[0], grid_offset[1])
+            
+            mapping_configuration_class_gui = {} # Maps class IDs of GUI configuration classes from previous save to the IDs of the newly created classes
+            mapping_configuration_attribute_gui = {} # Maps class IDs of GUI configuration attributes from previous save to the IDs of the newly created classes
+            
+            # Restore configuration classes
+            for saved_states_configuration_class_gui in saved_states_configuration_classes_gui:
+                linked_group_number = saved_states_configuration_class_gui["linked_group_number"]
+                position = (saved_states_configuration_class_gui["x"], saved_states_configuration_class_gui["y"])
                 
-                # Restore configuration classes
-                for saved_states_configuration_class_gui in saved_states_configuration_classes_gui:
-                    linked_group_number = saved_states_configuration_class_gui["linked_group_number"]
-                    position = (saved_states_configuration_class_gui["x"], saved_states_configuration_class_gui["y"])
+                # Should bind to already existing configuration class
+                if linked_group_number != None and linked_group_number in linked_groups_per_number:
+                    configuration_class_gui = self.get_model().create_linked_configuration_class_gui(linked_groups_per_number[linked_group_number][0], \
+                                                                                                     self, \
+                                                                                                     linked_group_number=linked_group_number, \
+                                                                                                     position=position)
+                else:
+                    configuration_class_gui = self.create_configuration_class_gui(position=position)
                     
-                    # Should bind to already existing configuration class
-                    if linked_group_number != None and linked_group_number in linked_groups_per_number:
-                        configuration_class_gui = self.get_model().create_linked_configuration_class_gui(linked_groups_per_number[linked_group_number][0], \
-                                                                                                         self, \
-                                                                                                         linked_group_number=linked_group_number, \
-                                                                                                         position=position)
-                    else:
-                        configuration_class_gui = self.create_configuration_class_gui(position=position)
-                        
-                        if linked_group_number != None:
-                            linked_groups_per_number[linked_group_number] = [configuration_class_gui]
-                            
-                        # Set configuration class data
-                        configuration_class_gui.set_name(saved_states_configuration_class_gui["name"])
+                    if linked_group_number != None:
+                        linked_groups_per_number[linked_group_number] = [configuration_class_gui]
                         
-                        # Restore configuration attributes
-                        for saved_states_configuration_attribute_gui in saved_states_configuration_class_gui["configuration_attributes_gui"]:
-                            # Create configuration attribute
-                            configuration_class_gui.create_attribute()
-                            configuration_attribute_gui = configuration_class_gui.get_configuration_attributes_gui()[-1]
-                            
-                            # Set configuration attribute data
-                            configuration_attribute_gui.set_name(saved_states_configuration_attribute_gui["name"])
-                            configuration_attribute_gui.set_value_type(saved_states_configuration_attribute_gui["value_type"])
-                            configuration_attribute_gui.set_input_scalar(saved_states_configuration_attribute_gui["input_scalar"])
-                            configuration_attribute_gui.set_input_offset(saved_states_configuration_attribute_gui["input_offset"])
-                            configuration_attribute_gui.set_hidden(saved_states_configuration_attribute_gui["is_hidden"])
-                            
-                    mapping_configuration_class_gui[saved_states_configuration_class_gui["configuration_class_gui"]] = configuration_class_gui
+                    # Set configuration class data
+                    configuration_class_gui.set_name(saved_states_configuration_class_gui["name"])
                     
-                    for saved_states_configuration_attribute_gui, configuration_attribute_gui in zip(saved_states_configuration_class_gui["configuration_attributes_gui"], configuration_class_gui.get_configuration_attributes_gui()):
-                        mapping_configuration_attribute_gui[saved_states_configuration_attribute_gui["configuration_attribute_gui"]] = configuration_attribute_gui
-                    
-                # Restore configuration inputs
-                for saved_states_configuration_input_gui in saved_states_configuration_inputs_gui:
-                    # Create configuration input
-                    configuration_input_gui = self.create_configuration_input_gui(position=(saved_states_configuration_input_gui["x"], saved_states_configuration_input_gui["y"]))
-                    
-                    # Set configuration input data
-                    configuration_input_gui.attempt_to_attach_to_attribute()
-                    calculation_type = saved_states_configuration_input_gui["calculation_type"]
-                    
-                    if calculation_type != "":
-                        configuration_input_gui.set_calculation_type(calculation_type)
+                    # Restore configuration attributes
+                    for saved_states_configuration_attribute_gui in saved_states_configuration_class_gui["configuration_attributes_gui"]:
+                        # Create configuration attribute
+                        configuration_class_gui.create_attribute()
+                        configuration_attribute_gui = configuration_class_gui.get_configuration_attributes_gui()[-1]
                         
-                    # Restore configuration connections
-                    for saved_states_connection in saved_states_configuration_input_gui["connections"]:
-                        connection = GUIConnection(self.get_model(), \
-                                                   self, \
-                                                   mapping_configuration_attribute_gui[saved_states_connection["start_block"]], \
-                                                   saved_states_connection["start_direction"], \
-                                                   end_block=configuration_input_gui, \
-                                                   end_direction=saved_states_connection["end_direction"], \
-                                                   corner_coordinates=saved_states_connection["corner_coordinates"], \
-                                                   is_external=saved_states_connection["is_external"])
+                        # Set configuration attribute data
+                        configuration_attribute_gui.set_name(saved_states_configuration_attribute_gui["name"])
+                        configuration_attribute_gui.set_value_type(saved_states_configuration_attribute_gui["value_type"])
+                        configuration_attribute_gui.set_input_scalar(saved_states_configuration_attribute_gui["input_scalar"])
+                        configuration_attribute_gui.set_input_offset(saved_states_configuration_attribute_gui["input_offset"])
+                        configuration_attribute_gui.set_hidden(saved_states_configuration_attribute_gui["is_hidden"])
                         
-                return mapping_configuration_class_gui
+                mapping_configuration_class_gui[saved_states_configuration_class_gui["configuration_class_gui"]] = configuration_class_gui
+                configuration_class_gui.set_save_id(saved_states_configuration_class_gui["configuration_class_gui"])
+                    
+                for saved_states_configuration_attribute_gui, configuration_attribute_gui in zip(saved_states_configuration_class_gui["configuration_attributes_gui"], configuration_class_gui.get_configuration_attributes_gui()):
+                    mapping_configuration_attribute_gui[saved_states_configuration_attribute_gui["configuration_attribute_gui"]] = configuration_attribute_gui
+                    configuration_attribute_gui.set_save_id(saved_states_configuration_attribute_gui["configuration_attribute_gui"])
+                    
+            # Restore configuration inputs
+            for saved_states_configuration_input_gui in saved_states_configuration_inputs_gui:
+                # Create configuration input
+                configuration_input_gui = self.create_configuration_input_gui(position=(saved_states_configuration_input_gui["x"], saved_states_configuration_input_gui["y"]))
+                
+                # Set configuration input data
+                configuration_input_gui.attempt_to_attach_to_attribute()
+                calculation_type = saved_states_configuration_input_gui["calculation_type"]
                 
+                if calculation_type != "":
+                    configuration_input_gui.set_calculation_type(calculation_type)
+                    
+                # Restore configuration connections
+                for saved_states_connection in saved_states_configuration_input_gui["connections"]:
+                    connection = GUIConnection(self.get_model(), \
+                                               self, \
+                                               mapping_configuration_attribute_gui[saved_states_connection["start_block"]], \
+                                               saved_states_connection["start_direction"], \
+                                               end_block=configuration_input_gui, \
+                                               end_direction=saved_states_connection["end_direction"], \
+                                               corner_coordinates=saved_states_connection["corner_coordinates"], \
+                                               is_external=saved_states_connection["is_external"])
+                                               
+            return mapping_configuration_class_gui
+            
         except FileNotFoundError as e:
             print(f"Could not find configuration view {file_path}: {e}")
             
@@ -1,5 +1,4 @@
 import os
-import pickle
 from view import View
 from setup_class_gui import GUISetupClass
 from buttons_gui import TouchButton
@@ -18,25 +17,20 @@ class SetupView(View):
         self.__connections_with_blocks = []
         self.__to_setup_buttons = []
         self.__is_excluded = False
+        self.__deferred_saved_states = None # Tuple (saved states of GUI setup classes, saved states of connections) restored when the blocks of the view are first needed
         
         self.__create_connection_button = TouchButton.create_connection(model, self)
         self.__calculate_value_button = TouchButton.calculate_values(model, self)
         
         self.__run_script_buttons = []
         
-        # Add buttons to run scripts
-        for file_name_full in os.listdir(SCRIPTS_PATH):
-            # Find all .py files
-            if file_name_full.strip()[-3:] == ".py":
-                file_name = file_name_full.strip().replace(".py", "")
+        # Add buttons to run scripts, where the scripts are first imported when run
+        for script_name in model.get_script_registry().get_script_names():
+            # If at least one script, add a button for resetting any changes made by scripts
+            if len(self.__run_script_buttons) == 0:
+                self.__run_script_buttons.append(TouchButton.clear_script(model, self))
                 
-                # Skip the template file
-                if file_name != "SCRIPT_TEMPLATE":
-                    # If at least one script, add a button for resetting any changes made by scripts
-                    if len(self.__run_script_buttons) == 0:
-                        self.__run_script_buttons.append(TouchButton.clear_script(model, self))
-                        
-                    self.__run_script_buttons.append(TouchButton.run_script(model, self, SCRIPTS_PATH, file_name, len(self.__run_script_buttons)))
+            self.__run_script_buttons.append(TouchButton.run_script(model, self, script_name, len(self.__run_script_buttons)))
                     
     def on_resize(self, event):
         """
@@ -59,15 +53,17 @@ class SetupView(View):
         grid_offset = self.get_grid_offset()
         setup_view_copy.set_grid_offset(grid_offset[0], grid_offset[1])
         
-        for setup_class_gui in self.__setup_classes_gui:
+        setup_classes_gui_copies = {} # Key: GUI setup class, Value: Its copy
+        
+        for setup_class_gui in self.get_setup_classes_gui():
             linked_group_number = setup_class_gui.get_linked_group_number()
             position = (setup_class_gui.get_x(), setup_class_gui.get_y())
             
             if linked_group_number != None:
-                self.get_model().create_linked_setup_class_gui(setup_class_gui, \
-                                                               setup_view_copy, \
-                                                               linked_group_number=linked_group_number, \
-                                                               position=position)
+                setup_classes_gui_copies[setup_class_gui] = self.get_model().create_linked_setup_class_gui(setup_class_gui, \
+                                                                                                          setup_view_copy, \
+                                                                                                          linked_group_number=linked_group_number, \
+                                                                                                          position=position)
             else:
                 setup_class_gui_copy = setup_view_copy.create_setup_class_gui(configuration_class_gui=setup_class_gui.get_configuration_class_gui(), \
                                                                               position=position)
@@ -77,6 +73,8 @@ class SetupView(View):
                                                                          setup_class_gui_copy.get_setup_attributes_gui()):
                     setup_attribute_gui_copy.set_displayed_value(convert_value_to_string(setup_attribute_gui.get_setup_attribute().get_value()))
                     
+                setup_classes_gui_copies[setup_class_gui] = setup_class_gui_copy
+                
         for connection_with_blocks in self.__connections_with_blocks:
             start_block = connection_with_blocks.get_start_block()
             end_block = connection_with_blocks.get_end_block()
@@ -84,7 +82,9 @@ class SetupView(View):
             setup_view_copy.create_connection_with_blocks(start_coordinate=(start_block.get_x(), start_block.get_y()), \
                                                           end_coordinate=(end_block.get_x(), end_block.get_y()), \
                                                           input_scalars=connection_with_blocks.get_input_scalars(), \
-                                                          input_scalars_indicator_coordinate=connection_with_blocks.get_input_scalars_coordinate())
+                                                          input_scalars_indicator_coordinate=connection_with_blocks.get_input_scalars_coordinate(), \
+                                                          start_setup_class_gui=setup_classes_gui_copies.get(connection_with_blocks.get_start_setup_class_gui()), \
+                                                          end_setup_class_gui=setup_classes_gui_copies.get(connection_with_blocks.get_end_setup_class_gui()))
             
     def create_setup_class_gui(self, *, configuration_class_gui=None, setup_class_gui_to_copy=None, position=None):
         """
@@ -102,6 +102,7 @@ class SetupView(View):
             setup_class_gui = GUISetupClass.new(self.get_model(), self, configuration_class_gui, position)
             
         self.__setup_classes_gui.append(setup_class_gui)
+        self.get_model().increment_version()
         
         return setup_class_gui
         
@@ -110,6 +111,7 @@ class SetupView(View):
         
     def remove_setup_class_gui(self, setup_class_gui):
         self.__setup_classes_gui.remove(setup_class_gui)
+        self.get_model().increment_version()
         
     def get_movable_items(self):
         """
@@ -127,7 +129,7 @@ class SetupView(View):
         """
         Reset the override values of all attributes in all setup classes in the view
         """
-        for setup_class_gui in self.__setup_classes_gui:
+        for setup_class_gui in self.get_setup_classes_gui():
             setup_class_gui.reset_override_value()
             
     def get_matching_setup_classes_gui(self, *, class_configuration_name=None, class_instance_name=None):
@@ -136,23 +138,27 @@ class SetupView(View):
         """
         matching_setup_classes_gui = []
         
-        for setup_class_gui in self.__setup_classes_gui:
+        for setup_class_gui in self.get_setup_classes_gui():
             if class_configuration_name == None or setup_class_gui.get_configuration_name() == class_configuration_name:
                 if class_instance_name == None or setup_class_gui.get_name() == class_instance_name:
                     matching_setup_classes_gui.append(setup_class_gui)
                     
         return matching_setup_classes_gui
         
-    def create_connection_with_blocks(self, *, start_coordinate=None, end_coordinate=None, input_scalars=None, input_scalars_indicator_coordinate=None):
+    def create_connection_with_blocks(self, *, start_coordinate=None, end_coordinate=None, input_scalars=None, input_scalars_indicator_coordinate=None, start_setup_class_gui=None, end_setup_class_gui=None):
         """
         Creates a new directional connection with already attached triangle blocks on either side
+        
+        start_setup_class_gui, end_setup_class_gui: GUI setup classes that the blocks are attached to if adjacent, where all GUI setup classes in the view are searched if None
         """
         connection_with_blocks = GUIConnectionWithBlocks(self.get_model(), \
                                                          self, \
                                                          start_coordinate=start_coordinate, \
                                                          end_coordinate=end_coordinate, \
                                                          input_scalars=input_scalars, \
-                                                         input_scalars_indicator_coordinate=input_scalars_indicator_coordinate)
+                                                         input_scalars_indicator_coordinate=input_scalars_indicator_coordinate, \
+                                                         start_setup_class_gui=start_setup_class_gui, \
+                                                         end_setup_class_gui=end_setup_class_gui)
         self.__connections_with_blocks.append(connection_with_blocks)
         
         return connection_with_blocks
@@ -208,6 +214,7 @@ class SetupView(View):
             return
             
         self.__is_excluded = is_excluded
+        self.get_model().increment_version()
         
         # Change background color
         if is_excluded:
@@ -231,21 +238,75 @@ class SetupView(View):
             else:
                 connection_with_blocks.get_start_block().attempt_to_enable_calculation_connection()
                 
-    def save(self):
+    def get_save_file_path(self):
+        return os.path.join(SETUP_SAVES_DIRECTORY, f"{self.get_name()}.pickle")
+        
+    def get_saved_states(self, mapping_linked_group_number=None):
+        """
+        Returns the grid offset, whether the view is excluded and the states of all blocks, which do not refer to any blocks so that they can be written to file later
+        If the view has not been restored yet, the states are those read from its save without creating its blocks
+        
+        mapping_linked_group_number: Dictionary mapping linked group numbers in the save that has not been restored yet to those to save, None keeping the numbers from the save
         """
-        Saves the state of the view
+        if self.is_restored():
+            saved_states_setup_classes_gui = [class_gui.save_state() for class_gui in self.__setup_classes_gui]
+            saved_states_connections_with_blocks = [connection.save_state() for connection in self.__connections_with_blocks]
+        else:
+            saved_states_setup_classes_gui, saved_states_connections_with_blocks = self.__deferred_saved_states
+            
+            if mapping_linked_group_number != None:
+                saved_states_setup_classes_gui = [saved_states_setup_class_gui | {"linked_group_number": mapping_linked_group_number.get(saved_states_setup_class_gui["linked_group_number"])} \
+                                                  for saved_states_setup_class_gui in saved_states_setup_classes_gui]
+                                                  
+        return (self.get_grid_offset(), self.is_excluded(), saved_states_setup_classes_gui, saved_states_connections_with_blocks)
+        
+    def save(self, mapping_linked_group_number=None):
+        """
+        Saves the state of the view, where the file is only written if the state has changed since it was last saved or restored
+        
+        mapping_linked_group_number: See get_saved_states
+        
+        Returns the path to the file save and whether the file was written
+        """
+        file_path = self.get_save_file_path()
+        is_written = self.write_save(file_path, self.get_saved_states(mapping_linked_group_number))
+        
+        return file_path, is_written
+        
+    def load_save(self, file_path):
         """
-        # Save the state of all blocks
-        saved_states_setup_classes_gui = [class_gui.save_state() for class_gui in self.__setup_classes_gui]
-        saved_states_connections_with_blocks = [connection.save_state() for connection in self.__connections_with_blocks]
+        Reads a previous save of this view without creating any blocks, which are created when first needed (see restore_deferred_save)
+        
+        file_path: Path to the file save
         
-        file_path = os.path.join(SETUP_SAVES_DIRECTORY, f"{self.get_name()}.pickle")
+        Returns whether the view was excluded from calculations when saved
+        """
+        is_excluded = False
         
-        # Save grid offset and block states to file
-        with open(os.path.join(SAVES_PATH, file_path), "wb") as file_pickle:
-            pickle.dump((self.get_grid_offset(), self.is_excluded(), saved_states_setup_classes_gui, saved_states_connections_with_blocks), file_pickle)
+        try:
+            grid_offset, is_excluded, saved_states_setup_classes_gui, saved_states_connections_with_blocks = self.read_save(file_path)
+            self.set_grid_offset(grid_offset[0], grid_offset[1])
+            self.__deferred_saved_states = (saved_states_setup_classes_gui, saved_states_connections_with_blocks)
             
-        return file_path
+        except FileNotFoundError as e:
+            print(f"Could not find setup view {file_path}: {e}")
+            
+        return is_excluded
+        
+    def is_restored(self):
+        """
+        Returns whether all blocks of the view have been created, which is not the case for saves read by load_save until the view is first needed
+        """
+        return self.__deferred_saved_states == None
+        
+    def get_deferred_linked_group_numbers(self):
+        """
+        Returns a set of the linked group numbers of the setup classes in the save that has not been restored yet
+        """
+        if self.is_restored():
+            return set()
+            
+        return {saved_states_setup_class_gui["linked_group_number"] for saved_states_setup_class_gui in self.__deferred_saved_states[0]} - {None}
         
     def restore_save(self, file_path, mapping_configuration_class_gui, linked_groups_per_number):
         """
@@ -255,55 +316,88 @@ class SetupView(View):
         mapping_configuration_class_gui: Mapping between IDs of blocks from the save to those recreated in this new view instance
         linked_groups_per_number: Dictionary (Key: Group number, Value: List of GUI setup classes) for setup class copies linked to each other
         """
-        is_excluded = False
+        is_excluded = self.load_save(file_path)
+        self.restore_deferred_save(mapping_configuration_class_gui, linked_groups_per_number)
         
-        try:
-            with open(os.path.join(SAVES_PATH, file_path), "rb") as file_pickle:
-                grid_offset, is_excluded, saved_states_setup_classes_gui, saved_states_connections_with_blocks = pickle.load(file_pickle)
-                self.set_grid_offset(grid_offset[0], grid_offset[1])
+        return is_excluded
+        
+    def restore_deferred_save(self, mapping_configuration_class_gui, linked_groups_per_number, mapping_linked_group_number=None, restores_values=False):
+        """
+        Adds the blocks of the save read by load_save
+        
+        mapping_linked_group_number: Dictionary mapping linked group numbers from the save to those used when restoring, None keeping the numbers from the save
+        restores_values: Whether to set the values of all setup attributes to those in the save, so that they do not need to be calculated
+        """
+        if self.is_restored():
+            return
+            
+        saved_states_setup_classes_gui, saved_states_connections_with_blocks = self.__deferred_saved_states
+        self.__deferred_saved_states = None
+        
+        restored_setup_classes_gui = [] # Tuples (saved states, GUI setup class)
+        mapping_setup_class_gui = {} # Key: Save ID of GUI setup class, Value: Restored GUI setup class
                 
-                # Restore setup classes
-                for saved_states_setup_class_gui in saved_states_setup_classes_gui:
-                    position = (saved_states_setup_class_gui["x"], saved_states_setup_class_gui["y"])
-                    linked_group_number = saved_states_setup_class_gui["linked_group_number"]
+        # Restore setup classes
+        for saved_states_setup_class_gui in saved_states_setup_classes_gui:
+            position = (saved_states_setup_class_gui["x"], saved_states_setup_class_gui["y"])
+            linked_group_number = saved_states_setup_class_gui["linked_group_number"]
+            
+            if mapping_linked_group_number != None and linked_group_number != None:
+                linked_group_number = mapping_linked_group_number[linked_group_number]
                     
-                    # Should bind to already existing setup class
-                    if linked_group_number != None and linked_group_number in linked_groups_per_number:
-                        setup_class_gui = self.get_model().create_linked_setup_class_gui(linked_groups_per_number[linked_group_number][0], \
-                                                                                         self, \
-                                                                                         linked_group_number=linked_group_number, \
-                                                                                         position=position)
-                        
-                    else:
-                        configuration_class_gui = mapping_configuration_class_gui[saved_states_setup_class_gui["configuration_class_gui"]]
-                        setup_class_gui = self.create_setup_class_gui(configuration_class_gui=configuration_class_gui, position=position)
-                        
-                        if linked_group_number != None:
-                            linked_groups_per_number[linked_group_number] = [setup_class_gui]
-                        
-                    # Set setup class data
-                    setup_class_gui.set_name(saved_states_setup_class_gui["name"])
+            # Should bind to already existing setup class
+            if linked_group_number != None and linked_group_number in linked_groups_per_number:
+                setup_class_gui = self.get_model().create_linked_setup_class_gui(linked_groups_per_number[linked_group_number][0], \
+                                                                                 self, \
+                                                                                 linked_group_number=linked_group_number, \
+                                                                                 position=position)
+                                                                                 
+            else:
+                configuration_class_gui = mapping_configuration_class_gui[saved_states_setup_class_gui["configuration_class_gui"]]
+                setup_class_gui = self.create_setup_class_gui(configuration_class_gui=configuration_class_gui, position=position)
+                
+                if linked_group_number != None:
+                    linked_groups_per_number[linked_group_number] = [setup_class_gui]
                     
-                    for saved_states_setup_attribute_gui, setup_attribute_gui in zip(saved_states_setup_class_gui["setup_attributes_gui"], setup_class_gui.get_setup_attributes_gui()):
-                        setup_attribute_gui.set_displayed_value(convert_value_to_string(saved_states_setup_attribute_gui["value"]))
+            # Set setup class data
+            setup_class_gui.set_name(saved_states_setup_class_gui["name"])
+            
+            # Saves from before setup classes had save IDs are restored without them
+            if "setup_class_gui" in saved_states_setup_class_gui:
+                setup_class_gui.set_save_id(saved_states_setup_class_gui["setup_class_gui"])
+                mapping_setup_class_gui[saved_states_setup_class_gui["setup_class_gui"]] = setup_class_gui
+                
+            for saved_states_setup_attribute_gui, setup_attribute_gui in zip(saved_states_setup_class_gui["setup_attributes_gui"], setup_class_gui.get_setup_attributes_gui()):
+                setup_attribute_gui.set_displayed_value(convert_value_to_string(saved_states_setup_attribute_gui["value"]))
+                
+            restored_setup_classes_gui.append((saved_states_setup_class_gui, setup_class_gui))
                         
-                # Restore setup connections
-                for saved_states_connection_with_blocks in saved_states_connections_with_blocks:
-                    saved_states_start_block = saved_states_connection_with_blocks["start_block"]
-                    saved_states_end_block = saved_states_connection_with_blocks["end_block"]
-                    
-                    start_coordinate = (saved_states_start_block["x"], saved_states_start_block["y"])
-                    end_coordinate = (saved_states_end_block["x"], saved_states_end_block["y"])
-                    
-                    connection_with_blocks = self.create_connection_with_blocks(start_coordinate=start_coordinate, \
-                                                                                end_coordinate=end_coordinate, \
-                                                                                input_scalars=saved_states_connection_with_blocks["input_scalars"], \
-                                                                                input_scalars_indicator_coordinate=saved_states_connection_with_blocks["input_scalars_indicator_coordinate"])
+        # Restore setup connections
+        for saved_states_connection_with_blocks in saved_states_connections_with_blocks:
+            saved_states_start_block = saved_states_connection_with_blocks["start_block"]
+            saved_states_end_block = saved_states_connection_with_blocks["end_block"]
+            
+            start_coordinate = (saved_states_start_block["x"], saved_states_start_block["y"])
+            end_coordinate = (saved_states_end_block["x"], saved_states_end_block["y"])
+            
+            # Attach directly to the setup classes with the saved IDs, where the ends of connections in saves without them are attached to any adjacent setup class
+            start_setup_class_gui = mapping_setup_class_gui.get(saved_states_start_block.get("setup_class_gui"))
+            end_setup_class_gui = mapping_setup_class_gui.get(saved_states_end_block.get("setup_class_gui"))
+            
+            connection_with_blocks = self.create_connection_with_blocks(start_coordinate=start_coordinate, \
+                                                                        end_coordinate=end_coordinate, \
+                                                                        input_scalars=saved_states_connection_with_blocks["input_scalars"], \
+                                                                        input_scalars_indicator_coordinate=saved_states_connection_with_blocks["input_scalars_indicator_coordinate"], \
+                                                                        start_setup_class_gui=start_setup_class_gui, \
+                                                                        end_setup_class_gui=end_setup_class_gui)
                     
-        except FileNotFoundError as e:
-            print(f"Could not find setup view {file_path}: {e}")
+        # Set after the connections are restored, as connecting setup classes clears the values of attributes that become calculated
+        if restores_values:
+            for saved_states_setup_class_gui, setup_class_gui in restored_setup_classes_gui:
+                for saved_states_setup_attribute_gui, setup_attribute_gui in zip(saved_states_setup_class_gui["setup_attributes_gui"], setup_class_gui.get_setup_attributes_gui()):
+                    setup_attribute_gui.get_setup_attribute().set_value(saved_states_setup_attribute_gui["value"])
             
-        return is_excluded
+        self.update_shown_order()
         
     def delete(self):
         delete_all(self.__setup_classes_gui)
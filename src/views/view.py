@@ -1,9 +1,13 @@
+import os
+import pickle
+import hashlib
 import tkinter as tk
 from general_gui import GUIModelingBlock
 from buttons_gui import TouchButton
 from connection_with_blocks_gui import GUIConnectionWithBlocks
 from options import Options
-from helper_functions_general import convert_actual_coordinate_to_grid
+from helper_functions_general import convert_actual_coordinate_to_grid, open_atomically
+from metamodel_library import is_reference_path, get_metamodel_id_from_path
 from default_coordinate_functions import get_change_configuration_view_start_coordinate, get_change_setup_view_start_coordinate
 from config import *
 
@@ -34,6 +38,7 @@ class View(tk.Frame):
         self.__settings_button = TouchButton.settings(model, self)
         
         self.__currently_open_options = None
+        self.__last_save = None # Tuple (file path, hash of the saved states) last read from or written to the file save of the view
         
         # Add the headers above the buttons that change between views
         for text, position in [("Metamodel:", get_change_configuration_view_start_coordinate(LENGTH_UNIT)), ("System:", get_change_setup_view_start_coordinate(LENGTH_UNIT))]:
@@ -178,6 +183,7 @@ class View(tk.Frame):
         
     def set_name(self, name):
         self.__name = name
+        self.__model.increment_version()
         self.__model.set_text_change_view_buttons(self, name) # Need to update the text of the change view buttons in all views
         
     def get_canvas(self):
@@ -319,6 +325,49 @@ class View(tk.Frame):
     def set_grid_offset(self, offset_x, offset_y):
         self.__grid_offset = (offset_x, offset_y)
         
+    def read_save(self, file_path):
+        """
+        Returns the saved states in the file save of the view, which are remembered so that saving the same states again does not rewrite the file
+        Paths referring to a metamodel in the library (see MetamodelLibrary) are read from the library, where the saved states are shared and must not be changed
+        """
+        if is_reference_path(file_path):
+            data_hash, saved_states = self.__model.get_metamodel_library().read(get_metamodel_id_from_path(file_path))
+            self.__last_save = (file_path, data_hash)
+            
+            return saved_states
+            
+        with open(os.path.join(SAVES_PATH, file_path), "rb") as file_pickle:
+            data = file_pickle.read()
+            
+        self.__last_save = (file_path, hashlib.sha256(data).hexdigest())
+        
+        return pickle.loads(data)
+        
+    def get_last_save(self):
+        """
+        Returns a tuple (path to the file save, hash of the saved states) last read from or written to the file save of the view, None if there is none
+        """
+        return self.__last_save
+        
+    def write_save(self, file_path, saved_states):
+        """
+        Writes the saved states to the file save of the view unless it already contains the same states, where the file is replaced at once so that an interrupted save leaves the previous save intact
+        
+        Returns whether the file was written
+        """
+        data = pickle.dumps(saved_states)
+        save = (file_path, hashlib.sha256(data).hexdigest())
+        
+        if save == self.__last_save and os.path.exists(os.path.join(SAVES_PATH, file_path)):
+            return False
+            
+        with open_atomically(os.path.join(SAVES_PATH, file_path), "wb") as file_pickle:
+            file_pickle.write(data)
+            
+        self.__last_save = save
+        
+        return True
+        
     def set_currently_open_options(self, currently_open_options):
         # Already open
         if self.__currently_open_options == currently_open_options:
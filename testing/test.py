@@ -1,8 +1,15 @@
 import unittest
+import unittest.mock
+import numpy as np
 import tkinter as tk
 import sys
 import os
 import time
+import threading
+import queue
+import tempfile
+import json
+import pickle
 from tkinter import font
 from io import StringIO
 
@@ -14,9 +21,27 @@ for path in IMPORT_PATHS:
     
 from model import Model
 from script_interface import ScriptInterface
+from script_runner import ScriptRunner
+from script_registry import ScriptRegistry
+from script_profiler import ScriptProfiler
+from script_subprocess import SharedValueStore, SubprocessScriptInterface
+from script_result_cache import ScriptResult, ScriptResultCache, ScriptOutput, FirstCallRecorder, get_model_hashes
+from script_async import run_script_control
+from script_selector import Selector
 from configuration_class_calculation import ConfigurationClass
-from helper_functions_general import convert_grid_coordinate_to_actual, convert_actual_coordinate_to_grid
+from calculation_graph import CalculationGraph
+from calculation_snapshot import CalculationSnapshot
+from parallel_calculation import calculate_values_in_parallel, get_executor
+from calculation_model import CalculationModel
+from compact_save import save_compact, CompactSave, COMPACT_SAVE_FORMAT_VERSION
+from autosave import Autosaver
+from result_store import ResultStore, RESULT_STORE_FORMAT_VERSION
+from system_model_import import import_system_model, read_system_model, convert_imported_value_to_string, get_layers, get_layout, get_connection_offsets
+from attribute_export import export_compact_save, export_attribute_values, export_setup_classes
+from metamodel_library import MetamodelLibrary, migrate_save, replace_save_ids, get_reference_path, get_metamodel_id, split_metamodel_id, is_reference_path, get_metamodel_id_from_path
+from helper_functions_general import convert_grid_coordinate_to_actual, convert_actual_coordinate_to_grid, open_atomically, measure
 from default_coordinate_functions import get_block_start_coordinates
+from setup_class_gui import GUISetupClass
 from config import *
 
 # sys.stdout = StringIO() # Suppress prints
@@ -109,6 +134,7 @@ def setup_connection(output_setup_class, output_side, input_setup_class, input_s
         
     return connection
     
+# Base class of tests using the GUI, where tests of parts not using it derive from unittest.TestCase so that they also run without a display
 class Test(unittest.TestCase):
     def setUp(self, *, num_configuration_views=2, num_setup_views=4):
         """
@@ -187,7 +213,7 @@ class Test(unittest.TestCase):
         if view == None:
             view = self.get_setup_view()
             
-        setup_class_gui = view.create_setup_class_gui(setup_class_gui_to_copy=setup_class_gui)
+        setup_class_gui = self.model.create_linked_setup_class_gui(setup_class_gui, view)
         
         # Drag to a specified location
         if x != None and y != None:
@@ -677,6 +703,75 @@ class TestConnections(Test):
         
         self.assertEqual(len(input_setup_attribute.get_connected_setup_attributes()), 1)
         
+class TestScopedCalculation(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui)
+        
+        # Class 0 in view 0 with a linked copy in view 1 that is input to class 1, where class 2 in view 2 is unrelated
+        self.setup_class_gui_0 = self.setup_class(configuration_class_gui, x=10, y=10, view=self.get_setup_view(0))
+        linked_setup_class_gui_0 = self.linked_setup_class(self.setup_class_gui_0, x=10, y=10, view=self.get_setup_view(1))
+        self.setup_class_gui_1 = self.setup_class(configuration_class_gui, x=30, y=10, view=self.get_setup_view(1))
+        self.setup_class_gui_2 = self.setup_class(configuration_class_gui, x=10, y=10, view=self.get_setup_view(2))
+        
+        setup_connection(linked_setup_class_gui_0, "RIGHT", self.setup_class_gui_1, "LEFT")
+        
+    def test_upstream_setup_classes(self):
+        self.assertEqual(self.model.get_upstream_setup_classes(self.get_setup_view(0)), {self.setup_class_gui_0.get_setup_class()})
+        self.assertEqual(self.model.get_upstream_setup_classes(self.get_setup_view(1)), {self.setup_class_gui_0.get_setup_class(), self.setup_class_gui_1.get_setup_class()})
+        self.assertEqual(self.model.get_upstream_setup_classes(self.get_setup_view(3)), set())
+        
+    def test_stale_setup_views(self):
+        setup_attribute_2 = self.setup_class_gui_2.get_setup_class().get_setup_attributes()[0]
+        setup_attribute_2.set_value(("NOT CALCULATED",))
+        
+        # The value set directly differs from the text in the entry field, which is used when view 2 is calculated
+        self.model.calculate_values(scope_view=self.get_setup_view(1))
+        self.assertEqual(setup_attribute_2.get_value(), ("NOT CALCULATED",))
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(0), self.get_setup_view(2)})
+        
+        # Stale views are calculated when changed to
+        self.model.calculate_values(scope_view=self.get_setup_view(3))
+        self.setup_class_gui_2.get_setup_class().set_input_setup_class(self.setup_class_gui_0.get_setup_class())
+        self.model.calculate_values(scope_view=self.get_setup_view(1))
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(0), self.get_setup_view(2)})
+        
+        self.model.change_view(self.get_setup_view(2))
+        self.assertNotEqual(setup_attribute_2.get_value(), ("NOT CALCULATED",))
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(0), self.get_setup_view(1)})
+        
+        self.model.calculate_values()
+        self.assertEqual(self.model.get_stale_setup_views(), set())
+        
+    def test_stale_setup_views_entered_values(self):
+        # Views are found by following the connections once rather than once per view
+        with unittest.mock.patch.object(self.model, "get_upstream_setup_classes", wraps=self.model.get_upstream_setup_classes) as get_upstream_setup_classes:
+            self.model.calculate_values(scope_view=self.get_setup_view(1))
+            
+        self.assertEqual(get_upstream_setup_classes.call_count, 1)
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(0)})
+        
+        # Views with values entered but not calculated are also stale
+        self.model.calculate_values()
+        self.setup_class_gui_2.get_setup_attributes_gui()[0].set_displayed_value("ENTERED")
+        self.model.calculate_values(scope_view=self.get_setup_view(1))
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(0), self.get_setup_view(2)})
+        
+        self.model.change_view(self.get_setup_view(2))
+        self.assertEqual(self.setup_class_gui_2.get_setup_class().get_setup_attributes()[0].get_value(), ("ENTERED",))
+        
+    def test_calculate_current_values(self):
+        settings.set_calculate_current_view_only(True)
+        self.model.change_view(self.get_setup_view(0))
+        self.model.calculate_current_values()
+        self.assertEqual(self.model.get_stale_setup_views(), {self.get_setup_view(1)})
+        
+        settings.set_calculate_current_view_only(False)
+        self.model.calculate_current_values()
+        self.assertEqual(self.model.get_stale_setup_views(), set())
+        
 class TestCalculations(Test):
     def create_system(self, input_value_type, output_value_types, calculation_type):
         input_configuration_class = ConfigurationClass("Input")
@@ -734,6 +829,1212 @@ class TestCalculations(Test):
         self.check_calculation(CalculationTypeSampleTriangle, ValueTypeProbability, [ValueTypeTriangleDistribution]*2, ["1 / 2 / 3", "4 / 5 / 6"], "0")
         self.check_calculation(CalculationTypeSampleTriangle, ValueTypeProbability, [ValueTypeTriangleDistribution]*2, ["4 / 5 / 6", "1 / 2 / 3"], "1")
                 
+class TestCalculationGraph(unittest.TestCase):
+    def setUp(self):
+        value_configuration_class = ConfigurationClass("Value")
+        value_configuration_attribute = value_configuration_class.create_attribute("Value")
+        value_configuration_attribute.set_value_type(ValueTypeNumber)
+        
+        sum_configuration_class = ConfigurationClass("Sum")
+        sum_configuration_attribute = sum_configuration_class.create_attribute("Sum")
+        sum_configuration_attribute.set_value_type(ValueTypeNumber)
+        sum_configuration_attribute.set_calculation_type(CalculationTypeAND)
+        sum_configuration_attribute.add_input_configuration_attribute(value_configuration_attribute, False)
+        sum_configuration_attribute.add_input_configuration_attribute(sum_configuration_attribute, False)
+        
+        # Sum 1 = Value 1 + Value 2 and Sum 2 = Sum 1 + Value 2
+        self.value_setup_classes = [value_configuration_class.create_setup_version() for i in range(2)]
+        self.sum_setup_classes = [sum_configuration_class.create_setup_version() for i in range(2)]
+        
+        for setup_class, value in zip(self.value_setup_classes, ["1", "2"]):
+            setup_class.get_setup_attributes()[0].set_value(convert_string_to_value(value))
+            
+        for input_setup_class in self.value_setup_classes:
+            self.sum_setup_classes[0].set_input_setup_class(input_setup_class)
+            
+        self.sum_setup_classes[1].set_input_setup_class(self.sum_setup_classes[0])
+        self.sum_setup_classes[1].set_input_setup_class(self.value_setup_classes[1])
+        
+        self.setup_attributes = [setup_class.get_setup_attributes()[0] for setup_class in self.value_setup_classes + self.sum_setup_classes]
+        self.setup_attributes[-1].calculate_value()
+        
+        self.calculation_graph = CalculationGraph(self.sum_setup_classes[::-1] + self.value_setup_classes)
+        
+    def check_values(self, snapshot, values):
+        for setup_attribute, value in zip(self.setup_attributes, values):
+            self.assertEqual(convert_value_to_string(snapshot.get_current_value(setup_attribute)), value)
+            
+    def test_topological_order(self):
+        order = self.calculation_graph.get_topological_order()
+        
+        self.assertEqual(len(order), 4)
+        self.assertTrue(order.index(self.setup_attributes[0]) < order.index(self.setup_attributes[2]))
+        self.assertTrue(order.index(self.setup_attributes[1]) < order.index(self.setup_attributes[2]))
+        self.assertTrue(order.index(self.setup_attributes[2]) < order.index(self.setup_attributes[3]))
+        
+        self.assertEqual(self.calculation_graph.get_affected_setup_attributes([self.setup_attributes[0]]), self.setup_attributes[::2] + [self.setup_attributes[3]])
+        
+    def test_fork(self):
+        snapshot = CalculationSnapshot(self.calculation_graph)
+        self.check_values(snapshot, ("1", "2", "3", "5"))
+        
+        fork_1 = snapshot.fork()
+        fork_1.set_override_value(self.setup_attributes[0], convert_string_to_value("10"))
+        fork_1.calculate_values()
+        
+        fork_2 = snapshot.fork()
+        fork_2.set_override_value(self.setup_attributes[1], convert_string_to_value("0"))
+        fork_2.calculate_values()
+        
+        self.check_values(snapshot, ("1", "2", "3", "5"))
+        self.check_values(fork_1, ("10", "2", "12", "14"))
+        self.check_values(fork_2, ("1", "0", "1", "1"))
+        
+        # Only changed values are stored in the forks
+        self.assertEqual(fork_1.get_number_of_stored_values(), 3)
+        self.assertEqual(fork_2.get_number_of_stored_values(), 3)
+        
+        fork_3 = fork_1.fork()
+        fork_3.reset_override_value(self.setup_attributes[0])
+        fork_3.calculate_values()
+        self.check_values(fork_3, ("1", "2", "3", "5"))
+        
+        # The setup attributes are only changed when applying a snapshot
+        self.assertEqual(convert_value_to_string(self.setup_attributes[3].get_current_value()), "5")
+        fork_1.apply()
+        self.assertEqual(convert_value_to_string(self.setup_attributes[3].get_current_value()), "14")
+        
+    def test_calculate_values_in_steps(self):
+        snapshot = CalculationSnapshot(self.calculation_graph)
+        snapshot.set_override_value(self.setup_attributes[0], convert_string_to_value("10"))
+        
+        # Stopping after the first calculated setup attribute calculates all affected setup attributes again the next time
+        steps = snapshot.calculate_values_in_steps(1)
+        next(steps)
+        steps.close()
+        self.check_values(snapshot, ("10", "2", "12", "5"))
+        self.assertEqual(snapshot.get_changed_setup_attributes(), {self.setup_attributes[0]})
+        
+        self.assertEqual(len(list(snapshot.calculate_values_in_steps(1))), 2)
+        self.check_values(snapshot, ("10", "2", "12", "14"))
+        
+        # Setup attributes only used as input are read but not calculated
+        calculation_graph = CalculationGraph(self.sum_setup_classes)
+        self.assertEqual(set(calculation_graph.get_external_setup_attributes()), set(self.setup_attributes[:2]))
+        self.assertFalse(calculation_graph.has_setup_attribute(self.setup_attributes[0]))
+        
+    def test_connected_components(self):
+        independent_setup_class = self.value_setup_classes[0].get_setup_attributes()[0].get_configuration_attribute().get_configuration_class().create_setup_version()
+        calculation_graph = CalculationGraph(self.sum_setup_classes + self.value_setup_classes + [independent_setup_class])
+        
+        components = calculation_graph.get_connected_components()
+        self.assertEqual(sorted(len(component) for component in components), [1, 4])
+        
+        for component in components:
+            self.assertEqual(component, calculation_graph.sort_setup_attributes(component))
+            
+    def test_stream_values(self):
+        calculation_model = CalculationModel()
+        
+        for setup_class in self.value_setup_classes:
+            calculation_model.add_setup_class("VIEW 0", setup_class)
+            
+        for setup_class in self.sum_setup_classes:
+            calculation_model.add_setup_class("VIEW 1", setup_class)
+            
+        calculation_model.add_setup_class("VIEW 2", self.sum_setup_classes[1]) # Linked copy
+        
+        self.setup_attributes[0].set_override_value(convert_string_to_value("10"))
+        records = list(calculation_model.stream_values())
+        
+        self.assertEqual(len(records), 5)
+        self.assertEqual([(record[0], convert_value_to_string(record[4])) for record in records[-3:]], [("VIEW 1", "12"), ("VIEW 1", "14"), ("VIEW 2", "14")])
+        self.assertEqual(records[-1][1:4], ("Sum", "New instance", "Sum"))
+        
+        # Values are only given for the specified view, but calculated using all inputs
+        records = list(calculation_model.stream_values("VIEW 2"))
+        self.assertEqual([(record[0], convert_value_to_string(record[4])) for record in records], [("VIEW 2", "14")])
+        
+        # The values of the setup attributes are not changed
+        self.assertEqual(convert_value_to_string(self.setup_attributes[3].get_value()), "5")
+        
+    def test_parallel_calculation(self):
+        independent_setup_class = self.value_setup_classes[0].get_setup_attributes()[0].get_configuration_attribute().get_configuration_class().create_setup_version()
+        independent_setup_class.get_setup_attributes()[0].set_value(convert_string_to_value("5"))
+        calculation_graph = CalculationGraph(self.sum_setup_classes + self.value_setup_classes + [independent_setup_class])
+        
+        for num_processes in (1, 2):
+            for setup_class in self.sum_setup_classes:
+                setup_class.get_setup_attributes()[0].clear_value()
+                
+            self.setup_attributes[2].set_override_value(convert_string_to_value("10"))
+            calculate_values_in_parallel(calculation_graph, num_processes)
+            
+            self.assertEqual([convert_value_to_string(setup_attribute.get_current_value()) for setup_attribute in self.setup_attributes], ["1", "2", "10", "12"])
+            self.assertEqual(convert_value_to_string(self.setup_attributes[2].get_value()), "3")
+            
+            self.setup_attributes[2].reset_override_value()
+            
+        # The processes are kept between calculations, unless more are needed
+        executor = get_executor(2)
+        self.assertIs(get_executor(1), executor)
+        self.assertIsNot(get_executor(3), executor)
+        
+class TestCompactSave(Test):
+    def setUp(self):
+        super().setUp()
+        
+        # Sum takes the value of a class whose linked copy is in another view, where a class in an excluded view is left out
+        value_configuration_class_gui = self.configuration_class(x=20, y=20)
+        value_configuration_class_gui.set_name("VALUE")
+        value_configuration_attribute_gui = self.attribute(value_configuration_class_gui)
+        value_configuration_attribute_gui.set_name("VALUE")
+        value_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        self.attribute(value_configuration_class_gui).set_name("NOTE")
+        
+        sum_configuration_class_gui = self.configuration_class(x=10, y=10)
+        sum_configuration_class_gui.set_name("SUM")
+        sum_configuration_attribute_gui = self.attribute(sum_configuration_class_gui)
+        sum_configuration_attribute_gui.set_name("SUM")
+        sum_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        
+        configuration_input_gui = self.configuration_input()
+        drag_and_attach_input(configuration_input_gui, sum_configuration_attribute_gui, "LEFT")
+        configuration_input_gui.set_calculation_type(CalculationTypeAND)
+        configuration_connection(value_configuration_attribute_gui, "RIGHT", configuration_input_gui)
+        
+        self.value_setup_class_gui = self.setup_class(value_configuration_class_gui, x=10, y=10, view=self.get_setup_view(0))
+        self.linked_value_setup_class_gui = self.linked_setup_class(self.value_setup_class_gui, x=10, y=10, view=self.get_setup_view(1))
+        self.sum_setup_class_gui = self.setup_class(sum_configuration_class_gui, x=30, y=10, view=self.get_setup_view(1))
+        self.setup_class(value_configuration_class_gui, x=10, y=10, view=self.get_setup_view(3))
+        self.get_setup_view(3).set_excluded(True)
+        
+        setup_connection(self.linked_value_setup_class_gui, "RIGHT", self.sum_setup_class_gui, "LEFT")
+        
+        for setup_attribute, value in zip(self.value_setup_class_gui.get_setup_class().get_setup_attributes(), ["2", "A / 1"]):
+            setup_attribute.set_value(convert_string_to_value(value))
+            
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "model.npz")
+        save_compact(self.model, self.file_path)
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def test_calculation_model(self):
+        compact_save = CompactSave(self.file_path)
+        calculation_model = compact_save.create_calculation_model()
+        
+        setup_view_names = [setup_view.get_name() for setup_view in self.model.get_setup_views()]
+        self.assertEqual(compact_save.get_view_names(), setup_view_names)
+        self.assertEqual(calculation_model.get_view_names(), setup_view_names[:3])
+        
+        # Linked copies are the same setup class
+        self.assertEqual(len(calculation_model.get_setup_classes()), 2)
+        
+        records = list(calculation_model.stream_values())
+        self.assertEqual([(record[0], record[1], convert_value_to_string(record[4])) for record in records if record[3] == "VALUE"], [(setup_view_names[0], "VALUE", "2"), (setup_view_names[1], "VALUE", "2")])
+        self.assertEqual([(record[0], convert_value_to_string(record[4])) for record in records if record[3] == "SUM"], [(setup_view_names[1], "2")])
+        self.assertEqual([record[4] for record in records if record[3] == "NOTE"][0], ("A", 1.0))
+        
+    def test_layout(self):
+        compact_save = CompactSave(self.file_path)
+        setup_view_names = compact_save.get_view_names()
+        
+        class_ids_0, positions_0 = compact_save.get_layout(setup_view_names[0])
+        class_ids_1, positions_1 = compact_save.get_layout(setup_view_names[1])
+        
+        self.assertEqual(class_ids_0.tolist(), [class_ids_1[0]])
+        self.assertEqual(positions_1.tolist(), [[self.linked_value_setup_class_gui.get_x(), self.linked_value_setup_class_gui.get_y()], \
+                                                [self.sum_setup_class_gui.get_x(), self.sum_setup_class_gui.get_y()]])
+        self.assertEqual(len(compact_save.get_layout(self.get_configuration_view().get_name(), True)[0]), 2)
+        self.assertTrue(compact_save.is_excluded(setup_view_names[3]))
+        
+    def test_version(self):
+        with np.load(self.file_path) as file_save:
+            arrays = {name: file_save[name] for name in file_save.files}
+            
+        arrays["version"] = np.array(COMPACT_SAVE_FORMAT_VERSION+1)
+        np.savez_compressed(self.file_path, **arrays)
+        
+        with self.assertRaises(ValueError):
+            CompactSave(self.file_path)
+            
+class TestDeferredRestore(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        self.model._Model__mapping_configuration_class_gui[configuration_class_gui.get_save_id()] = configuration_class_gui
+        
+        # Setup views 0 and 1 share a linked setup class, while setup view 2 is unrelated
+        setup_class_gui_0 = self.setup_class(configuration_class_gui, x=10, y=10, view=self.get_setup_view(0))
+        setup_class_gui_0.set_name("LINKED")
+        self.model.create_linked_setup_class_gui(setup_class_gui_0, self.get_setup_view(1))
+        setup_class_gui_2 = self.setup_class(configuration_class_gui, x=10, y=10, view=self.get_setup_view(2))
+        
+        for setup_class_gui, value in ((setup_class_gui_0, "5"), (setup_class_gui_2, "7")):
+            setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value(value)
+            
+        self.model.calculate_values()
+        
+        # Read the saves of the setup views into new setup views
+        self.directory = tempfile.TemporaryDirectory()
+        self.restored_setup_views = []
+        
+        for i in range(3):
+            setup_view = self.get_setup_view(i)
+            file_path = os.path.join(self.directory.name, f"{i}.pickle")
+            
+            with open(file_path, "wb") as file_pickle:
+                pickle.dump((setup_view.get_grid_offset(), False, [setup_class_gui.save_state() for setup_class_gui in setup_view.get_setup_classes_gui()], []), file_pickle)
+                
+            restored_setup_view = self.model.create_view(False, f"RESTORED {i}")
+            restored_setup_view.load_save(file_path)
+            self.restored_setup_views.append(restored_setup_view)
+            
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def get_value(self, setup_view):
+        return convert_value_to_string(setup_view.get_setup_classes_gui()[0].get_setup_class().get_setup_attributes()[0].get_value())
+        
+    def test_restored_when_shown(self):
+        self.assertEqual([setup_view.is_restored() for setup_view in self.restored_setup_views], [False]*3)
+        
+        # Views not restored yet are left out when calculating
+        self.model.calculate_values()
+        self.assertEqual([setup_view.is_restored() for setup_view in self.restored_setup_views], [False]*3)
+        
+        # Setup views with linked copies in common are restored together
+        self.model.change_view(self.restored_setup_views[1])
+        self.assertEqual([setup_view.is_restored() for setup_view in self.restored_setup_views], [True, True, False])
+        self.assertEqual(self.get_value(self.restored_setup_views[1]), "5")
+        
+        # Linked groups get a new number if the number in the save is already used
+        setup_classes_gui = [setup_view.get_setup_classes_gui()[0] for setup_view in self.restored_setup_views[:2]]
+        self.assertIs(setup_classes_gui[0].get_setup_class(), setup_classes_gui[1].get_setup_class())
+        self.assertEqual(setup_classes_gui[0].get_linked_group_number(), setup_classes_gui[1].get_linked_group_number())
+        self.assertNotEqual(setup_classes_gui[0].get_linked_group_number(), self.get_setup_view(0).get_setup_classes_gui()[0].get_linked_group_number())
+        self.assertEqual(setup_classes_gui[1].get_name(), "LINKED")
+        
+        # Other setup views are restored where their blocks are needed, such as when scripts read them
+        self.assertEqual(self.restored_setup_views[2].get_setup_classes_gui(), [])
+        class_type = self.get_configuration_view().get_configuration_classes_gui()[0].get_name()
+        ScriptInterface(self.model).get_class_instance_names(class_type, "RESTORED 2")
+        
+        self.assertTrue(self.restored_setup_views[2].is_restored())
+        self.assertEqual(self.get_value(self.restored_setup_views[2]), "7")
+        
+    def test_not_restored_when_hashed(self):
+        model_hashes = get_model_hashes(self.model)
+        self.assertEqual([setup_view.is_restored() for setup_view in self.restored_setup_views], [False]*3)
+        self.assertEqual(get_model_hashes(self.model), model_hashes)
+        
+        # Setup views are described by their saves until restored
+        self.model.change_view(self.restored_setup_views[2])
+        self.assertNotEqual(get_model_hashes(self.model), model_hashes)
+        
+    def test_restored_before_configuration_change(self):
+        configuration_class_gui = self.get_configuration_view().get_configuration_classes_gui()[0]
+        self.attribute(configuration_class_gui)
+        
+        self.assertEqual([setup_view.is_restored() for setup_view in self.restored_setup_views], [True]*3)
+        self.assertEqual([len(setup_view.get_setup_classes_gui()[0].get_setup_attributes_gui()) for setup_view in self.restored_setup_views], [2]*3)
+        self.assertEqual(self.get_value(self.restored_setup_views[2]), "7")
+        
+class TestConnectionRestore(Test):
+    def setUp(self):
+        super().setUp()
+        
+        # Two connected setup classes among unrelated setup classes
+        input_configuration_class_gui = self.configuration_class(x=20, y=20)
+        input_configuration_attribute_gui = self.attribute(input_configuration_class_gui)
+        input_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        
+        configuration_input_gui = self.configuration_input()
+        drag_and_attach_input(configuration_input_gui, input_configuration_attribute_gui, "LEFT")
+        
+        output_configuration_class_gui = self.configuration_class(x=10, y=10)
+        output_configuration_attribute_gui = self.attribute(output_configuration_class_gui)
+        output_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        configuration_connection(output_configuration_attribute_gui, "RIGHT", configuration_input_gui)
+        configuration_input_gui.set_calculation_type(CalculationTypeMean)
+        
+        self.mapping_configuration_class_gui = {configuration_class_gui.get_save_id(): configuration_class_gui for configuration_class_gui in (input_configuration_class_gui, output_configuration_class_gui)}
+        
+        for i in range(5):
+            self.setup_class(output_configuration_class_gui, x=10 + 20*i, y=40)
+            
+        self.input_setup_class_gui = self.setup_class(input_configuration_class_gui, x=20, y=20)
+        self.output_setup_class_gui = self.setup_class(output_configuration_class_gui, x=10, y=10)
+        setup_connection(self.output_setup_class_gui, "RIGHT", self.input_setup_class_gui, "LEFT")
+        self.model.calculate_values()
+        
+        self.directory = tempfile.TemporaryDirectory()
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def restore(self, saved_states_setup_classes_gui, saved_states_connections_with_blocks):
+        """
+        Returns a new setup view restored from the saved states and the number of times setup classes were checked for adjacent connection ends while restoring
+        """
+        file_path = os.path.join(self.directory.name, "view.pickle")
+        
+        with open(file_path, "wb") as file_pickle:
+            pickle.dump(((0, 0), False, saved_states_setup_classes_gui, saved_states_connections_with_blocks), file_pickle)
+            
+        restored_setup_view = self.model.create_view(False, "RESTORED")
+        
+        with unittest.mock.patch.object(GUISetupClass, "is_adjacent", autospec=True, side_effect=GUISetupClass.is_adjacent) as is_adjacent:
+            restored_setup_view.restore_save(file_path, self.mapping_configuration_class_gui, {})
+            
+        return restored_setup_view, is_adjacent.call_count
+        
+    def get_connected_names(self, setup_view):
+        return [(connection.get_start_setup_class_gui().get_name(), connection.get_end_setup_class_gui().get_name()) for connection in setup_view._SetupView__connections_with_blocks]
+        
+    def test_restored_by_save_id(self):
+        setup_view = self.get_setup_view()
+        saved_states_setup_classes_gui = [setup_class_gui.save_state() for setup_class_gui in setup_view.get_setup_classes_gui()]
+        saved_states_connections_with_blocks = [connection.save_state() for connection in setup_view._SetupView__connections_with_blocks]
+        
+        self.assertEqual(saved_states_connections_with_blocks[0]["start_block"]["setup_class_gui"], self.output_setup_class_gui.get_save_id())
+        self.assertEqual(saved_states_connections_with_blocks[0]["end_block"]["setup_class_gui"], self.input_setup_class_gui.get_save_id())
+        
+        # Only the setup class with the saved ID is checked for each end
+        restored_setup_view, num_checked = self.restore(saved_states_setup_classes_gui, saved_states_connections_with_blocks)
+        self.assertEqual(self.get_connected_names(restored_setup_view), self.get_connected_names(setup_view))
+        self.assertEqual(num_checked, 2)
+        
+        restored_setup_classes_gui = restored_setup_view.get_setup_classes_gui()
+        self.assertEqual([setup_class_gui.get_save_id() for setup_class_gui in restored_setup_classes_gui], [setup_class_gui.get_save_id() for setup_class_gui in setup_view.get_setup_classes_gui()])
+        self.assertIn(restored_setup_classes_gui[-1].get_setup_class(), restored_setup_classes_gui[-2].get_setup_class().get_input_setup_classes())
+        
+    def test_restored_by_coordinates(self):
+        # Saves from before setup classes had save IDs
+        setup_view = self.get_setup_view()
+        saved_states_setup_classes_gui = [setup_class_gui.save_state() for setup_class_gui in setup_view.get_setup_classes_gui()]
+        saved_states_connections_with_blocks = [connection.save_state() for connection in setup_view._SetupView__connections_with_blocks]
+        
+        for saved_states in saved_states_setup_classes_gui + [saved_states_connections_with_blocks[0]["start_block"], saved_states_connections_with_blocks[0]["end_block"]]:
+            del saved_states["setup_class_gui"]
+            
+        restored_setup_view, num_checked = self.restore(saved_states_setup_classes_gui, saved_states_connections_with_blocks)
+        self.assertEqual(self.get_connected_names(restored_setup_view), self.get_connected_names(setup_view))
+        self.assertGreater(num_checked, 2)
+        
+class TestIncrementalSave(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        self.setup_attribute_gui = self.setup_class(configuration_class_gui, x=10, y=10).get_setup_attributes_gui()[0]
+        self.setup_attribute_gui.set_displayed_value("5")
+        
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "view.pickle")
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def get_saved_states(self, setup_view):
+        return (setup_view.get_grid_offset(), False, [setup_class_gui.save_state() for setup_class_gui in setup_view.get_setup_classes_gui()], [])
+        
+    def test_only_changed_views_written(self):
+        self.model.calculate_values()
+        setup_view = self.get_setup_view()
+        
+        self.assertTrue(setup_view.write_save(self.file_path, self.get_saved_states(setup_view)))
+        self.assertFalse(setup_view.write_save(self.file_path, self.get_saved_states(setup_view)))
+        
+        self.setup_attribute_gui.set_displayed_value("6")
+        self.model.calculate_values()
+        self.assertTrue(setup_view.write_save(self.file_path, self.get_saved_states(setup_view)))
+        
+        # A view read from the file is not written again until it changes
+        restored_setup_view = self.model.create_view(False, "RESTORED")
+        restored_setup_view.load_save(self.file_path)
+        self.assertFalse(restored_setup_view.write_save(self.file_path, self.get_saved_states(setup_view)))
+        self.assertEqual(os.listdir(self.directory.name), ["view.pickle"])
+        
+    def test_interrupted_write_keeps_file(self):
+        with open_atomically(self.file_path) as file:
+            file.write("SAVED")
+            
+        with self.assertRaises(RuntimeError):
+            with open_atomically(self.file_path) as file:
+                file.write("PARTIAL")
+                raise RuntimeError()
+                
+        with open(self.file_path, "r") as file:
+            self.assertEqual(file.read(), "SAVED")
+            
+        self.assertEqual(os.listdir(self.directory.name), ["view.pickle"])
+        
+    def test_current_values(self):
+        self.model.calculate_values()
+        self.assertTrue(self.model.has_current_values())
+        
+        # Entered values are not current until calculated
+        self.setup_attribute_gui.set_displayed_value("6")
+        self.assertFalse(self.model.has_current_values())
+        
+        self.model.calculate_values()
+        self.assertTrue(self.model.has_current_values())
+        
+        self.setup_class(self.get_configuration_view().get_configuration_classes_gui()[0])
+        self.assertFalse(self.model.has_current_values())
+        
+class TestSavedValues(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        self.model._Model__mapping_configuration_class_gui[configuration_class_gui.get_save_id()] = configuration_class_gui
+        
+        setup_class_gui = self.setup_class(configuration_class_gui, x=10, y=10)
+        setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("5")
+        self.model.calculate_values()
+        
+        self.directory = tempfile.TemporaryDirectory()
+        file_path = os.path.join(self.directory.name, "saved.pickle")
+        
+        with open(file_path, "wb") as file_pickle:
+            pickle.dump(self.get_setup_view(0).get_saved_states(), file_pickle)
+            
+        self.restored_setup_view = self.model.create_view(False, "RESTORED")
+        self.restored_setup_view.load_save(file_path)
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def test_restored_without_calculating(self):
+        self.model.use_saved_values()
+        setup_class_gui = self.get_setup_view(0).get_setup_classes_gui()[0]
+        
+        with unittest.mock.patch.object(type(setup_class_gui), "calculate_values") as calculate_values:
+            self.model.change_view(self.restored_setup_view)
+            
+        calculate_values.assert_not_called()
+        self.assertEqual(convert_value_to_string(self.restored_setup_view.get_setup_classes_gui()[0].get_setup_class().get_setup_attributes()[0].get_value()), "5")
+        
+        # Creating the blocks of a save does not discard the values of the other saves
+        self.assertTrue(self.model.has_saved_values())
+        
+    def test_discarded_after_changes(self):
+        configuration_attribute_gui = self.model.get_configuration_views()[0].get_configuration_classes_gui()[0].get_configuration_attributes_gui()[0]
+        setup_class_gui = self.get_setup_view(0).get_setup_classes_gui()[0]
+        
+        # Setup views restored after the metamodel changes are calculated
+        self.model.use_saved_values()
+        configuration_attribute_gui.set_input_offset(1.0)
+        self.assertFalse(self.model.has_saved_values())
+        
+        with unittest.mock.patch.object(type(setup_class_gui), "calculate_values") as calculate_values:
+            self.model.change_view(self.restored_setup_view)
+            
+        calculate_values.assert_called()
+        self.assertEqual(convert_value_to_string(self.restored_setup_view.get_setup_classes_gui()[0].get_setup_class().get_setup_attributes()[0].get_value()), "5")
+        
+        # Calculating values or changing the blocks also discards the saved values
+        for discard in (self.model.calculate_values, self.model.increment_version):
+            self.model.use_saved_values()
+            self.assertTrue(self.model.has_saved_values())
+            discard()
+            self.assertFalse(self.model.has_saved_values())
+            
+    def test_saved_values_hash(self):
+        saved_values_hash = self.model.get_saved_values_hash()
+        num_samples = settings.get_num_samples()
+        self.model.use_saved_values()
+        
+        try:
+            settings.set_num_samples(num_samples + 1)
+            self.assertFalse(self.model.has_saved_values())
+            self.assertNotEqual(self.model.get_saved_values_hash(), saved_values_hash)
+        finally:
+            settings.set_num_samples(num_samples)
+            
+        # Saves that change after being read do not match the hash
+        self.restored_setup_view.write_save(os.path.join(self.directory.name, "saved.pickle"), (self.restored_setup_view.get_grid_offset(), True, [], []))
+        self.assertNotEqual(self.model.get_saved_values_hash(), saved_values_hash)
+        
+class TestAutosave(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        self.model._Model__mapping_configuration_class_gui[configuration_class_gui.get_save_id()] = configuration_class_gui
+        
+        setup_class_gui = self.setup_class(configuration_class_gui, x=10, y=10)
+        self.model.create_linked_setup_class_gui(setup_class_gui, self.get_setup_view(1))
+        setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("5")
+        self.model.calculate_values()
+        
+        self.directory = tempfile.TemporaryDirectory()
+        self.autosaver = Autosaver(self.directory.name)
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def test_rotation(self):
+        autosave_paths = [self.autosaver.write(self.model.get_saved_states_views(), 2)]
+        
+        # Nothing is written if nothing has changed
+        self.assertEqual(self.autosaver.write(self.model.get_saved_states_views(), 2), None)
+        
+        for value in ["6", "7"]:
+            self.get_setup_view(0).get_setup_classes_gui()[0].get_setup_attributes_gui()[0].set_displayed_value(value)
+            self.model.calculate_values()
+            autosave_paths.append(self.autosaver.write(self.model.get_saved_states_views(), 2))
+            
+        self.assertEqual(self.autosaver.get_autosave_paths(), autosave_paths[1:])
+        
+        with open(os.path.join(autosave_paths[-1], "view_file_paths.txt"), "r") as file_with_paths:
+            file_paths = [line.strip() for line in file_with_paths]
+            
+        self.assertEqual(file_paths, [view.get_save_file_path() for view in self.model.get_configuration_views() + self.model.get_setup_views()])
+        
+        restored_setup_view = self.model.create_view(False, "RESTORED")
+        restored_setup_view.load_save(os.path.join(autosave_paths[-1], file_paths[len(self.model.get_configuration_views())]))
+        self.model.restore_deferred_setup_view(restored_setup_view)
+        self.assertEqual(convert_value_to_string(restored_setup_view.get_setup_classes_gui()[0].get_setup_class().get_setup_attributes()[0].get_value()), "7")
+        
+    def test_in_background(self):
+        self.assertTrue(self.autosaver.autosave(self.model.get_saved_states_views(), 1))
+        self.autosaver.wait()
+        
+        self.assertFalse(self.autosaver.is_writing())
+        self.assertEqual(len(self.autosaver.get_autosave_paths()), 1)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), [os.path.basename(self.autosaver.get_autosave_paths()[0])])
+        
+    def test_deferred_linked_group_numbers(self):
+        file_path = os.path.join(self.directory.name, "deferred.pickle")
+        setup_view = self.get_setup_view(0)
+        
+        with open(file_path, "wb") as file_pickle:
+            pickle.dump(setup_view.get_saved_states(), file_pickle)
+            
+        # Setup views that have not been restored yet keep their own linked groups
+        deferred_setup_view = self.model.create_view(False, "DEFERRED")
+        deferred_setup_view.load_save(file_path)
+        
+        saved_states_views = dict(self.model.get_saved_states_views())
+        linked_group_number = saved_states_views[setup_view.get_save_file_path()][2][0]["linked_group_number"]
+        deferred_linked_group_number = saved_states_views[deferred_setup_view.get_save_file_path()][2][0]["linked_group_number"]
+        
+        self.assertFalse(deferred_setup_view.is_restored())
+        self.assertNotEqual(deferred_linked_group_number, None)
+        self.assertNotEqual(deferred_linked_group_number, linked_group_number)
+        
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.result_store = ResultStore(self.directory.name)
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_append_and_reopen(self):
+        self.result_store.add_column(("CLASS", "INSTANCE", "NUMBER"))
+        self.result_store.add_column(("CLASS", "INSTANCE", "TRIANGLE"), (3,))
+        
+        self.result_store.append({("CLASS", "INSTANCE", "NUMBER"): [1, 2], ("CLASS", "INSTANCE", "TRIANGLE"): [[1, 2, 3], [4, 5, 6]]})
+        self.result_store.append_row([3, [7, 8, 9]])
+        
+        with self.assertRaises(ValueError):
+            self.result_store.append_row([4, [10, 11]])
+            
+        # Rows appended are kept when opened again, where the column files are also valid NumPy files
+        result_store = ResultStore(self.directory.name)
+        self.assertEqual(result_store.get_num_rows(), 3)
+        self.assertEqual(result_store.get_keys(), [("CLASS", "INSTANCE", "NUMBER"), ("CLASS", "INSTANCE", "TRIANGLE")])
+        self.assertIsInstance(result_store.get_column(("CLASS", "INSTANCE", "TRIANGLE")), np.memmap)
+        np.testing.assert_array_equal(result_store.get_column(("CLASS", "INSTANCE", "NUMBER")), [1, 2, 3])
+        np.testing.assert_array_equal(np.load(os.path.join(self.directory.name, "1.npy")), [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        
+    def test_interrupted_append(self):
+        self.result_store.add_column(("NUMBER",))
+        self.result_store.append_row([1])
+        
+        # Values written without updating the index are removed by the next append
+        with open(os.path.join(self.directory.name, "0.npy"), "ab") as file_column:
+            file_column.write(np.array([99.0]).tobytes())
+            
+        result_store = ResultStore(self.directory.name)
+        result_store.append_row([2])
+        np.testing.assert_array_equal(np.load(os.path.join(self.directory.name, "0.npy")), [1, 2])
+        
+    def test_invalid_columns(self):
+        self.result_store.add_column(("NUMBER",))
+        self.result_store.add_column(("TEXT",), dtype="U4")
+        self.assertEqual(self.result_store.get_column(("NUMBER",)).shape, (0,))
+        
+        with self.assertRaises(ValueError):
+            self.result_store.add_column(("NUMBER",))
+            
+        with self.assertRaises(ValueError):
+            self.result_store.append({("NUMBER",): [1]})
+            
+        with self.assertRaises(ValueError):
+            self.result_store.get_column(("MISSING",))
+            
+        # Columns can not be added once rows are appended
+        self.result_store.append_row({("NUMBER",): 1, ("TEXT",): "ABCD"})
+        self.assertEqual(list(self.result_store.get_column(("TEXT",))), ["ABCD"])
+        
+        with self.assertRaises(ValueError):
+            self.result_store.add_column(("OTHER",))
+            
+        # Result stores saved by later versions of the program are not read
+        with open(self.result_store.get_index_path(), "r") as file_index:
+            index = json.load(file_index)
+            
+        index["version"] = RESULT_STORE_FORMAT_VERSION + 1
+        
+        with open(self.result_store.get_index_path(), "w") as file_index:
+            json.dump(index, file_index)
+            
+        with self.assertRaises(ValueError):
+            ResultStore(self.directory.name)
+            
+class TestResultStoreScripts(Test):
+    def setUp(self):
+        super().setUp()
+        
+        self.directory = tempfile.TemporaryDirectory()
+        self.result_store = ResultStore(self.directory.name)
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def number_setup_class(self):
+        """
+        Returns a setup class INSTANCE of the class type CLASS with a number attribute NUMBER
+        """
+        configuration_class_gui = self.configuration_class()
+        configuration_class_gui.set_name("CLASS")
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        configuration_class_gui.get_configuration_attributes_gui()[0].set_name("NUMBER")
+        setup_class_gui = self.setup_class(configuration_class_gui)
+        setup_class_gui.set_name("INSTANCE")
+        
+        return setup_class_gui
+        
+    def test_append_attribute_values(self):
+        setup_class_gui = self.number_setup_class()
+        script_interface = ScriptInterface(self.model)
+        key = ("CLASS", "INSTANCE", "NUMBER")
+        
+        for value in ["5", "6", "TEXT"]:
+            setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value(value)
+            self.model.calculate_values()
+            script_interface.append_attribute_values(self.result_store, [key])
+            
+        np.testing.assert_array_equal(self.result_store.get_column(key), [[5], [6], [np.nan]])
+        
+    def test_append_in_background(self):
+        setup_class_gui = self.number_setup_class()
+        setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("5")
+        key = ("CLASS", "INSTANCE", "NUMBER")
+        
+        def script_control(script_if):
+            result_store = script_if.open_result_store("RESULTS")
+            script_if.append_attribute_values(result_store, [key])
+            script_if.override_attribute_values("6", "CLASS")
+            script_if.calculate_values()
+            script_if.append_attribute_values(result_store, [key])
+            
+        # Scripts running in the background append the values of their snapshot
+        script_runner = ScriptRunner(self.model, ScriptInterface(self.model), "SCRIPT")
+        
+        with unittest.mock.patch("script_interface.SCRIPT_RESULTS_PATH", self.directory.name):
+            script_runner.run_in_background(script_control)
+            script_runner.get_thread().join()
+            
+        script_runner.handle_messages()
+        np.testing.assert_array_equal(ResultStore(os.path.join(self.directory.name, "RESULTS")).get_column(key), [[5], [6]])
+        
+class TestSystemModelImport(Test):
+    def setUp(self):
+        super().setUp()
+        
+        # A SOURCE class whose attribute is the input of the attribute of a TARGET class
+        source_configuration_class_gui = self.configuration_class(x=10, y=10)
+        source_configuration_class_gui.set_name("SOURCE")
+        self.attribute(source_configuration_class_gui).set_value_type(ValueTypeNumber)
+        source_configuration_class_gui.get_configuration_attributes_gui()[0].set_name("NUMBER")
+        
+        target_configuration_class_gui = self.configuration_class(x=20, y=20)
+        target_configuration_class_gui.set_name("TARGET")
+        target_configuration_attribute_gui = self.attribute(target_configuration_class_gui)
+        target_configuration_attribute_gui.set_name("SUM")
+        target_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        
+        configuration_input_gui = self.configuration_input()
+        drag_and_attach_input(configuration_input_gui, target_configuration_attribute_gui, "LEFT")
+        configuration_connection(source_configuration_class_gui.get_configuration_attributes_gui()[0], "RIGHT", configuration_input_gui)
+        configuration_input_gui.set_calculation_type(CalculationTypeMean)
+        
+        self.directory = tempfile.TemporaryDirectory()
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def test_import_json(self):
+        file_path = os.path.join(self.directory.name, "system.json")
+        
+        with open(file_path, "w") as file_json:
+            json.dump({"instances": [{"class_type": "TARGET", "class_instance": "T"}, \
+                                     {"class_type": "SOURCE", "class_instance": "A", "values": {"NUMBER": 5}}, \
+                                     {"class_type": "SOURCE", "class_instance": "B", "values": {"NUMBER": "7"}}], \
+                       "connections": [{"source_class_type": "SOURCE", "source_class_instance": "A", "target_class_type": "TARGET", "target_class_instance": "T"}, \
+                                       {"source_class_type": "SOURCE", "source_class_instance": "B", "target_class_type": "TARGET", "target_class_instance": "T", "input_scalars": [2]}]}, file_json)
+                                       
+        setup_view = self.get_setup_view(0)
+        target_setup_class_gui, source_a_setup_class_gui, source_b_setup_class_gui = import_system_model(setup_view, file_path)
+        
+        self.assertEqual([setup_class_gui.get_name() for setup_class_gui in setup_view.get_setup_classes_gui()], ["T", "A", "B"])
+        self.assertEqual(len(setup_view._SetupView__connections_with_blocks), 2)
+        self.assertEqual(set(target_setup_class_gui.get_setup_class().get_input_setup_classes()), {source_a_setup_class_gui.get_setup_class(), source_b_setup_class_gui.get_setup_class()})
+        
+        # Sources are placed above their targets, and next to each other
+        self.assertLess(source_a_setup_class_gui.get_y(), target_setup_class_gui.get_y())
+        self.assertEqual(source_a_setup_class_gui.get_y(), source_b_setup_class_gui.get_y())
+        self.assertNotEqual(source_a_setup_class_gui.get_x(), source_b_setup_class_gui.get_x())
+        
+        # Mean of 5 and 2*7
+        self.assertEqual(target_setup_class_gui.get_setup_attributes_gui()[0].get_setup_attribute().get_value(), (9.5,))
+        
+    def test_import_csv(self):
+        file_path = os.path.join(self.directory.name, "system.csv")
+        
+        with open(file_path, "w") as file_csv:
+            file_csv.write("class_type,class_instance,NUMBER\nSOURCE,A,5\nTARGET,T,\n")
+            
+        with open(os.path.join(self.directory.name, "system_connections.csv"), "w") as file_csv:
+            file_csv.write("source_class_type,source_class_instance,target_class_type,target_class_instance,input_scalars\n")
+            file_csv.write("SOURCE,A,TARGET,T,\nSOURCE,A,TARGET,T,\n") # Connected twice, where the second connection is skipped
+            
+        source_setup_class_gui, target_setup_class_gui = import_system_model(self.get_setup_view(0), file_path)
+        
+        self.assertEqual(len(self.get_setup_view(0)._SetupView__connections_with_blocks), 1)
+        self.assertEqual(target_setup_class_gui.get_setup_attributes_gui()[0].get_setup_attribute().get_value(), (5.0,))
+        
+        # Imported again, the instances are placed below those already in the view
+        import_system_model(self.get_setup_view(0), file_path)
+        self.assertGreater(self.get_setup_view(0).get_setup_classes_gui()[2].get_y(), target_setup_class_gui.get_y())
+        
+    def test_invalid_file(self):
+        file_path = os.path.join(self.directory.name, "system.json")
+        
+        with open(file_path, "w") as file_json:
+            json.dump({"instances": [{"class_type": "SOURCE", "class_instance": "A"}, {"class_type": "MISSING", "class_instance": "B"}]}, file_json)
+            
+        # No blocks are created when any part of the file is invalid
+        with self.assertRaises(ValueError):
+            import_system_model(self.get_setup_view(0), file_path)
+            
+        self.assertEqual(len(self.get_setup_view(0).get_setup_classes_gui()), 0)
+        
+class TestSystemModelFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_read_csv(self):
+        file_path = os.path.join(self.directory.name, "system.csv")
+        
+        with open(file_path, "w") as file_csv:
+            file_csv.write("class_type,class_instance,NUMBER,TEXT\nSOURCE,A,5,\nTARGET,T,,B\n")
+            
+        # Without a file with connections next to it
+        self.assertEqual(read_system_model(file_path), ([{"class_type": "SOURCE", "class_instance": "A", "values": {"NUMBER": "5"}}, \
+                                                         {"class_type": "TARGET", "class_instance": "T", "values": {"TEXT": "B"}}], []))
+                                                         
+        with open(os.path.join(self.directory.name, "system_connections.csv"), "w") as file_csv:
+            file_csv.write("source_class_type,source_class_instance,target_class_type,target_class_instance,input_scalars\n")
+            file_csv.write("SOURCE,A,TARGET,T,\nSOURCE,A,TARGET,T,2\n")
+            
+        connection = {"source_class_type": "SOURCE", "source_class_instance": "A", "target_class_type": "TARGET", "target_class_instance": "T"}
+        self.assertEqual(read_system_model(file_path)[1], [connection, {**connection, "input_scalars": "2"}])
+        
+        with self.assertRaises(ValueError):
+            read_system_model(os.path.join(self.directory.name, "system.txt"))
+            
+    def test_convert_imported_value(self):
+        self.assertEqual(convert_imported_value_to_string("7 / 8"), "7 / 8")
+        self.assertEqual(convert_imported_value_to_string([5, 10]), "5 / 10")
+        self.assertEqual(convert_imported_value_to_string(5), "5")
+        
+    def test_layout(self):
+        # Each instance is placed one layer below the lowest of its sources, where instances in a cycle are placed last
+        self.assertEqual(get_layers(4, [(0, 2), (1, 2), (2, 3), (0, 3)]), [0, 0, 1, 2])
+        self.assertEqual(get_layers(3, [(0, 1), (1, 2), (2, 1)]), [0, 2, 2])
+        
+        positions = get_layout([2, 3, 1, 1], [(0, 2), (1, 2), (2, 3)], (10, 20))
+        column_width = CLASS_WIDTH + SETUP_WIDTH_ADDITION + IMPORT_LAYOUT_SPACING_X
+        self.assertEqual(positions, [(10, 20), (10 + column_width, 20), (10, 23 + IMPORT_LAYOUT_SPACING_Y), (10, 24 + 2*IMPORT_LAYOUT_SPACING_Y)])
+        
+        # Layers with too many instances are split over multiple rows
+        positions = get_layout([1] * (IMPORT_LAYOUT_MAX_COLUMNS + 1), [], (0, 0))
+        self.assertEqual(positions[-1], (0, 1 + IMPORT_LAYOUT_SPACING_Y))
+        
+        # Connections are spread over the width of the setup classes
+        offsets = get_connection_offsets(3)
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertTrue(0 < offsets[0] and offsets[-1] < CLASS_WIDTH + SETUP_WIDTH_ADDITION)
+        self.assertEqual(len(get_connection_offsets(2 * (CLASS_WIDTH + SETUP_WIDTH_ADDITION))), 2 * (CLASS_WIDTH + SETUP_WIDTH_ADDITION))
+        
+class TestAttributeExport(Test):
+    def setUp(self):
+        super().setUp()
+        
+        for i, class_type in enumerate(["CLASS", "OTHER"]):
+            configuration_class_gui = self.configuration_class(x=10, y=10+10*i)
+            configuration_class_gui.set_name(class_type)
+            self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+            self.attribute(configuration_class_gui)
+            configuration_class_gui.get_configuration_attributes_gui()[0].set_name("NUMBER")
+            configuration_class_gui.get_configuration_attributes_gui()[1].set_name("TEXT")
+            
+            for j, (number, text) in enumerate([("5", "A"), ("TEXT", "B")]):
+                setup_class_gui = self.setup_class(configuration_class_gui, x=10+20*j, y=10+10*i)
+                setup_class_gui.set_name(f"{class_type} {j}")
+                setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value(number)
+                setup_class_gui.get_setup_attributes_gui()[1].set_displayed_value(text)
+                
+        self.model.calculate_values()
+        self.script_if = ScriptInterface(self.model)
+        self.directory = tempfile.TemporaryDirectory()
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def read(self, file_name):
+        with open(os.path.join(self.directory.name, file_name), "r") as file_export:
+            return file_export.read()
+            
+    def test_export_formats(self):
+        self.script_if.export_attribute_values(os.path.join(self.directory.name, "export.csv"), ["CLASS"])
+        self.assertEqual(self.read("export.csv"), "class_type,class_instance,NUMBER,TEXT\nCLASS,CLASS 0,5,A\nCLASS,CLASS 1,TEXT,B\n")
+        
+        self.script_if.export_attribute_values(os.path.join(self.directory.name, "export.jsonl"), attributes=["NUMBER"])
+        rows = [json.loads(line) for line in self.read("export.jsonl").splitlines()]
+        self.assertEqual([row["class_instance"] for row in rows], ["CLASS 0", "CLASS 1", "OTHER 0", "OTHER 1"])
+        self.assertEqual(rows[0], {"class_type": "CLASS", "class_instance": "CLASS 0", "values": {"NUMBER": [5.0]}})
+        
+        # Values that are not numbers are NaN among numbers, while attributes without numbers are stored as strings
+        self.script_if.export_attribute_values(os.path.join(self.directory.name, "export.npz"))
+        
+        with np.load(os.path.join(self.directory.name, "export.npz")) as arrays:
+            self.assertEqual(arrays["class_instances/OTHER"].tolist(), ["OTHER 0", "OTHER 1"])
+            np.testing.assert_array_equal(arrays["values/OTHER/NUMBER"], [[5], [np.nan]])
+            self.assertEqual(arrays["values/OTHER/TEXT"].tolist(), ["A", "B"])
+            
+        with self.assertRaises(ValueError):
+            self.script_if.export_attribute_values(os.path.join(self.directory.name, "export.txt"))
+            
+    def test_same_export_everywhere(self):
+        self.script_if.export_attribute_values(os.path.join(self.directory.name, "export.csv"))
+        
+        # Scripts running in a separate process
+        shared_value_store = SharedValueStore(self.model)
+        
+        try:
+            script_if = SubprocessScriptInterface(shared_value_store.get_index(), queue.Queue())
+            script_if.export_attribute_values(os.path.join(self.directory.name, "subprocess.csv"))
+            script_if.close()
+        finally:
+            shared_value_store.close()
+            
+        # Without any GUI, from the compact save
+        save_compact(self.model, os.path.join(self.directory.name, "model.npz"))
+        export_compact_save(os.path.join(self.directory.name, "model.npz"), os.path.join(self.directory.name, "compact.csv"))
+        
+        self.assertEqual(self.read("subprocess.csv"), self.read("export.csv"))
+        self.assertEqual(self.read("compact.csv"), self.read("export.csv"))
+        
+    def test_export_script_in_background(self):
+        configuration_class_gui = self.configuration_class(x=10, y=30)
+        configuration_class_gui.set_name("Loss event")
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        configuration_class_gui.get_configuration_attributes_gui()[0].set_name("NUMBER")
+        setup_class_gui = self.setup_class(configuration_class_gui, x=10, y=30)
+        setup_class_gui.set_name("Data breach")
+        setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("7")
+        
+        # The export script runs in the background by default, where the values are read from the snapshot of the script
+        script_runner = ScriptRunner(self.model, self.script_if, "Export to CSV")
+        runs_scripts_in_background = settings.runs_scripts_in_background()
+        settings.set_run_scripts_in_background(True)
+        
+        try:
+            with unittest.mock.patch("script_interface.SCRIPT_RESULTS_PATH", self.directory.name), unittest.mock.patch("sys.stdout", StringIO()):
+                script_runner.press(self.model.get_script_registry().get_script_control("Export to CSV"))
+                script_runner.get_thread().join()
+                script_runner.handle_messages()
+        finally:
+            settings.set_run_scripts_in_background(runs_scripts_in_background)
+            
+        self.assertEqual(self.read("Export.csv"), "class_type,class_instance,NUMBER\nLoss event,Data breach,7\n")
+        
+class TestAttributeExportFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.attribute_names_per_class_type = {"A": ["NUMBER", "TEXT"], "B": ["NUMBER"]}
+        self.rows = [("A", "A 0", {"NUMBER": (1.0,), "TEXT": ("X",)}), \
+                     ("A", "A 1", {"NUMBER": ("SETUP ERROR",), "TEXT": None}), \
+                     ("B", "B 0", {"NUMBER": (1.0, 2.0, 3.0)})]
+                     
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def read(self, file_name):
+        with open(os.path.join(self.directory.name, file_name), "r") as file_export:
+            return file_export.read()
+            
+    def test_export_rows(self):
+        self.assertEqual(export_attribute_values(os.path.join(self.directory.name, "export.csv"), self.attribute_names_per_class_type, iter(self.rows)), 3)
+        self.assertEqual(self.read("export.csv"), "class_type,class_instance,NUMBER,TEXT\nA,A 0,1,X\nA,A 1,SETUP ERROR,\nB,B 0,1 / 2 / 3,\n")
+        
+        export_attribute_values(os.path.join(self.directory.name, "export.jsonl"), self.attribute_names_per_class_type, iter(self.rows))
+        self.assertEqual([json.loads(line) for line in self.read("export.jsonl").splitlines()][1], {"class_type": "A", "class_instance": "A 1", "values": {"NUMBER": ["SETUP ERROR"], "TEXT": None}})
+        
+        # Values that are not numbers are NaN in arrays of numbers
+        export_attribute_values(os.path.join(self.directory.name, "export.npz"), self.attribute_names_per_class_type, iter(self.rows))
+        
+        with np.load(os.path.join(self.directory.name, "export.npz")) as arrays:
+            self.assertEqual(list(arrays["class_instances/A"]), ["A 0", "A 1"])
+            np.testing.assert_array_equal(arrays["values/A/NUMBER"], [[1], [np.nan]])
+            self.assertEqual(list(arrays["values/A/TEXT"]), ["X", ""])
+            np.testing.assert_array_equal(arrays["values/B/NUMBER"], [[1, 2, 3]])
+            
+    def test_failed_export(self):
+        export_attribute_values(os.path.join(self.directory.name, "export.npz"), self.attribute_names_per_class_type, iter(self.rows))
+        
+        with self.assertRaises(ValueError):
+            export_attribute_values(os.path.join(self.directory.name, "export.txt"), self.attribute_names_per_class_type, iter(self.rows))
+            
+        # The rows of each class type have to follow each other in .npz files, where the previous file is kept when failing
+        with self.assertRaises(ValueError):
+            export_attribute_values(os.path.join(self.directory.name, "export.npz"), self.attribute_names_per_class_type, iter(self.rows + self.rows[:1]))
+            
+        with np.load(os.path.join(self.directory.name, "export.npz")) as arrays:
+            self.assertEqual(list(arrays["class_instances/A"]), ["A 0", "A 1"])
+            
+        self.assertEqual(os.listdir(self.directory.name), ["export.npz"])
+        
+    def test_export_setup_classes(self):
+        setup_classes = []
+        
+        for class_type, instance_name, value in [("A", "A 0", "1"), ("B", "B 0", "2"), ("A", "A 1", "3")]:
+            configuration_class = ConfigurationClass(class_type)
+            configuration_class.create_attribute("NUMBER").set_value_type(ValueTypeNumber)
+            configuration_class.create_attribute("TEXT")
+            
+            setup_class = configuration_class.create_setup_version()
+            setup_class.set_instance_name(instance_name)
+            setup_class.get_setup_attributes()[0].set_value(convert_string_to_value(value))
+            setup_classes.append(setup_class)
+            
+        # The setup classes of each class type are exported together, where values can be read from elsewhere, such as a snapshot
+        self.assertEqual(export_setup_classes(os.path.join(self.directory.name, "export.csv"), setup_classes, attributes=["NUMBER"]), 3)
+        self.assertEqual(self.read("export.csv"), "class_type,class_instance,NUMBER\nA,A 0,1\nA,A 1,3\nB,B 0,2\n")
+        
+        export_setup_classes(os.path.join(self.directory.name, "export.csv"), setup_classes, class_types=["B"], get_value=lambda setup_attribute: ("OTHER",))
+        self.assertEqual(self.read("export.csv"), "class_type,class_instance,NUMBER,TEXT\nB,B 0,OTHER,OTHER\n")
+        
+class TestMetamodelLibrary(Test):
+    def setUp(self):
+        super().setUp()
+        
+        configuration_class_gui = self.configuration_class(x=10, y=10)
+        self.attribute(configuration_class_gui).set_value_type(ValueTypeNumber)
+        
+        setup_class_gui = self.setup_class(configuration_class_gui, x=10, y=10)
+        setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("5")
+        self.model.calculate_values()
+        
+        self.directory = tempfile.TemporaryDirectory()
+        self.metamodel_library = MetamodelLibrary(os.path.join(self.directory.name, "metamodels"))
+        self.model._Model__metamodel_library = self.metamodel_library
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+        
+    def test_publish(self):
+        configuration_view = self.get_configuration_view()
+        self.assertEqual(configuration_view.get_save_file_path(), os.path.join(CONFIGURATION_SAVES_DIRECTORY, "Metamodel.pickle"))
+        
+        # Publishing the same metamodel again does not add a version
+        self.assertEqual(configuration_view.publish_metamodel(), "Metamodel@1")
+        self.assertEqual(configuration_view.publish_metamodel(), "Metamodel@1")
+        self.assertEqual(configuration_view.get_save_file_path(), get_reference_path("Metamodel@1"))
+        self.assertEqual(configuration_view.save(), (get_reference_path("Metamodel@1"), False))
+        
+        # Changed metamodels are saved with the save until published as a new version
+        self.attribute(configuration_view.get_configuration_classes_gui()[0])
+        self.assertEqual(configuration_view.get_save_file_path(), os.path.join(CONFIGURATION_SAVES_DIRECTORY, "Metamodel.pickle"))
+        self.assertEqual(configuration_view.publish_metamodel(), "Metamodel@2")
+        self.assertEqual(self.metamodel_library.get_metamodel_ids(), ["Metamodel@1", "Metamodel@2"])
+        
+        # Each version is only read once, shared by all libraries
+        self.assertIs(self.metamodel_library.read("Metamodel@1")[1], MetamodelLibrary(self.metamodel_library.get_directory()).read("Metamodel@1")[1])
+        
+        restored_configuration_view = self.model.create_view(True, "RESTORED")
+        restored_configuration_view.restore_save(get_reference_path("Metamodel@1"), {})
+        self.assertEqual(restored_configuration_view.get_metamodel_id(), "Metamodel@1")
+        self.assertEqual(len(restored_configuration_view.get_configuration_classes_gui()[0].get_configuration_attributes_gui()), 1)
+        self.assertEqual(restored_configuration_view.get_save_file_path(), get_reference_path("Metamodel@1"))
+        
+    def test_migrate_save(self):
+        configuration_view = self.get_configuration_view()
+        setup_view = self.get_setup_view()
+        
+        # The same metamodel created separately, with other save IDs
+        saved_states = configuration_view.get_saved_states()
+        configuration_class_save_id = configuration_view.get_configuration_classes_gui()[0].get_save_id()
+        configuration_attribute_save_id = configuration_view.get_configuration_classes_gui()[0].get_configuration_attributes_gui()[0].get_save_id()
+        self.metamodel_library.publish("Metamodel", replace_save_ids(saved_states, {configuration_class_save_id: "CLASS", configuration_attribute_save_id: "ATTRIBUTE"}))
+        
+        save_path = os.path.join(self.directory.name, "save")
+        
+        for directory in (CONFIGURATION_SAVES_DIRECTORY, SETUP_SAVES_DIRECTORY):
+            os.makedirs(os.path.join(save_path, directory))
+            
+        for view in (configuration_view, setup_view):
+            with open(os.path.join(save_path, view.get_save_file_path()), "wb") as file_pickle:
+                pickle.dump(view.get_saved_states(), file_pickle)
+                
+        with open(os.path.join(save_path, os.path.basename(FILE_PATHS_SAVES_PATH)), "w") as file_with_paths:
+            file_with_paths.write(f"{configuration_view.get_save_file_path()}\n{setup_view.get_save_file_path()}\n")
+            
+        self.assertEqual(migrate_save(save_path, self.metamodel_library), ["Metamodel@1"])
+        self.assertEqual(self.metamodel_library.get_metamodel_ids(), ["Metamodel@1"])
+        self.assertFalse(os.path.exists(os.path.join(save_path, configuration_view.get_save_file_path())))
+        
+        with open(os.path.join(save_path, os.path.basename(FILE_PATHS_SAVES_PATH)), "r") as file_with_paths:
+            self.assertEqual(file_with_paths.read(), f"{get_reference_path('Metamodel@1')}\n{setup_view.get_save_file_path()}\n")
+            
+        # The setup view uses the save IDs of the metamodel in the library
+        restored_configuration_view = self.model.create_view(True, "RESTORED")
+        mapping_configuration_class_gui = restored_configuration_view.restore_save(get_reference_path("Metamodel@1"), {})
+        self.assertEqual(list(mapping_configuration_class_gui), ["CLASS"])
+        
+        restored_setup_view = self.model.create_view(False, "RESTORED")
+        restored_setup_view.restore_save(os.path.join(save_path, setup_view.get_save_file_path()), mapping_configuration_class_gui, {})
+        self.assertIs(restored_setup_view.get_setup_classes_gui()[0].get_configuration_class_gui(), restored_configuration_view.get_configuration_classes_gui()[0])
+        
+        # Saves refer to the most recent version when updated, if it has the configuration classes used
+        restored_configuration_view.set_name("Metamodel")
+        restored_configuration_view.create_configuration_class_gui()
+        self.assertEqual(restored_configuration_view.publish_metamodel(), "Metamodel@2")
+        
+        self.assertEqual(migrate_save(save_path, self.metamodel_library), ["Metamodel@1"])
+        self.assertEqual(migrate_save(save_path, self.metamodel_library, update_to_latest=True), ["Metamodel@2"])
+        
+class TestMetamodelVersions(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.metamodel_library = MetamodelLibrary(os.path.join(self.directory.name, "metamodels"))
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def saved_states(self, grid_offset, class_save_id, attribute_save_id, attribute_name="ATTRIBUTE"):
+        """
+        Returns saved states of a configuration view with a class whose attribute is connected to an input block, which also takes input from another view
+        """
+        return (grid_offset, \
+                [{"configuration_class_gui": class_save_id, "name": "CLASS", "configuration_attributes_gui": [{"configuration_attribute_gui": attribute_save_id, "name": attribute_name}]}], \
+                [{"connections": [{"start_block": attribute_save_id}, {"start_block": "OTHER VIEW"}]}])
+                
+    def test_metamodel_ids(self):
+        self.assertEqual(get_metamodel_id("YACRAF 1", 2), "YACRAF 1@2")
+        self.assertEqual(split_metamodel_id("A@B@12"), ("A@B", 12))
+        self.assertTrue(is_reference_path(get_reference_path("YACRAF 1@2")))
+        self.assertFalse(is_reference_path(os.path.join(CONFIGURATION_SAVES_DIRECTORY, "YACRAF 1@2.pickle")))
+        self.assertEqual(get_metamodel_id_from_path(get_reference_path("YACRAF 1@2")), "YACRAF 1@2")
+        
+    def test_versions(self):
+        self.assertEqual(self.metamodel_library.get_metamodel_ids(), [])
+        self.assertEqual(self.metamodel_library.get_latest_metamodel_id("METAMODEL"), None)
+        
+        # Each changed metamodel is a new version, ordered by version number
+        for i in range(10):
+            self.assertEqual(self.metamodel_library.publish("METAMODEL", self.saved_states((i, 0), "CLASS", "ATTRIBUTE")), f"METAMODEL@{i+1}")
+            
+        self.assertEqual(self.metamodel_library.publish("METAMODEL", self.saved_states((0, 0), "CLASS", "ATTRIBUTE")), "METAMODEL@1")
+        self.assertEqual(self.metamodel_library.publish("OTHER", self.saved_states((0, 0), "CLASS", "ATTRIBUTE")), "OTHER@1")
+        
+        with open(os.path.join(self.metamodel_library.get_directory(), "notes.txt"), "w") as file_notes:
+            file_notes.write("Not a metamodel")
+            
+        self.assertEqual(self.metamodel_library.get_metamodel_ids("METAMODEL")[-2:], ["METAMODEL@9", "METAMODEL@10"])
+        self.assertEqual(len(self.metamodel_library.get_metamodel_ids()), 11)
+        self.assertEqual(self.metamodel_library.get_latest_metamodel_id("METAMODEL"), "METAMODEL@10")
+        self.assertEqual(self.metamodel_library.read("METAMODEL@2")[1], self.saved_states((1, 0), "CLASS", "ATTRIBUTE"))
+        
+    def test_find(self):
+        self.metamodel_library.publish("METAMODEL", self.saved_states((0, 0), "CLASS", "ATTRIBUTE"))
+        
+        # Found when only the grid offset and the save IDs differ, where connections from other views are kept
+        self.assertEqual(self.metamodel_library.find("METAMODEL", self.saved_states((5, 5), "CLASS 2", "ATTRIBUTE 2")), ("METAMODEL@1", {"CLASS 2": "CLASS", "ATTRIBUTE 2": "ATTRIBUTE"}))
+        self.assertEqual(self.metamodel_library.find("METAMODEL", self.saved_states((0, 0), "CLASS", "ATTRIBUTE", "CHANGED")), None)
+        self.assertEqual(self.metamodel_library.find("OTHER", self.saved_states((0, 0), "CLASS", "ATTRIBUTE")), None)
+        
+        saved_states = replace_save_ids(self.saved_states((0, 0), "CLASS", "ATTRIBUTE"), {"CLASS": "CLASS 2", "ATTRIBUTE": "ATTRIBUTE 2"})
+        self.assertEqual(saved_states, self.saved_states((0, 0), "CLASS 2", "ATTRIBUTE 2"))
+        
+class TestSelector(unittest.TestCase):
+    def test_name_conditions(self):
+        selector = Selector('view^="Attack tree" class="Attack event" instance!=Other attribute*=difficulty')
+        self.assertEqual(selector.get_text(), 'view^="Attack tree" class="Attack event" instance!=Other attribute*=difficulty')
+        self.assertEqual(selector.get_exact_name("class"), "Attack event")
+        self.assertEqual(selector.get_exact_name("view"), None)
+        self.assertFalse(selector.has_value_conditions())
+        
+        self.assertTrue(selector.matches_name("view", "Attack tree 2"))
+        self.assertFalse(selector.matches_name("view", "System"))
+        self.assertFalse(selector.matches_name("instance", "Other"))
+        self.assertTrue(selector.matches_name("attribute", "Global difficulty"))
+        self.assertFalse(selector.matches_name("attribute", "Global Difficulty"))
+        
+    def test_value_conditions(self):
+        values = [(2.0,), (1.0, 2.0, 3.0), (4.0, 5.0, 6.0), ("TEXT",), None, ("CONFIGURATION ERROR",)]
+        
+        # Numbers are compared against all numbers in the value, where other values never match
+        np.testing.assert_array_equal(Selector("value<=3").match_values(values), [True, True, False, False, False, False])
+        np.testing.assert_array_equal(Selector("value>1 value!=5").match_values(values), [True, False, False, False, False, False])
+        
+        # Quoted values are compared against the shown text
+        np.testing.assert_array_equal(Selector('value="TEXT"').match_values(values), [False, False, False, True, False, False])
+        np.testing.assert_array_equal(Selector("class=A").match_values(values), [True]*6)
+        
+    def test_invalid_selector(self):
+        for text in ["value^=3", "value<TEXT", "name=A", "class", "class=A value", "class<A"]:
+            with self.assertRaises(ValueError):
+                Selector(text)
+                
 class TestScripts(Test):
     def setUp(self):
         super().setUp()
@@ -768,6 +2069,13 @@ class TestScripts(Test):
                 for j, setup_attribute_gui in enumerate(setup_class_gui.get_setup_attributes_gui()):
                     setup_attribute_gui.get_setup_attribute().set_value(convert_string_to_value(f"VALUE {j}"))
                     
+                # The values are also shown in the entry fields of all copies, as values entered there are used when calculating
+                for setup_view in self.setup_views:
+                    for copied_setup_class_gui in setup_view.get_setup_classes_gui():
+                        if copied_setup_class_gui.get_setup_class() == setup_class_gui.get_setup_class():
+                            for setup_attribute_gui in copied_setup_class_gui.get_setup_attributes_gui():
+                                setup_attribute_gui.display_calculated_value()
+                                
                 setup_class_gui_1 = self.setup_class(configuration_class_gui, x=20, y=20, view=self.setup_views[view_num])
                 setup_class_gui_1.set_name(f"{class_name} INSTANCE 1")
                 
@@ -792,6 +2100,25 @@ class TestScripts(Test):
         for view_name, names in zip([None] + self.setup_view_names, [("CLASS 0 INSTANCE 0", "CLASS 0 INSTANCE 1", "CLASS 0 INSTANCE 2"), ("CLASS 0 INSTANCE 0", "CLASS 0 INSTANCE 1"), ("CLASS 0 INSTANCE 2",), ("CLASS 0 INSTANCE 0",), ()]):
             self.elements_are_equal(self.script_if.get_class_instance_names("CLASS 0", view_name), names)
             
+    def test_cache_invalidation(self):
+        self.elements_are_equal(self.script_if.get_class_instance_names("CLASS 0", self.setup_view_names[1]), ("CLASS 0 INSTANCE 2",))
+        version = self.model.get_version()
+        
+        self.setup_class(self.configuration_views[0].get_configuration_classes_gui()[0], x=50, y=50, view=self.setup_views[1]).set_name("CLASS 0 INSTANCE 3")
+        self.assertTrue(self.model.get_version() > version)
+        self.elements_are_equal(self.script_if.get_class_instance_names("CLASS 0", self.setup_view_names[1]), ("CLASS 0 INSTANCE 2", "CLASS 0 INSTANCE 3"))
+        
+        self.setup_views[1].set_excluded(True)
+        self.elements_are_equal(self.script_if.get_class_instance_names("CLASS 0", self.setup_view_names[1]), ())
+        
+        self.setup_views[1].set_excluded(False)
+        self.setup_views[1].set_name("RENAMED VIEW")
+        self.elements_are_equal(self.script_if.get_class_instance_names("CLASS 0", "RENAMED VIEW"), ("CLASS 0 INSTANCE 2", "CLASS 0 INSTANCE 3"))
+        
+        self.configuration_views[0].get_configuration_classes_gui()[0].get_configuration_attributes_gui()[0].set_name("RENAMED ATTRIBUTE")
+        self.elements_are_equal(self.script_if.get_attribute_names("CLASS 0"), ("RENAMED ATTRIBUTE", "CLASS 0 ATTRIBUTE 1"))
+        self.elements_are_equal(self.script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", "RENAMED ATTRIBUTE"), (("VALUE 0",),))
+            
     def test_get_attribute_names(self):
         for class_name, names in zip(["CLASS 0", "CLASS 1"], [("CLASS 0 ATTRIBUTE 0", "CLASS 0 ATTRIBUTE 1"), ()]):
             self.elements_are_equal(self.script_if.get_attribute_names(class_name), names)
@@ -841,6 +2168,603 @@ class TestScripts(Test):
         self.script_if.reset_override_attribute_values()
         self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
         
+    def test_override_attribute_values_bulk(self):
+        key_0 = ("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0")
+        key_1 = ("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 1")
+        
+        self.script_if.override_attribute_values_bulk({key_0: 1, key_1: "OVERRIDE"})
+        self.check_attribute_values(self.setup_class_gui, ((1.0,), ("OVERRIDE",)))
+        
+        self.script_if.override_attribute_values_bulk(np.array([[1, 2, 3], [4, 5, 6]]), [key_0, key_1])
+        self.check_attribute_values(self.setup_class_gui, ((1.0, 2.0, 3.0), (4.0, 5.0, 6.0)))
+        
+        self.script_if.override_attribute_values_bulk(np.array([7, 8]), np.array([key_0, key_1]))
+        self.check_attribute_values(self.setup_class_gui, ((7.0,), (8.0,)))
+        
+        self.assertRaises(ValueError, self.script_if.override_attribute_values_bulk, [1, 2, 3], [key_0, key_1])
+        self.assertRaises(TypeError, self.script_if.override_attribute_values_bulk, {key_0: None})
+        
+        # Values are shown when the script ends
+        self.script_if.run(lambda script_if: script_if.override_attribute_values_bulk({key_0: 9}))
+        self.assertEqual(self.setup_class_gui.get_setup_attributes_gui()[0]._GUISetupAttribute__entry_value, None)
+        
+    def test_snapshot(self):
+        snapshot = self.script_if.create_snapshot()
+        fork = self.script_if.fork_snapshot(snapshot)
+        
+        self.script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0", snapshot=fork)
+        self.script_if.calculate_values(snapshot=fork)
+        
+        self.elements_are_equal(self.script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", None, snapshot=fork), (("OVERRIDE",), ("VALUE 1",)))
+        self.elements_are_equal(self.script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", None, snapshot=snapshot), (("VALUE 0",), ("VALUE 1",)))
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
+        
+        self.script_if.apply_snapshot(fork)
+        self.check_attribute_values(self.setup_class_gui, (("OVERRIDE",), ("VALUE 1",)))
+        
+        self.script_if.reset_override_attribute_values(snapshot=fork)
+        self.script_if.apply_snapshot(fork)
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
+        
+        self.assertRaises(TypeError, self.script_if.calculate_values, snapshot="SNAPSHOT")
+        
+    def test_get_attribute_table(self):
+        configuration_attributes_gui = self.configuration_views[0].get_configuration_classes_gui()[0].get_configuration_attributes_gui()
+        configuration_attributes_gui[0].get_configuration_attribute().set_value_type(ValueTypeNumber)
+        configuration_attributes_gui[1].get_configuration_attribute().set_value_type(ValueTypeTriangleDistribution)
+        
+        for i, (value_0, value_1) in enumerate((("1", "1 / 2 / 3"), ("2", "TEXT"), ("3", "4 / 5 / 6"))):
+            self.script_if.override_attribute_values(value_0, "CLASS 0", class_instance=f"CLASS 0 INSTANCE {i}", attribute="CLASS 0 ATTRIBUTE 0")
+            self.script_if.override_attribute_values(value_1, "CLASS 0", class_instance=f"CLASS 0 INSTANCE {i}", attribute="CLASS 0 ATTRIBUTE 1")
+            
+        table, instance_names, column_names, error_mask = self.script_if.get_attribute_table("CLASS 0")
+        
+        self.assertEqual(instance_names, ["CLASS 0 INSTANCE 0", "CLASS 0 INSTANCE 1", "CLASS 0 INSTANCE 2"])
+        self.assertEqual(column_names, ["CLASS 0 ATTRIBUTE 0", "CLASS 0 ATTRIBUTE 1 (a)", "CLASS 0 ATTRIBUTE 1 (b)", "CLASS 0 ATTRIBUTE 1 (c)"])
+        np.testing.assert_array_equal(error_mask, [[False, False, False, False], [False, True, True, True], [False, False, False, False]])
+        np.testing.assert_array_equal(table, [[1, 1, 2, 3], [2, np.nan, np.nan, np.nan], [3, 4, 5, 6]])
+        
+        # Only numeric attributes are included
+        table, instance_names, column_names, error_mask = self.script_if.get_attribute_table("CLASS 1")
+        self.assertEqual((table.shape, column_names), ((1, 0), []))
+        
+        table, instance_names, column_names, error_mask = self.script_if.get_attribute_table("CLASS 0", self.setup_view_names[1])
+        self.assertEqual(instance_names, ["CLASS 0 INSTANCE 2"])
+        np.testing.assert_array_equal(table, [[3, 4, 5, 6]])
+        
+    def test_select(self):
+        self.configuration_views[0].get_configuration_classes_gui()[0].get_configuration_attributes_gui()[0].get_configuration_attribute().set_value_type(ValueTypeNumber)
+        
+        for i in range(3):
+            self.script_if.override_attribute_values(i, "CLASS 0", class_instance=f"CLASS 0 INSTANCE {i}", attribute="CLASS 0 ATTRIBUTE 0")
+            
+        def selected_names(selector):
+            return [(view, class_instance, attribute) for view, class_type, class_instance, attribute, value in self.script_if.select(selector)]
+            
+        self.elements_are_equal(selected_names('attribute="CLASS 0 ATTRIBUTE 0" value<2'), ((self.setup_view_names[0], "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0"), \
+                                                                                           (self.setup_view_names[0], "CLASS 0 INSTANCE 1", "CLASS 0 ATTRIBUTE 0"), \
+                                                                                           (self.setup_view_names[2], "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0")))
+                                                                                           
+        self.elements_are_equal(selected_names(f'view="{self.setup_view_names[0]}" instance$="1" value>=1 value!=2'), ((self.setup_view_names[0], "CLASS 0 INSTANCE 1", "CLASS 0 ATTRIBUTE 0"),))
+        self.elements_are_equal(selected_names('class=CLASS instance^="CLASS 0"'), ())
+        self.elements_are_equal(selected_names('instance^="CLASS 0" attribute*="1" value="VALUE 1"'), ((self.setup_view_names[0], "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 1"), \
+                                                                                                       (self.setup_view_names[2], "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 1")))
+                                                                                                       
+        self.assertRaises(ValueError, self.script_if.select, "unknown=1")
+        self.assertRaises(ValueError, self.script_if.select, "value<TEXT")
+        self.assertRaises(ValueError, self.script_if.select, "class<1")
+        self.assertRaises(TypeError, self.script_if.select, 1)
+        
+    def test_script_profiler(self):
+        script_profiler = ScriptProfiler("SCRIPT")
+        
+        def script_control(script_if):
+            for class_type in self.class_names[:2]:
+                script_if.get_class_instance_names(class_type)
+                
+            script_if.calculate_values(snapshot=script_if.create_snapshot())
+            
+        script_profiler.start()
+        script_profiler.wrap(script_control)(self.script_if)
+        script_profiler.stop()
+        
+        # Nothing is recorded once the run has stopped
+        with measure("NOT RECORDED"):
+            pass
+            
+        statistics = script_profiler.get_statistics()
+        
+        self.assertEqual(statistics["ScriptInterface.get_class_instance_names"]["calls"], 2)
+        self.assertEqual(statistics["ScriptInterface.calculate_values"]["calls"], 1)
+        self.assertEqual(statistics["Calculation: CalculationSnapshot.calculate_values"]["calls"], 1)
+        self.assertFalse("NOT RECORDED" in statistics)
+        
+        for name_statistics in statistics.values():
+            self.assertTrue(0 <= name_statistics["max_time"] <= name_statistics["total_time"] <= script_profiler.get_run_time())
+            
+        with tempfile.TemporaryDirectory() as profiles_path:
+            file_path = os.path.join(profiles_path, "SCRIPT.json")
+            script_profiler.save_report(file_path)
+            
+            with open(file_path, "r") as file_report:
+                report = json.load(file_report)
+                
+        self.assertEqual(report["script"], "SCRIPT")
+        self.assertEqual(set(report["statistics"].keys()), set(statistics.keys()))
+        
+    def test_batch_update(self):
+        setup_attribute_gui = self.setup_class_gui.get_setup_attributes_gui()[0]
+        
+        with self.script_if.batch_update():
+            with self.script_if.batch_update():
+                self.script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0")
+                setup_attribute_gui.display_calculated_value()
+                self.script_if.set_class_marker(1, "red", class_type="CLASS 0", class_instance="CLASS 0 INSTANCE 0")
+                
+            # Nothing is shown until the outermost batch exits
+            self.assertTrue(setup_attribute_gui.has_manually_entered_value())
+            self.assertEqual(len(self.setup_class_gui.get_script_marker_indicators()), 0)
+            
+        self.assertFalse(setup_attribute_gui.has_manually_entered_value())
+        self.assertEqual(setup_attribute_gui.get_shown_label_value(), "OVERRIDE")
+        
+        for setup_class_gui in [self.setup_class_gui] + self.model.get_linked_setup_classes_gui(self.setup_class_gui):
+            self.assertEqual(len(setup_class_gui.get_script_marker_indicators()), 1)
+            
+        # Markers of classes reset before the batch exits are not created
+        with self.script_if.batch_update():
+            self.script_if.set_class_marker(2, "red", class_type="CLASS 0", class_instance="CLASS 0 INSTANCE 0")
+            self.setup_class_gui.reset_changes_by_scripts()
+            
+        self.assertEqual(len(self.setup_class_gui.get_script_marker_indicators()), 0)
+        
+    def test_batch_update_keeps_entered_values(self):
+        setup_class_gui = [setup_class_gui for setup_class_gui in self.setup_views[1].get_setup_classes_gui() if setup_class_gui.get_name() == "CLASS 0 INSTANCE 2"][0]
+        setup_attribute_gui = setup_class_gui.get_setup_attributes_gui()[0]
+        setup_attribute_gui.set_displayed_value("ENTERED")
+        self.model.calculate_values()
+        
+        self.script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 2", attribute="CLASS 0 ATTRIBUTE 0")
+        setup_attribute_gui.display_calculated_value()
+        self.assertFalse(setup_attribute_gui.has_manually_entered_value())
+        
+        # Entry fields shown again when resetting override values show their values at once, as their text is used when calculating
+        with self.script_if.batch_update():
+            self.script_if.reset_override_attribute_values()
+            self.script_if.calculate_values()
+            
+        self.assertEqual(setup_attribute_gui.get_setup_attribute().get_current_value(), ("ENTERED",))
+        self.assertTrue(setup_attribute_gui.has_manually_entered_value())
+        self.assertFalse(setup_attribute_gui.has_changed_entered_value())
+        
+    def test_background_script(self):
+        script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+        values_in_script = []
+        
+        def script_control(script_if):
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0")
+            script_if.calculate_values()
+            values_in_script.extend(script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0"))
+            script_if.progress(0.5)
+            
+        script_runner.run_in_background(script_control)
+        self.assertTrue(script_runner.is_running())
+        script_runner.get_thread().join()
+        
+        # Changes are only shown when the script has finished
+        self.elements_are_equal(values_in_script, (("OVERRIDE",),))
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
+        
+        script_runner.handle_messages()
+        self.assertFalse(script_runner.is_running())
+        self.check_attribute_values(self.setup_class_gui, (("OVERRIDE",), ("VALUE 1",)))
+        
+        # Cancelled scripts do not make any changes
+        self.script_if.reset_override_attribute_values()
+        started = threading.Event()
+        cancelled = threading.Event()
+        
+        def script_control_cancelled(script_if):
+            started.set()
+            cancelled.wait()
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0")
+            
+        script_runner.run_in_background(script_control_cancelled)
+        started.wait()
+        script_runner.press(script_control_cancelled)
+        cancelled.set()
+        script_runner.get_thread().join()
+        
+        script_runner.handle_messages()
+        self.assertFalse(script_runner.is_running())
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
+        
+    def test_background_script_keeps_changes_made_while_running(self):
+        script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+        started = threading.Event()
+        changed = threading.Event()
+        
+        def script_control(script_if):
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0")
+            script_if.calculate_values()
+            started.set()
+            changed.wait()
+            
+        script_runner.run_in_background(script_control)
+        thread = script_runner.get_thread()
+        started.wait()
+        
+        # Values entered and calculated while the script runs are not reverted when its changes are shown
+        for setup_view in self.setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                if setup_class_gui.get_setup_class() == self.setup_class_gui.get_setup_class():
+                    setup_class_gui.get_setup_attributes_gui()[1].set_displayed_value("ENTERED")
+                    
+        self.model.calculate_values()
+        changed.set()
+        thread.join()
+        
+        script_runner.handle_messages()
+        self.check_attribute_values(self.setup_class_gui, (("OVERRIDE",), ("ENTERED",)))
+        
+    def test_background_script_entered_values(self):
+        script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+        values_in_script = []
+        
+        # Values entered but not calculated are used by scripts running in the background
+        for setup_view in self.setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                if setup_class_gui.get_setup_class() == self.setup_class_gui.get_setup_class():
+                    setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("ENTERED")
+                    
+        def script_control(script_if):
+            script_if.calculate_values()
+            values_in_script.extend(script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0"))
+            values_in_script.extend(match[4] for match in script_if.stream_attribute_values() if match[1:4] == ("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0"))
+            
+        script_runner.run_in_background(script_control)
+        script_runner.get_thread().join()
+        script_runner.handle_messages()
+        
+        self.elements_are_equal(values_in_script, (("ENTERED",), ("ENTERED",), ("ENTERED",)))
+        self.check_attribute_values(self.setup_class_gui, (("ENTERED",), ("VALUE 1",)))
+        
+        # The thread running the script does not access the setup views, even if the model changes while the script runs
+        started = threading.Event()
+        changed = threading.Event()
+        threads_getting_setup_views = []
+        get_setup_views = Model.get_setup_views
+        
+        def script_control_model_changed(script_if):
+            started.set()
+            changed.wait()
+            script_if.get_class_instance_names("CLASS 0")
+            list(script_if.stream_attribute_values())
+            
+        def record_thread(model):
+            threads_getting_setup_views.append(threading.current_thread())
+            return get_setup_views(model)
+            
+        with unittest.mock.patch.object(Model, "get_setup_views", record_thread):
+            script_runner.run_in_background(script_control_model_changed)
+            thread = script_runner.get_thread()
+            started.wait()
+            self.model.increment_version()
+            changed.set()
+            thread.join()
+            
+        script_runner.handle_messages()
+        self.assertNotIn(thread, threads_getting_setup_views)
+        
+    def test_stream_attribute_values_entered_values(self):
+        for setup_view in self.setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                if setup_class_gui.get_setup_class() == self.setup_class_gui.get_setup_class():
+                    setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("ENTERED")
+                    
+        values = [match[4] for match in self.script_if.stream_attribute_values() if match[1:4] == ("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0")]
+        self.elements_are_equal(values, (("ENTERED",), ("ENTERED",)))
+        
+        # Values entered but not calculated are used without changing the setup attributes, so that they are still calculated later
+        self.assertEqual(self.setup_class_gui.get_setup_attributes_gui()[0].get_setup_attribute().get_value(), ("VALUE 0",))
+        self.assertTrue(self.setup_class_gui.get_setup_attributes_gui()[0].has_changed_entered_value())
+        self.assertFalse(self.model.has_current_values())
+        
+    def test_async_calculate_values_in_steps(self):
+        value_configuration_class_gui = self.configuration_class(x=40, y=40, view=self.configuration_views[0])
+        value_configuration_class_gui.set_name("VALUE")
+        value_configuration_attribute_gui = self.attribute(value_configuration_class_gui)
+        value_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        
+        sum_configuration_class_gui = self.configuration_class(x=60, y=40, view=self.configuration_views[0])
+        sum_configuration_class_gui.set_name("SUM")
+        sum_configuration_attribute_gui = self.attribute(sum_configuration_class_gui)
+        sum_configuration_attribute_gui.set_value_type(ValueTypeNumber)
+        
+        configuration_input_gui = self.configuration_input(view=self.configuration_views[0])
+        drag_and_attach_input(configuration_input_gui, sum_configuration_attribute_gui, "LEFT")
+        configuration_input_gui.set_calculation_type(CalculationTypeAND)
+        configuration_connection(value_configuration_attribute_gui, "RIGHT", configuration_input_gui)
+        
+        # Three sums taking the same value as input
+        value_setup_class_gui = self.setup_class(value_configuration_class_gui, x=40, y=40, view=self.setup_views[0])
+        value_setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("3")
+        sum_setup_classes_gui = []
+        
+        for i in range(3):
+            sum_setup_class_gui = self.setup_class(sum_configuration_class_gui, x=60, y=40+20*i, view=self.setup_views[0])
+            sum_setup_class_gui.set_name(f"SUM {i}")
+            setup_connection(value_setup_class_gui, "RIGHT", sum_setup_class_gui, "LEFT")
+            sum_setup_classes_gui.append(sum_setup_class_gui)
+            
+        async def script_control(script_if):
+            await script_if.calculate_values()
+            
+        # Values calculated without a snapshot are calculated in steps, where they are shown once all have been calculated
+        script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+        
+        with unittest.mock.patch("script_async.ASYNC_SCRIPT_STEP_SIZE", 1):
+            script_runner.run_cooperatively(script_control)
+            
+            for i in range(3):
+                script_runner.get_scheduler().step()
+                
+            self.assertTrue(script_runner.is_running())
+            self.assertEqual(sum_setup_classes_gui[-1].get_setup_attributes_gui()[0].get_shown_label_value(), "-")
+            self.assertFalse(self.model.has_current_values())
+            
+            while script_runner.is_running():
+                script_runner.get_scheduler().step()
+                
+        self.assertEqual([setup_class_gui.get_setup_attributes_gui()[0].get_shown_label_value() for setup_class_gui in sum_setup_classes_gui], ["3", "3", "3"])
+        
+    def test_async_script(self):
+        values_in_script = []
+        
+        async def script_control(script_if):
+            snapshot = script_if.create_snapshot()
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0", snapshot=snapshot)
+            await script_if.calculate_snapshots([snapshot])
+            values_in_script.extend(script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 0", snapshot=snapshot))
+            
+            await script_if.pause()
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 1")
+            await script_if.pause()
+            values_in_script.extend([match[4] for match in await script_if.select('attribute="CLASS 0 ATTRIBUTE 1" value="OVERRIDE"')])
+            
+        # Async scripts run unchanged in an asyncio event loop
+        run_script_control(script_control, self.script_if)
+        self.elements_are_equal(values_in_script, (("OVERRIDE",), ("OVERRIDE",), ("OVERRIDE",)))
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("OVERRIDE",)))
+        
+        # Async scripts run in the event loop of the GUI continue each time the GUI has responded
+        self.script_if.reset_override_attribute_values()
+        script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+        script_runner.run_cooperatively(script_control)
+        
+        for i in range(4):
+            self.assertTrue(script_runner.is_running())
+            script_runner.get_scheduler().step()
+            
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("OVERRIDE",)))
+        
+        while script_runner.is_running():
+            script_runner.get_scheduler().step()
+            
+        self.elements_are_equal(values_in_script[3:], (("OVERRIDE",), ("OVERRIDE",), ("OVERRIDE",)))
+        
+        # Cancelled scripts stop where they await, keeping the changes made before
+        self.script_if.reset_override_attribute_values()
+        script_runner.run_cooperatively(script_control)
+        
+        for i in range(4):
+            script_runner.get_scheduler().step()
+            
+        script_runner.press(script_control)
+        self.assertFalse(script_runner.is_running())
+        self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("OVERRIDE",)))
+        
+    def test_subprocess_script(self):
+        shared_value_store = SharedValueStore(self.model)
+        messages = queue.Queue()
+        
+        try:
+            script_if = SubprocessScriptInterface(shared_value_store.get_index(), messages)
+            
+            # Values are read from shared memory with the same names as in the program
+            self.elements_are_equal(script_if.get_class_type_names(), self.class_names)
+            self.elements_are_equal(script_if.get_class_instance_names("CLASS 0", self.setup_view_names[0]), ("CLASS 0 INSTANCE 0", "CLASS 0 INSTANCE 1"))
+            self.assertEqual(script_if.get_attribute_values("CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 1", self.setup_view_names[0]), [("VALUE 1",)])
+            self.elements_are_equal([match[:4] for match in script_if.select('class="CLASS 0" instance="CLASS 0 INSTANCE 0" attribute$=" 1"')], [(view, "CLASS 0", "CLASS 0 INSTANCE 0", "CLASS 0 ATTRIBUTE 1") for view in (self.setup_view_names[0], self.setup_view_names[2])])
+            self.elements_are_equal(list(script_if.stream_attribute_values(self.setup_view_names[0])), script_if.select(f'view="{self.setup_view_names[0]}"'))
+            
+            script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0")
+            script_if.set_class_marker("MARKER", "red", class_type="CLASS 0", class_instance="CLASS 0 INSTANCE 0")
+            script_if.progress(0.5)
+            
+            self.assertEqual(messages.get_nowait(), ("progress", (0.5, "")))
+            script_if.close()
+            
+            # Changes are only made in the program when applied
+            self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("VALUE 1",)))
+            shared_value_store.apply_changes(script_if.get_changes(), self.model, self.script_if)
+            
+            self.check_attribute_values(self.setup_class_gui, (("OVERRIDE",), ("VALUE 1",)))
+            self.assertEqual(len(self.setup_class_gui.get_script_marker_indicators()), 1)
+        finally:
+            shared_value_store.close()
+            
+        # Scripts running in a separate process send their changes back when finished
+        self.script_if.reset_override_attribute_values()
+        
+        with tempfile.TemporaryDirectory() as script_path:
+            file_path = os.path.join(script_path, "SCRIPT.py")
+            
+            with open(file_path, "w") as file_script:
+                file_script.write("def script_control(script_if):\n    script_if.override_attribute_values(\"OVERRIDE\", \"CLASS 0\", attribute=\"CLASS 0 ATTRIBUTE 1\")\n")
+                
+            script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+            script_runner.run_in_subprocess(file_path)
+            self.assertTrue(script_runner.is_running())
+            script_runner.get_process().join()
+            
+            script_runner.handle_messages()
+            self.assertFalse(script_runner.is_running())
+            self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("OVERRIDE",)))
+            
+            # A process stopping while its messages are handled has still finished the script
+            self.script_if.reset_override_attribute_values()
+            script_runner.run_in_subprocess(file_path)
+            process = script_runner.get_process()
+            
+            def stop_process():
+                process.join()
+                return False
+                
+            with unittest.mock.patch.object(process, "is_alive", side_effect=stop_process), unittest.mock.patch("sys.stdout", StringIO()) as stdout:
+                script_runner.handle_messages()
+                
+            self.assertNotIn("stopped unexpectedly", stdout.getvalue())
+            self.check_attribute_values(self.setup_class_gui, (("VALUE 0",), ("OVERRIDE",)))
+            
+    def test_subprocess_select_and_stream(self):
+        # Values found by select and stream_attribute_values within the process are sent back as an override value
+        with tempfile.TemporaryDirectory() as script_path:
+            file_path = os.path.join(script_path, "SCRIPT.py")
+            
+            with open(file_path, "w") as file_script:
+                file_script.write("def script_control(script_if):\n" \
+                                  "    matches = script_if.select('class=\"CLASS 0\" attribute=\"CLASS 0 ATTRIBUTE 1\"')\n" \
+                                  "    streamed = [match for match in script_if.stream_attribute_values() if match[1:4] == (\"CLASS 0\", \"CLASS 0 INSTANCE 0\", \"CLASS 0 ATTRIBUTE 1\")]\n" \
+                                  "    script_if.override_attribute_values(f\"MATCHES {len(matches)} STREAMED {len(streamed)} {streamed[0][4][0]}\", \"CLASS 0\", class_instance=\"CLASS 0 INSTANCE 0\", attribute=\"CLASS 0 ATTRIBUTE 0\")\n")
+                                  
+            script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+            script_runner.run_in_subprocess(file_path)
+            script_runner.get_process().join()
+            script_runner.handle_messages()
+            
+        self.check_attribute_values(self.setup_class_gui, (("MATCHES 4 STREAMED 2 VALUE 1",), ("VALUE 1",)))
+        
+    def test_script_result_cache(self):
+        setup_attribute = self.setup_class_gui.get_setup_attributes_gui()[0].get_setup_attribute()
+        model_hashes = get_model_hashes(self.model)
+        self.assertEqual(get_model_hashes(self.model), model_hashes)
+        
+        # Changes by scripts only change the second hash
+        self.script_if.override_attribute_values("OVERRIDE", "CLASS 0", class_instance="CLASS 0 INSTANCE 0", attribute="CLASS 0 ATTRIBUTE 0")
+        self.assertEqual(get_model_hashes(self.model)[0], model_hashes[0])
+        self.assertNotEqual(get_model_hashes(self.model)[1], model_hashes[1])
+        
+        self.script_if.reset_override_attribute_values()
+        self.assertEqual(get_model_hashes(self.model), model_hashes)
+        
+        setup_attribute.set_value(("CHANGED",))
+        self.assertNotEqual(get_model_hashes(self.model)[0], model_hashes[0])
+        setup_attribute.set_value(("VALUE 0",))
+        
+        # Text printed from other threads is not recorded
+        script_output = ScriptOutput()
+        first_call_recorder = FirstCallRecorder(self.script_if)
+        
+        with unittest.mock.patch("sys.stdout", StringIO()) as stdout:
+            script_output.start()
+            print("SCRIPT OUTPUT")
+            first_call_recorder.reset_override_attribute_values()
+            
+            thread = threading.Thread(target=print, args=("OTHER OUTPUT",))
+            thread.start()
+            thread.join()
+            script_output.stop()
+            
+        self.assertEqual(script_output.get_text(), "SCRIPT OUTPUT\n")
+        self.assertEqual(stdout.getvalue(), "SCRIPT OUTPUT\nOTHER OUTPUT\n")
+        self.assertFalse(first_call_recorder.resets_script_changes_first())
+        
+        # Results of scripts resetting changes by previous scripts first are found regardless of those changes
+        script_result_cache = ScriptResultCache(2)
+        script_result = ScriptResult(self.model, script_output.get_text())
+        script_result_cache.add_script_result("SCRIPT", model_hashes, True, script_result)
+        script_result_cache.add_script_result("OTHER SCRIPT", model_hashes, False, ScriptResult(self.model, ""))
+        
+        self.script_if.override_attribute_values("OVERRIDE", "CLASS 0")
+        self.assertIs(script_result_cache.get_script_result("SCRIPT", get_model_hashes(self.model)), script_result)
+        self.assertIsNone(script_result_cache.get_script_result("OTHER SCRIPT", get_model_hashes(self.model)))
+        self.assertIsNone(script_result_cache.get_script_result("CHANGED SCRIPT", get_model_hashes(self.model)))
+        
+        # The least recently used result is removed
+        script_result_cache.add_script_result("NEW SCRIPT", model_hashes, True, ScriptResult(self.model, ""))
+        self.assertEqual(len(script_result_cache), 2)
+        self.assertIsNone(script_result_cache.get_script_result("OTHER SCRIPT", model_hashes))
+        
+        # Showing the result again prints the same text
+        self.script_if.reset_override_attribute_values()
+        
+        with unittest.mock.patch("sys.stdout", StringIO()) as stdout:
+            script_result.replay(self.model)
+            
+        self.assertEqual(stdout.getvalue(), "SCRIPT OUTPUT\n")
+        
+    def test_script_result_cache_file_writes(self):
+        # Entered values that have not been calculated yet are part of the model
+        model_hashes = get_model_hashes(self.model)
+        
+        for setup_view in self.setup_views:
+            for setup_class_gui in setup_view.get_setup_classes_gui():
+                if setup_class_gui.get_setup_class() == self.setup_class_gui.get_setup_class():
+                    setup_class_gui.get_setup_attributes_gui()[0].set_displayed_value("ENTERED")
+                    
+        self.assertNotEqual(get_model_hashes(self.model)[0], model_hashes[0])
+        
+        # Results of scripts writing files are not cached, so that the files are written again when run again
+        runs_scripts_in_background = settings.runs_scripts_in_background()
+        caches_script_results = settings.caches_script_results()
+        settings.set_run_scripts_in_background(False)
+        settings.set_cache_script_results(True)
+        
+        try:
+            with tempfile.TemporaryDirectory() as script_path:
+                with open(os.path.join(script_path, "SCRIPT.py"), "w") as file_script:
+                    file_script.write("def script_control(script_if):\n    script_if.export_attribute_values(\"Export.csv\")\n")
+                    
+                script_runner = ScriptRunner(self.model, self.script_if, "SCRIPT")
+                
+                with unittest.mock.patch.object(self.model, "get_script_registry", return_value=ScriptRegistry(script_path)), \
+                     unittest.mock.patch("script_interface.SCRIPT_RESULTS_PATH", script_path):
+                    for i in range(2):
+                        script_runner.press()
+                        self.assertTrue(os.path.exists(os.path.join(script_path, "Export.csv")))
+                        os.remove(os.path.join(script_path, "Export.csv"))
+                        
+            self.assertEqual(len(self.model.get_script_result_cache()), 0)
+        finally:
+            settings.set_run_scripts_in_background(runs_scripts_in_background)
+            settings.set_cache_script_results(caches_script_results)
+            
+    def test_script_registry(self):
+        with tempfile.TemporaryDirectory() as script_path:
+            script_registry = ScriptRegistry(script_path)
+            file_path = script_registry.get_file_path("SCRIPT")
+            
+            for file_name in ("SCRIPT.py", "SCRIPT_TEMPLATE.py", "NOT_SCRIPT.txt"):
+                with open(os.path.join(script_path, file_name), "w") as file_script:
+                    file_script.write("def script_control(script_if):\n    return 0\n")
+                    
+            self.assertEqual(script_registry.get_script_names(), ["SCRIPT"])
+            self.assertFalse(script_registry.is_imported("SCRIPT"))
+            
+            # Scripts are imported once and shared until changed
+            script_module = script_registry.get_module("SCRIPT")
+            self.assertIs(script_registry.get_module("SCRIPT"), script_module)
+            self.assertEqual(script_registry.get_script_control("SCRIPT")(None), 0)
+            
+            with open(file_path, "w") as file_script:
+                file_script.write("def script_control(script_if):\n    return 1\n")
+                
+            os.utime(file_path, (0, os.path.getmtime(file_path)+1))
+            
+            self.assertIsNot(script_registry.get_module("SCRIPT"), script_module)
+            self.assertEqual(script_registry.get_script_control("SCRIPT")(None), 1)
+            
 if __name__ == "__main__":
     input("Warning: Risk of flashing lights as GUI windows are rapidly created and destroyed. Press ENTER to proceed: ")
     unittest.main()